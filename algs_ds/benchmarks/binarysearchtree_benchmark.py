@@ -0,0 +1,66 @@
+# Benchmarks the ordered containers on sorted, reverse sorted and random input
+#
+# Usage: python -m algs_ds.benchmarks.binarysearchtree_benchmark [N]
+# The unbalanced BinarySearchTree is quadratic on sorted input, keep N moderate
+#
+# Author: Alireza Ghey
+
+import random
+import sys
+import time
+
+from algs_ds.datastructures.binarysearchtree.binarysearchtree import BinarySearchTree
+from algs_ds.datastructures.binarysearchtree.avltree import AVLTree
+from algs_ds.datastructures.sortedlist.sortedlistset import SortedListSet
+
+IMPLEMENTATIONS = [BinarySearchTree, AVLTree, SortedListSet]
+# Number of windows scanned by the range benchmark, each covering n / WINDOWS elements
+WINDOWS = 100
+
+
+# Runs fn once and returns the elapsed wall clock time in seconds
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def fmt(t) -> str:
+    return f"{t:>10.3f}s"
+
+
+def run(n: int) -> None:
+    inputs = {
+        "sorted": list(range(n)),
+        "reverse": list(range(n, 0, -1)),
+        "random": random.sample(range(n), n),
+    }
+
+    print(f"n = {n}")
+    print(f"{'implementation':<20}{'input':<10}{'add':>11}{'contains':>11}{'range':>11}{'remove':>11}{'height':>8}")
+    for cls in IMPLEMENTATIONS:
+        for name, data in inputs.items():
+            tree = cls()
+
+            def add():
+                for el in data: tree.add(el)
+
+            def contains():
+                for el in data: tree.contains(el)
+
+            def scan():
+                width = max(n // WINDOWS, 1)
+                for lo in range(0, n, width):
+                    for _ in tree.irange(lo, lo + width - 1): pass
+
+            def remove():
+                for el in data: tree.remove(el)
+
+            add_time = timed(add)
+            height = tree.height()
+            times = [add_time, timed(contains), timed(scan), timed(remove)]
+            print(f"{cls.__name__:<20}{name:<10}" + "".join(fmt(t) for t in times) + f"{height:>8}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
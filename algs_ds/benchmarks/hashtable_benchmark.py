@@ -0,0 +1,50 @@
+# Benchmarks HashtableOpenAddressing against HashtableSeparateChaining
+#
+# Usage: python -m algs_ds.benchmarks.hashtable_benchmark [N]
+#
+# Author: Alireza Ghey
+
+import random
+import sys
+import time
+
+from algs_ds.datastructures.hashtable.hashtable_separatechaining import HashtableSeparateChaining
+from algs_ds.datastructures.hashtable.hashtable_openaddressing import HashtableOpenAddressing
+
+IMPLEMENTATIONS = [HashtableSeparateChaining, HashtableOpenAddressing]
+
+
+# Runs fn once and returns the elapsed wall clock time in seconds
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(n: int) -> None:
+    keys = random.sample(range(n * 10), n)
+    misses = [-k - 1 for k in keys]
+
+    print(f"n = {n}")
+    print(f"{'implementation':<28}{'insert':>10}{'get hit':>10}{'get miss':>10}{'remove':>10}")
+    for cls in IMPLEMENTATIONS:
+        table = cls()
+
+        def insert():
+            for k in keys: table.insert(k, k)
+
+        def get_hit():
+            for k in keys: table.get(k)
+
+        def get_miss():
+            for k in misses: table.get(k)
+
+        def remove():
+            for k in keys: table.remove(k)
+
+        times = [timed(insert), timed(get_hit), timed(get_miss), timed(remove)]
+        print(f"{cls.__name__:<28}" + "".join(f"{t:>9.3f}s" for t in times))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
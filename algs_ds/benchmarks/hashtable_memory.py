@@ -0,0 +1,40 @@
+# Reports the memory overhead per entry of the hashtable implementations,
+# i.e. the bytes allocated by the table itself, not counting keys and values
+#
+# Usage: python -m algs_ds.benchmarks.hashtable_memory [N ...]
+#
+# Author: Alireza Ghey
+
+import sys
+import tracemalloc
+
+from algs_ds.datastructures.hashtable.hashtable_separatechaining import HashtableSeparateChaining
+from algs_ds.datastructures.hashtable.hashtable_openaddressing import HashtableOpenAddressing
+
+IMPLEMENTATIONS = [HashtableSeparateChaining, HashtableOpenAddressing]
+
+
+# Returns the bytes allocated while inserting n preallocated keys into a fresh table
+def bytes_allocated(cls, n: int) -> int:
+    keys = list(range(n))
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    table = cls()
+    for k in keys:
+        table.insert(k, k)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return after - before
+
+
+def run(sizes) -> None:
+    print(f"{'implementation':<28}" + "".join(f"{n:>14,}" for n in sizes))
+    for cls in IMPLEMENTATIONS:
+        per_entry = [bytes_allocated(cls, n) / n for n in sizes]
+        print(f"{cls.__name__:<28}" + "".join(f"{b:>12.1f} B" for b in per_entry))
+
+
+if __name__ == "__main__":
+    run([int(n) for n in sys.argv[1:]] or [1000000, 10000000])
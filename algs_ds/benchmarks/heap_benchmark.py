@@ -0,0 +1,67 @@
+# Benchmarks BinaryHeap arities against push/pop workload mixes
+#
+# Usage: python -m algs_ds.benchmarks.heap_benchmark [N]
+# Every workload performs N operations on a heap prefilled with N elements.
+# heapq is included as a baseline
+#
+# Author: Alireza Ghey
+
+import heapq
+import random
+import sys
+import time
+
+from algs_ds.datastructures.priorityqueue.binary_heap import BinaryHeap
+
+ARITIES = [2, 3, 4, 8, 16]
+# Fraction of operations that are pushes, the rest are pops
+MIXES = {"push 90%": 0.9, "push 50%": 0.5, "push 10%": 0.1}
+
+
+class HeapqAdapter:
+    # Adapts heapq to the add/poll interface of BinaryHeap
+    def __init__(self, elems):
+        self._heap = list(elems)
+        heapq.heapify(self._heap)
+
+    def add(self, elem):
+        heapq.heappush(self._heap, elem)
+
+    def poll(self):
+        return heapq.heappop(self._heap) if self._heap else None
+
+
+def run(n: int) -> None:
+    prefill = [random.random() for _ in range(n)]
+    workloads = {}
+    for name, pushes in MIXES.items():
+        workloads[name] = [random.random() if random.random() < pushes else None for _ in range(n)]
+
+    print(f"n = {n}")
+    print(f"{'heap':<12}" + "".join(f"{name:>12}" for name in workloads) + f"{'heapify':>12}{'drain':>12}")
+    factories = [(f"arity {arity}", lambda elems, arity=arity: BinaryHeap(elems, arity=arity)) for arity in ARITIES]
+    factories.append(("heapq", HeapqAdapter))
+
+    for label, factory in factories:
+        times = []
+        for ops in workloads.values():
+            heap = factory(list(prefill))
+            start = time.perf_counter()
+            for op in ops:
+                if op is None: heap.poll()
+                else: heap.add(op)
+            times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        heap = factory(list(prefill))
+        times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        while heap.poll() is not None: pass
+        times.append(time.perf_counter() - start)
+
+        print(f"{label:<12}" + "".join(f"{t:>11.3f}s" for t in times))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,184 @@
+from __future__ import annotations
+from typing import Any, Tuple
+from algs_ds.datastructures.binarysearchtree.binarysearchtree import BinarySearchTree, _Node
+# A self-balancing BST implementation (AVL tree)
+#
+# Keeps the BinarySearchTree API, but every node tracks its height and
+# add/remove rebalance with rotations, so the height stays O(log n)
+# whatever the insertion order.
+#
+# Author: Alireza Ghey
+
+class AVLTree(BinarySearchTree):
+    # Adds a node to the AVL tree
+    # Returns true if successful
+    # TC: O(log n)
+    def add(self, data: Any) -> bool:
+        count = self._nodeCount
+        root = self._root = self._add(self._root, data)
+        root._parent = None
+        return self._nodeCount != count
+
+    # Private method to recursively add an element and rebalance on the way up.
+    # Recursion depth is bounded by the height, which is O(log n)
+    # TC: O(log n)
+    def _add(self, node: _Node, data: Any) -> _Node:
+        # Base case: Found a leaf node
+        if not node:
+            self._nodeCount += 1
+            return self._NodeType(data)
+
+        if data < node._data:
+            node._left = self._add(node._left, data)
+        elif data > node._data:
+            node._right = self._add(node._right, data)
+        else:
+            # Already present, nothing changes
+            return node
+
+        return self._balance(node)
+
+    # Removes a node from the AVL tree if exists
+    # Returns true if successful
+    # TC: O(log n)
+    def remove(self, data: Any) -> bool:
+        count = self._nodeCount
+        root = self._root = self._remove(self._root, data)
+        if root: root._parent = None
+        return self._nodeCount != count
+
+    # Private method to recursively remove an element and rebalance on the way up
+    # TC: O(log n)
+    def _remove(self, node: _Node, data: Any) -> _Node:
+        if not node: return None
+
+        if data < node._data:
+            node._left = self._remove(node._left, data)
+        elif data > node._data:
+            node._right = self._remove(node._right, data)
+        else:
+            # Nodes with at most one child are replaced by that child
+            if node._left == None:
+                self._nodeCount -= 1
+                return node._right
+            if node._right == None:
+                self._nodeCount -= 1
+                return node._left
+
+            # Otherwise take over the data of the successor
+            # and remove the successor from the right subtree instead
+            successor = self._findMin(node._right)
+            node._data = successor._data
+            node._right = self._remove(node._right, successor._data)
+
+        return self._balance(node)
+
+    # Splits the tree into the elements < data and the elements >= data.
+    # Nodes are moved rather than copied, so this tree is left empty
+    # TC: O(log n)
+    def split(self, data: Any) -> Tuple[AVLTree, AVLTree]:
+        left, right = self._split(self._root, data)
+        self._root, self._nodeCount = None, 0
+        return self._fromRoot(left), self._fromRoot(right)
+
+    # Concatenates two trees where every element of left is smaller than
+    # every element of right. Raises ValueError otherwise.
+    # Nodes are moved rather than copied, so both trees are left empty
+    # TC: O(log n)
+    @classmethod
+    def join(cls, left: AVLTree, right: AVLTree) -> AVLTree:
+        if left._root and right._root and not left.max() < right.min():
+            raise ValueError("Elements of left must be smaller than elements of right")
+
+        tree = cls()
+        root = tree._join2(left._root, right._root)
+        left._root, left._nodeCount = None, 0
+        right._root, right._nodeCount = None, 0
+        return tree._fromRoot(root)
+
+    # Private method wrapping a detached subtree into a tree of the same type
+    def _fromRoot(self, root: _Node) -> AVLTree:
+        tree = type(self)()
+        tree._root = root
+        if root:
+            root._parent = None
+            tree._nodeCount = root._size
+        return tree
+
+    # Private method splitting a subtree into the subtrees of elements < data
+    # and elements >= data. The pieces hanging off the search path are joined
+    # back together, and their heights telescope to O(log n) work in total
+    # TC: O(log n)
+    def _split(self, node: _Node, data: Any) -> Tuple[_Node, _Node]:
+        if not node: return None, None
+
+        if node._data < data:
+            left, right = self._split(node._right, data)
+            return self._join(node._left, node._data, left), right
+        left, right = self._split(node._left, data)
+        return left, self._join(right, node._data, node._right)
+
+    # Private method joining two subtrees with no middle element
+    # TC: O(log n)
+    def _join2(self, left: _Node, right: _Node) -> _Node:
+        if not right: return left
+        data = self._findMin(right)._data
+        return self._join(left, data, self._remove(right, data))
+
+    # Private method joining left, data and right where left < data < right.
+    # Descends the spine of the taller subtree until the heights match,
+    # hangs a new node there and rebalances on the way up
+    # TC: O(|height(left) - height(right)| + 1)
+    def _join(self, left: _Node, data: Any, right: _Node) -> _Node:
+        leftHeight = self._nodeHeight(left)
+        rightHeight = self._nodeHeight(right)
+
+        if leftHeight > rightHeight + 1:
+            left._right = self._join(left._right, data, right)
+            return self._balance(left)
+        if rightHeight > leftHeight + 1:
+            right._left = self._join(left, data, right._left)
+            return self._balance(right)
+
+        node = self._NodeType(data, left, right)
+        self._update(node)
+        return node
+
+    # Restores the AVL invariant (children heights differ by at most one)
+    # at node and returns the new root of the subtree
+    # TC: O(1)
+    def _balance(self, node: _Node) -> _Node:
+        self._update(node)
+        balance = self._nodeHeight(node._right) - self._nodeHeight(node._left)
+
+        # Left heavy
+        if balance < -1:
+            if self._nodeHeight(node._left._right) > self._nodeHeight(node._left._left):
+                node._left = self._rotateLeft(node._left)
+            return self._rotateRight(node)
+
+        # Right heavy
+        if balance > 1:
+            if self._nodeHeight(node._right._left) > self._nodeHeight(node._right._right):
+                node._right = self._rotateRight(node._right)
+            return self._rotateLeft(node)
+
+        return node
+
+    # Rotates the subtree at node to the left and returns its new root
+    def _rotateLeft(self, node: _Node) -> _Node:
+        newRoot = node._right
+        node._right = newRoot._left
+        newRoot._left = node
+        self._update(node)
+        self._update(newRoot)
+        return newRoot
+
+    # Rotates the subtree at node to the right and returns its new root
+    def _rotateRight(self, node: _Node) -> _Node:
+        newRoot = node._left
+        node._left = newRoot._right
+        newRoot._right = node
+        self._update(node)
+        self._update(newRoot)
+        return newRoot
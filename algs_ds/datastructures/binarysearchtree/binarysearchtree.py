@@ -1,7 +1,7 @@
 from __future__ import annotations
 from collections import deque
 from typing import Any
-from typing import Iterator
+from typing import Iterator, Iterable, BinaryIO
 # A BST implementation
 #
 #
@@ -9,10 +9,22 @@ from typing import Iterator
 
 # Private Node class for internal use
 class _Node:
+    __slots__ = ("_data", "_left", "_right", "_parent", "_size", "_height")
+
     def __init__(self, data: Any, left:_Node=None, right:_Node=None):
         self._data = data
         self._left = left
         self._right = right
+        # Set by whoever links the node into the tree, lets the
+        # traversals walk the tree without a stack
+        self._parent = None
+        # Number of nodes in the subtree rooted at this node,
+        # maintained by add/remove to answer order statistic queries
+        self._size = 1 + (left._size if left else 0) + (right._size if right else 0)
+        # Height of the subtree rooted at this node, maintained by add/remove
+        leftHeight = left._height if left else 0
+        rightHeight = right._height if right else 0
+        self._height = (leftHeight if leftHeight > rightHeight else rightHeight) + 1
 
 # Enumerator class to define the type of traversal
 class TraversalType:
@@ -29,13 +41,127 @@ class TraversalType:
 
 
 class BinarySearchTree:
+    # Node class used for new nodes, subclasses can plug in richer nodes
+    _NodeType = _Node
+
     def __init__(self):
         # Tracks the number of nodes in this BST
         self._nodeCount = 0
 
         # Tracks the root of the BST
         self._root = None
+
+    # Builds a perfectly balanced tree from strictly increasing elements.
+    # The elements are consumed in order and never compared, so the input
+    # must already be sorted and free of duplicates
+    # TC: O(n)
+    @classmethod
+    def from_sorted(cls, iterable: Iterable) -> BinarySearchTree:
+        if not hasattr(iterable, "__len__"): iterable = list(iterable)
+
+        tree = cls()
+        tree._nodeCount = len(iterable)
+        tree._root = tree._buildBalanced(iter(iterable), tree._nodeCount)
+        return tree
+
+    # Builds a balanced tree from elements in any order, duplicates are dropped
+    # TC: O(n log n)
+    @classmethod
+    def from_iterable(cls, iterable: Iterable) -> BinarySearchTree:
+        ordered = []
+        for el in sorted(iterable):
+            if not ordered or ordered[-1] < el:
+                ordered.append(el)
+        return cls.from_sorted(ordered)
+
+    # Private method building a balanced subtree out of the next n elements of it.
+    # The left subtree is built first so that elements are consumed in order.
+    # Recursion depth is log2(n)
+    # TC: O(n)
+    def _buildBalanced(self, it: Iterator, n: int) -> _Node:
+        if n == 0: return None
+        leftCount = n // 2
+        left = self._buildBalanced(it, leftCount)
+        data = next(it)
+        right = self._buildBalanced(it, n - leftCount - 1)
+        node = self._NodeType(data, left, right)
+        if left: left._parent = node
+        if right: right._parent = node
+        return node
     
+    # Writes the elements in order to a binary file object, see
+    # binarysearchtree_dump for the layout. Elements are streamed,
+    # so no intermediate list is built. Elements other than bool, int,
+    # float, str and bytes are only written (pickled) if allow_pickle is set
+    # TC: O(n)
+    def dump(self, fileobj: BinaryIO, allow_pickle: bool=False) -> None:
+        from algs_ds.datastructures.binarysearchtree.binarysearchtree_dump import dump_sorted
+        dump_sorted(self.traverse(TraversalType.InOrder), fileobj, len(self), allow_pickle)
+
+    # Writes strictly increasing elements from any iterable (a sorted file,
+    # a database cursor...) in the dump format without building a tree
+    # Returns the number of elements written
+    # TC: O(n)
+    @staticmethod
+    def dump_sorted(iterable: Iterable, fileobj: BinaryIO, allow_pickle: bool=False) -> int:
+        from algs_ds.datastructures.binarysearchtree.binarysearchtree_dump import dump_sorted
+        return dump_sorted(iterable, fileobj, allow_pickle=allow_pickle)
+
+    # Loads a tree written by dump or dump_sorted.
+    # When the count is known the balanced tree is built while reading,
+    # otherwise the elements are collected first. Pickled elements run code
+    # from the file, so they are only accepted if allow_pickle is set.
+    # Raises ValueError if the file is not a valid dump
+    # TC: O(n)
+    @classmethod
+    def load(cls, fileobj: BinaryIO, allow_pickle: bool=False) -> BinarySearchTree:
+        from algs_ds.datastructures.binarysearchtree.binarysearchtree_dump import load_sorted
+        count, elements = load_sorted(fileobj, allow_pickle)
+        if count == None: return cls.from_sorted(list(elements))
+
+        tree = cls()
+        try:
+            tree._root = tree._buildBalanced(elements, count)
+        except StopIteration:
+            raise ValueError("Truncated BST dump") from None
+        # The header count must match the records exactly,
+        # so the end marker has to come next
+        end = object()
+        if next(elements, end) is not end:
+            raise ValueError("BST dump holds more elements than its header says")
+        tree._nodeCount = count
+        return tree
+
+    # Returns a new tree holding the elements of both trees, neither is modified.
+    # The two in order streams are merged and the result is built bottom up
+    # TC: O(n + m)
+    def union(self, other: BinarySearchTree) -> BinarySearchTree:
+        return type(self).from_sorted(list(self._mergeSorted(
+            self.traverse(TraversalType.InOrder), other.traverse(TraversalType.InOrder))))
+
+    # Private method merging two strictly increasing iterators,
+    # elements found in both are yielded once
+    @staticmethod
+    def _mergeSorted(first: Iterator, second: Iterator) -> Iterator:
+        a, b = next(first, None), next(second, None)
+        while a is not None and b is not None:
+            if a < b:
+                yield a
+                a = next(first, None)
+            elif b < a:
+                yield b
+                b = next(second, None)
+            else:
+                yield a
+                a, b = next(first, None), next(second, None)
+
+        if a is not None:
+            yield a
+            yield from first
+        if b is not None:
+            yield b
+            yield from second
+
     # Check if BST is empty
     def isEmpty(self) -> bool:
         return len(self) == 0
@@ -45,101 +171,111 @@ class BinarySearchTree:
         return self._nodeCount
     
     # Adds a node to the BST
-    # Returns true if successful
-    # TC: O(log n)
+    # Returns true if successful, false if the element already exists
+    # Single iterative descent, so skewed trees cannot exhaust the recursion limit
+    # TC: O(log n) if the BST is skewed, it degenerates to O(n)
     def add(self, data: Any) -> bool:
-        # Checks if value exists in BST
-        # If it exists, ignore adding it
-        if self.contains(data):
-            return False
-        
-        # Otherwise add element to the BST
-        self._root = self._add(self._root, data)
+        parent, node, goLeft = None, self._root, False
+        path = []
+
+        # Dig down to the leaf position of data
+        while node:
+            path.append(node)
+            if data < node._data:
+                parent, node, goLeft = node, node._left, True
+            elif data > node._data:
+                parent, node, goLeft = node, node._right, False
+            else:
+                # Element exists, ignore adding it
+                return False
+
+        newNode = self._NodeType(data)
+        newNode._parent = parent
+        if parent == None: self._root = newNode
+        elif goLeft: parent._left = newNode
+        else: parent._right = newNode
+
+        # Every subtree on the way down gained a node, and
+        # can only have grown taller, fix them from the bottom up
+        height = 1
+        for ancestor in reversed(path):
+            ancestor._size += 1
+            if ancestor._height <= height: ancestor._height = height + 1
+            height = ancestor._height
+
         self._nodeCount += 1
         return True
     
-    # Private method to recursively add an element to the BST
-    # TC: O(log n)
-    def _add(self, node: _Node, data: Any) -> _Node:
-        # Base case: Found a leaf node
-        if not node:
-            node = _Node(data)
-            return node
-        
-        if data < node._data:
-            node._left = self._add(node._left, data)
-        else:
-            node._right = self._add(node._right, data)
-        
-        return node
-    
     # Removes a node from BST if exists
-    # Returns true if successful
+    # Returns true if successful, false if the element does not exist
+    # Single iterative descent, so skewed trees cannot exhaust the recursion limit
     # TC: O(log n) if the BST is skewed, it degenerates to O(n)
     def remove(self, data: Any) -> bool:
-        # Make sure the node we want to remove exists
-        if not self.contains(data):
+        parent, node, goLeft = None, self._root, False
+        path = []
+
+        # Dig down to the node we wish to remove
+        while node:
+            if data < node._data:
+                parent, node, goLeft = node, node._left, True
+            elif data > node._data:
+                parent, node, goLeft = node, node._right, False
+            else:
+                break
+            path.append(parent)
+
+        # The node we want to remove does not exist
+        if node == None:
             return False
-        
-        self._root = self._remove(self._root, data)
-        self._nodeCount -= 1
-        return True
-        
-    # Private method to recursively remove an element from the BST
-    # TC: O(log n) if the BST is skewed, it degenerates to O(n)
-    def _remove(self, node: _Node, data: Any) -> _Node:
-        if not node: return None
 
-        # Dig into the left subtree if data is smaller than current node
-        if data < node._data:
-            node._left = self._remove(node._left, data)
-        
-        # Dig into the right subtree if data is greater than current node
-        elif data > node._data:
-            node._right = self._remove(node._right, data)
-        
-        # Found the node we wish to remove
+        # When removing a node which has both subtrees
+        # the successor of the node being removed can either be
+        # the largest node on the left subtree or the
+        # smallest node on the right subtree
+        # This implementation takes the smallest node on the right subtree
+        if node._left != None and node._right != None:
+            # Find the leftmost node in the right subtree
+            successorParent, successor = node, node._right
+            path.append(node)
+            while successor._left != None:
+                successorParent, successor = successor, successor._left
+                path.append(successorParent)
+
+            # Swap the data
+            node._data = successor._data
+
+            # Unlink the successor, which has no left child.
+            # Prevents the BST from having two nodes with the same data
+            if successorParent is node: successorParent._right = successor._right
+            else: successorParent._left = successor._right
+            if successor._right: successor._right._parent = successorParent
+            successor._data = successor._right = successor._parent = None
+
+        # Otherwise the node to be removed has at most one subtree,
+        # replace the node with its only child (or nothing)
         else:
-            # First case:
-            # node to be removed has only a right subtree
-            # or no subtrees at all.
-            # Swap the node to be removed with its right child
-            if node._left == None:
-                rightChild = node._right
-                
-                node._data = None
-                node = None
-
-                return rightChild
-            
-            # Second case:
-            # node to be removed has only a left subtree
-            # Swap the node to be removed with its left child
-            elif node._right == None:
-                leftChild = node._left
-
-                node._data = None
-                node = None
-
-                return leftChild
-
-            # When removing a node which has both subtrees
-            # the successor of the node being removed can either be
-            # the largest node on the left subtree or the
-            # smallest node on the right subtree
-            # This implementation takes the smallest node on the right subtree
-            else:
-                # Find the leftmost node in the right subtree
-                temp = self._findMin(node._right)
+            child = node._left if node._left != None else node._right
+            if child: child._parent = parent
+            if parent == None: self._root = child
+            elif goLeft: parent._left = child
+            else: parent._right = child
+            node._data = node._left = node._right = node._parent = None
 
-                # Swap the data
-                node._data = temp._data
+        # Every subtree above the unlinked node lost a node, heights
+        # are recomputed from the bottom up until one does not change
+        shrinking = True
+        for ancestor in reversed(path):
+            ancestor._size -= 1
+            if shrinking:
+                left, right = ancestor._left, ancestor._right
+                leftHeight = left._height if left else 0
+                rightHeight = right._height if right else 0
+                height = (leftHeight if leftHeight > rightHeight else rightHeight) + 1
+                shrinking = height != ancestor._height
+                ancestor._height = height
 
-                # Go into the right subtree and remove the leftmost node
-                # that we found and swapped data with.
-                # Prevents the BST from having two nodes with the same data
-                node._right = self._remove(node._right, temp._data)
-        return node
+        self._nodeCount -= 1
+        return True
 
         
     # Private method to find the leftmost node
@@ -156,41 +292,222 @@ class BinarySearchTree:
             node = node._right
         return node
 
+    # Returns the smallest element, None if the BST is empty
+    # TC: O(log n) deteriorates to O(n) in case the BST is left skewed
+    def min(self) -> Any:
+        return self._findMin(self._root)._data if self._root else None
+
+    # Returns the largest element, None if the BST is empty
+    # TC: O(log n) deteriorates to O(n) if the BST is right skewed
+    def max(self) -> Any:
+        return self._findMax(self._root)._data if self._root else None
+
+    # Returns the largest element <= data, None if there is none
+    # TC: O(log n) deteriorates to O(n) if BST is skewed
+    def floor(self, data: Any) -> Any:
+        return self._below(data, True)
+
+    # Returns the smallest element >= data, None if there is none
+    # TC: O(log n) deteriorates to O(n) if BST is skewed
+    def ceiling(self, data: Any) -> Any:
+        return self._above(data, True)
+
+    # Returns the largest element < data, None if there is none
+    # data does not have to be in the BST
+    # TC: O(log n) deteriorates to O(n) if BST is skewed
+    def predecessor(self, data: Any) -> Any:
+        return self._below(data, False)
+
+    # Returns the smallest element > data, None if there is none
+    # data does not have to be in the BST
+    # TC: O(log n) deteriorates to O(n) if BST is skewed
+    def successor(self, data: Any) -> Any:
+        return self._above(data, False)
+
+    # Private method finding the largest element below data
+    # (or equal to it if inclusive is set)
+    def _below(self, data: Any, inclusive: bool) -> Any:
+        best, node = None, self._root
+        while node:
+            if data < node._data or (not inclusive and data == node._data):
+                node = node._left
+            else:
+                # Candidate, but a larger one may still be to the right
+                best = node
+                if data == node._data: break
+                node = node._right
+        return best._data if best else None
+
+    # Private method finding the smallest element above data
+    # (or equal to it if inclusive is set)
+    def _above(self, data: Any, inclusive: bool) -> Any:
+        best, node = None, self._root
+        while node:
+            if data > node._data or (not inclusive and data == node._data):
+                node = node._right
+            else:
+                # Candidate, but a smaller one may still be to the left
+                best = node
+                if data == node._data: break
+                node = node._left
+        return best._data if best else None
+
+    # Returns a lazy iterator over the elements e with lo <= e <= hi in order,
+    # or in descending order if reverse is set. A bound of None is open.
+    # Descends straight to the first element of the range and stops at the
+    # last one, so only the window and one root to leaf path are visited
+    # TC: O(log n + k) for k yielded elements, deteriorates if BST is skewed
+    def irange(self, lo: Any=None, hi: Any=None, reverse: bool=False) -> Iterator:
+        if reverse:
+            return self._irangeReverse(lo, hi)
+        return self._irangeForward(lo, hi)
+
+    def _irangeForward(self, lo: Any, hi: Any) -> Iterator:
+        # The stack holds the path of nodes >= lo still to be yielded
+        stack, node = [], self._root
+        while node:
+            if lo is not None and node._data < lo:
+                node = node._right
+            else:
+                stack.append(node)
+                node = node._left
+
+        while stack:
+            node = stack.pop()
+            if hi is not None and node._data > hi: return
+            yield node._data
+
+            # Everything in the right subtree is greater than node, dig left
+            node = node._right
+            while node:
+                stack.append(node)
+                node = node._left
+
+    def _irangeReverse(self, lo: Any, hi: Any) -> Iterator:
+        # Mirror image of _irangeForward
+        stack, node = [], self._root
+        while node:
+            if hi is not None and node._data > hi:
+                node = node._left
+            else:
+                stack.append(node)
+                node = node._right
+
+        while stack:
+            node = stack.pop()
+            if lo is not None and node._data < lo: return
+            yield node._data
+
+            node = node._left
+            while node:
+                stack.append(node)
+                node = node._right
+
     # Returns true if the element is present in the BST
     # TC: O(log n) deteriorates to O(n) if BST is skewed
     def contains(self, data: Any) -> bool:
-        return self._contains(self._root, data)
+        node = self._root
+        while node:
+            # Dig left because the value we are seeking
+            # is less than the current value
+            if data < node._data:
+                node = node._left
+
+            # Dig right because the value we are seeking
+            # is greater than the current value
+            elif data > node._data:
+                node = node._right
+
+            # Found the value we are looking for
+            else:
+                return True
+
+        # Reached bottom, value not found
+        return False
 
-    # Private method to recursively find element in the tree
+    # Returns the number of elements strictly less than data
     # TC: O(log n) deteriorates to O(n) if BST is skewed
-    def _contains(self, node: _Node, data: Any) -> bool:
-        # Base case: reached bottom, value not found
-        if node == None: return False
-
-        # Dig left because the value we are seeking
-        # is less than the current value
-        if data < node._data:
-            return self._contains(node._left, data)
-        
-        # Dig right because the value we are seeking
-        # is greater than the current value
-        elif data > node._data:
-            return self._contains(node._right, data)
-        
-        # Found the value we are looking for
-        else:
-            return True
+    def count_less(self, data: Any) -> int:
+        return self._countBelow(data, False)
 
-    # Computes the height of the BST
-    # TC: O(n)
+    # Returns the number of elements e with lo <= e <= hi
+    # TC: O(log n) deteriorates to O(n) if BST is skewed
+    def count_range(self, lo: Any, hi: Any) -> int:
+        if hi < lo: return 0
+        return self._countBelow(hi, True) - self._countBelow(lo, False)
+
+    # Returns the zero based position of data in sorted order
+    # Raises ValueError if data is not in the BST
+    # TC: O(log n) deteriorates to O(n) if BST is skewed
+    def rank(self, data: Any) -> int:
+        count, node = 0, self._root
+        while node:
+            if data < node._data:
+                node = node._left
+            elif data > node._data:
+                count += (node._left._size if node._left else 0) + 1
+                node = node._right
+            else:
+                return count + (node._left._size if node._left else 0)
+        raise ValueError(f"{data} is not in the BST")
+
+    # Returns the k-th smallest element, zero based
+    # Raises IndexError if k is out of range
+    # TC: O(log n) deteriorates to O(n) if BST is skewed
+    def select(self, k: int) -> Any:
+        if k < 0 or k >= len(self):
+            raise IndexError("Index out of range")
+
+        node = self._root
+        while True:
+            leftSize = node._left._size if node._left else 0
+            if k < leftSize:
+                node = node._left
+            elif k > leftSize:
+                k -= leftSize + 1
+                node = node._right
+            else:
+                return node._data
+
+    # Private method counting the elements below data,
+    # including data itself if inclusive is set
+    # TC: O(log n) deteriorates to O(n) if BST is skewed
+    def _countBelow(self, data: Any, inclusive: bool) -> int:
+        count, node = 0, self._root
+        while node:
+            if data < node._data:
+                node = node._left
+            elif data > node._data or inclusive:
+                # The node and its whole left subtree are below data
+                count += (node._left._size if node._left else 0) + 1
+                if data == node._data: break
+                node = node._right
+            else:
+                count += node._left._size if node._left else 0
+                break
+        return count
+
+    # Returns the height of the BST, kept up to date by add/remove
+    # TC: O(1)
     def height(self) -> int:
-        return self._height(self._root)
-    
-    # Private method to recursively compute the BST height
-    # TC: O(n)
-    def _height(self, node: _Node) -> int:
-        if node == None: return 0
-        return max(self._height(node._left), self._height(node._right)) + 1
+        return self._root._height if self._root else 0
+
+    @staticmethod
+    def _nodeHeight(node: _Node) -> int:
+        return node._height if node else 0
+
+    # Recomputes the height and subtree size of a node from its children
+    # and points the children back at it
+    # TC: O(1)
+    @staticmethod
+    def _update(node: _Node) -> None:
+        left, right = node._left, node._right
+        leftHeight, leftSize = (left._height, left._size) if left else (0, 0)
+        rightHeight, rightSize = (right._height, right._size) if right else (0, 0)
+        node._height = (leftHeight if leftHeight > rightHeight else rightHeight) + 1
+        node._size = 1 + leftSize + rightSize
+        if left: left._parent = node
+        if right: right._parent = node
 
     # Returns an iterator for a given TraversalType
     # preOrder, inOrder, postOrder, levelOrder
@@ -206,53 +523,70 @@ class BinarySearchTree:
         else:
             raise ValueError("Uknown traversal type")
     
+    # The traversals below follow parent pointers instead of keeping a stack,
+    # so they need O(1) extra memory whatever the shape of the tree
+
     # Returns an iterator to traverse the tree in pre order
     def _preOrder(self) -> Iterator:
-        stack = [self._root] if self._root else []
+        node = self._root
 
-        while stack:
-            node = stack.pop()
-            if node._right: stack.append(node._right)
-            if node._left: stack.append(node._left)
+        while node:
             yield node._data
 
+            # Children come first, left before right
+            if node._left:
+                node = node._left
+            elif node._right:
+                node = node._right
+            else:
+                # Climb until we come up from a left child whose
+                # parent still has an unvisited right subtree
+                parent = node._parent
+                while parent and (node is parent._right or parent._right == None):
+                    node, parent = parent, parent._parent
+                node = parent._right if parent else None
 
     # Returns an iterator to traverse the tree in order
     def _inOrder(self) -> Iterator:
-        stack = [self._root]
-        trav: _Node = self._root
-
-        while trav and stack:
-            # Dig left
-            while trav and trav._left:
-                stack.append(trav._left)
-                trav = trav._left
-            
-            node: _Node = stack.pop()
+        node = self._findMin(self._root) if self._root else None
 
-            # Try moving right once
-            if node._right:
-                stack.append(node._right)
-                trav = node._right
-            
+        while node:
             yield node._data
-        
+
+            # The successor is the leftmost node of the right subtree, or
+            # else the first ancestor we reach coming up from its left
+            if node._right:
+                node = self._findMin(node._right)
+            else:
+                parent = node._parent
+                while parent and node is parent._right:
+                    node, parent = parent, parent._parent
+                node = parent
 
     # Returns an iterator to traverse the tree post order
+    # Elements are streamed, nothing is buffered
     def _postOrder(self) -> Iterator:
-        stack1 = [self._root]
-        stack2 = []
-
-        while stack1:
-            node = stack1.pop()
-            if node:
-                stack2.append(node)
-                if node._left: stack1.append(node._left)
-                if node._right: stack1.append(node._right)
-        while stack2:
-            yield stack2.pop()._data
-        
+        node = self._firstPostOrder(self._root)
+
+        while node:
+            yield node._data
+
+            # A left child is followed by its sibling subtree,
+            # otherwise by its parent
+            parent = node._parent
+            if parent and node is parent._left and parent._right:
+                node = self._firstPostOrder(parent._right)
+            else:
+                node = parent
 
+    # Private method to find the first node of a subtree in post order:
+    # the leaf reached by digging left whenever possible, otherwise right
+    def _firstPostOrder(self, node: _Node) -> _Node:
+        while node:
+            if node._left: node = node._left
+            elif node._right: node = node._right
+            else: return node
+        return None
 
     def _levelOrder(self) -> Iterator:
         deq = deque([self._root]) if self._root else deque()
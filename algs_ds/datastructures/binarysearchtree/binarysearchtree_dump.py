@@ -0,0 +1,130 @@
+# A streaming binary dump format for ordered sets of elements
+#
+# Layout (all integers little endian):
+#   header   magic "ABST", version u16, reserved u16, count u64
+#   records  tag u8, length u32, payload
+#   end      tag 0xFF, length 0
+#
+# Elements are written one record at a time in increasing order, so
+# neither writing nor reading ever holds more than a small buffer, and a
+# reader knowing the count can bulk build a balanced tree as it goes.
+# bool, int, float, str and bytes are struct packed. Other elements are
+# pickled only if the writer passes allow_pickle, and loading them runs
+# code from the file, so readers must opt in with allow_pickle as well.
+# The count is unknown (all ones) when a non seekable stream was written
+# without one. A failed dump to a seekable file gets its magic wiped.
+#
+# Author: Alireza Ghey
+
+from __future__ import annotations
+from typing import Any, BinaryIO, Iterable, Iterator, Optional, Tuple
+import pickle
+import struct
+
+_MAGIC = b"ABST"
+_VERSION = 2
+_HEADER = struct.Struct("<4sHHQ")
+_RECORD = struct.Struct("<BI")
+_DOUBLE = struct.Struct("<d")
+_UNKNOWN_COUNT = 0xFFFFFFFFFFFFFFFF
+_NOTHING = object()
+
+_FALSE, _TRUE, _INT, _FLOAT, _STR, _BYTES, _PICKLE = range(7)
+_END = 0xFF
+
+# Records are buffered and written in blocks of about this many bytes
+BUFFER_SIZE = 1 << 16
+
+
+# Encodes an element as a (tag, payload) pair
+def _encode(el: Any, allow_pickle: bool) -> Tuple[int, bytes]:
+    if el is True: return _TRUE, b""
+    if el is False: return _FALSE, b""
+    kind = type(el)
+    if kind is int: return _INT, el.to_bytes((el.bit_length() + 8) // 8, "little", signed=True)
+    if kind is float: return _FLOAT, _DOUBLE.pack(el)
+    if kind is str: return _STR, el.encode("utf-8")
+    if kind is bytes: return _BYTES, el
+    if allow_pickle: return _PICKLE, pickle.dumps(el, protocol=pickle.HIGHEST_PROTOCOL)
+    raise TypeError(f"Unsupported type for BST dump {kind}, pass allow_pickle=True to pickle it")
+
+
+def _decode(tag: int, payload: bytes, allow_pickle: bool) -> Any:
+    if tag == _INT: return int.from_bytes(payload, "little", signed=True)
+    if tag == _STR: return str(payload, "utf-8")
+    if tag == _FLOAT: return _DOUBLE.unpack(payload)[0]
+    if tag == _BYTES: return bytes(payload)
+    if tag == _TRUE: return True
+    if tag == _FALSE: return False
+    if tag == _PICKLE:
+        if not allow_pickle: raise ValueError("BST dump holds pickled elements, pass allow_pickle=True to load it")
+        return pickle.loads(payload)
+    raise ValueError(f"Unknown record tag {tag} in BST dump")
+
+
+# Writes strictly increasing elements to fileobj and returns their number.
+# Raises ValueError if the elements are out of order, or if count is given
+# and does not match. Without a count the header is patched afterwards
+# when fileobj is seekable
+# TC: O(n)
+def dump_sorted(iterable: Iterable, fileobj: BinaryIO, count: Optional[int]=None, allow_pickle: bool=False) -> int:
+    start = fileobj.tell() if fileobj.seekable() else None
+    fileobj.write(_HEADER.pack(_MAGIC, _VERSION, 0, _UNKNOWN_COUNT if count == None else count))
+
+    try:
+        written, buffer, last = 0, bytearray(), _NOTHING
+        for el in iterable:
+            if last is not _NOTHING and not last < el:
+                raise ValueError("Elements must be strictly increasing")
+            tag, payload = _encode(el, allow_pickle)
+            buffer += _RECORD.pack(tag, len(payload))
+            buffer += payload
+            if len(buffer) >= BUFFER_SIZE:
+                fileobj.write(buffer)
+                buffer = bytearray()
+            last = el
+            written += 1
+
+        buffer += _RECORD.pack(_END, 0)
+        fileobj.write(buffer)
+        if count != None and count != written:
+            raise ValueError(f"Expected {count} elements, got {written}")
+    except BaseException:
+        # Do not leave a header behind that looks valid
+        if start != None:
+            fileobj.seek(start)
+            fileobj.write(_HEADER.pack(b"\0" * 4, 0, 0, 0))
+        raise
+
+    if count == None and start != None:
+        end = fileobj.tell()
+        fileobj.seek(start)
+        fileobj.write(_HEADER.pack(_MAGIC, _VERSION, 0, written))
+        fileobj.seek(end)
+    return written
+
+
+# Reads the header of a dump and returns the element count (None if unknown)
+# together with a lazy iterator over the elements in increasing order
+def load_sorted(fileobj: BinaryIO, allow_pickle: bool=False) -> Tuple[Optional[int], Iterator]:
+    magic, version, _, count = _HEADER.unpack(_read_exact(fileobj, _HEADER.size))
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Not a BST dump")
+    return (None if count == _UNKNOWN_COUNT else count), _elements(fileobj, allow_pickle)
+
+
+def _elements(fileobj: BinaryIO, allow_pickle: bool) -> Iterator:
+    while True:
+        tag, length = _RECORD.unpack(_read_exact(fileobj, _RECORD.size))
+        if tag == _END: return
+        yield _decode(tag, _read_exact(fileobj, length), allow_pickle)
+
+
+# Reads exactly n bytes, streams such as pipes may return less per read
+def _read_exact(fileobj: BinaryIO, n: int) -> bytes:
+    data = fileobj.read(n)
+    while len(data) < n:
+        more = fileobj.read(n - len(data))
+        if not more: raise ValueError("Truncated BST dump")
+        data += more
+    return data
@@ -0,0 +1,168 @@
+from __future__ import annotations
+from typing import Any, Iterator
+from algs_ds.datastructures.binarysearchtree.avltree import AVLTree
+from algs_ds.datastructures.binarysearchtree.binarysearchtree import _Node
+# A persistent (path copying) AVL tree implementation
+#
+# Nodes are never modified once they are part of a tree. add and remove
+# copy the O(log n) nodes on the path to the change and share every other
+# subtree with the previous version, then swap in the new root. A snapshot
+# is just another handle on the current root, so readers can iterate a
+# stable version without locks or copies while a writer keeps going.
+# A shared node has one parent per version, so parent pointers are not
+# maintained and the traversals keep an O(log n) stack instead.
+#
+# Author: Alireza Ghey
+
+class PersistentAVLTree(AVLTree):
+    # Returns an independent tree sharing the current version
+    # TC: O(1)
+    def snapshot(self) -> PersistentAVLTree:
+        tree = type(self)()
+        tree._root = self._root
+        tree._nodeCount = self._nodeCount
+        return tree
+
+    # Adds an element, older versions are left untouched
+    # Returns true if successful
+    # TC: O(log n)
+    def add(self, data: Any) -> bool:
+        count = self._nodeCount
+        self._root = self._add(self._root, data)
+        return self._nodeCount != count
+
+    # Removes an element, older versions are left untouched
+    # Returns true if successful
+    # TC: O(log n)
+    def remove(self, data: Any) -> bool:
+        count = self._nodeCount
+        self._root = self._remove(self._root, data)
+        return self._nodeCount != count
+
+    # Private method adding an element by copying the search path
+    # Returns the untouched node if data already exists
+    # TC: O(log n)
+    def _add(self, node: _Node, data: Any) -> _Node:
+        # Base case: Found a leaf node
+        if not node:
+            self._nodeCount += 1
+            return self._NodeType(data)
+
+        if data < node._data:
+            left = self._add(node._left, data)
+            if left is node._left: return node
+            return self._makeNode(node._data, left, node._right)
+        elif data > node._data:
+            right = self._add(node._right, data)
+            if right is node._right: return node
+            return self._makeNode(node._data, node._left, right)
+
+        # Already present, nothing changes
+        return node
+
+    # Private method removing an element by copying the search path
+    # Returns the untouched node if data does not exist
+    # TC: O(log n)
+    def _remove(self, node: _Node, data: Any) -> _Node:
+        if not node: return None
+
+        if data < node._data:
+            left = self._remove(node._left, data)
+            if left is node._left: return node
+            return self._makeNode(node._data, left, node._right)
+        elif data > node._data:
+            right = self._remove(node._right, data)
+            if right is node._right: return node
+            return self._makeNode(node._data, node._left, right)
+
+        # Found the node, nodes with at most one child are replaced by that child
+        self._nodeCount -= 1
+        if node._left == None: return node._right
+        if node._right == None: return node._left
+
+        # Otherwise the successor takes its place
+        successor = self._findMin(node._right)
+        return self._makeNode(successor._data, node._left, self._removeMin(node._right))
+
+    # Private method returning a copy of the subtree without its smallest element
+    def _removeMin(self, node: _Node) -> _Node:
+        if node._left == None: return node._right
+        return self._makeNode(node._data, self._removeMin(node._left), node._right)
+
+    # Private method joining left, data and right where left < data < right
+    # by copying the spine of the taller subtree
+    # TC: O(|height(left) - height(right)| + 1)
+    def _join(self, left: _Node, data: Any, right: _Node) -> _Node:
+        leftHeight = self._nodeHeight(left)
+        rightHeight = self._nodeHeight(right)
+
+        if leftHeight > rightHeight + 1:
+            return self._makeNode(left._data, left._left, self._join(left._right, data, right))
+        if rightHeight > leftHeight + 1:
+            return self._makeNode(right._data, self._join(left, data, right._left), right._right)
+        return self._NodeType(data, left, right)
+
+    # Private method creating a new balanced node out of data and two subtrees
+    # whose heights differ by at most two. Rotations create new nodes as well,
+    # so left and right are shared, never modified
+    # TC: O(1)
+    def _makeNode(self, data: Any, left: _Node, right: _Node) -> _Node:
+        Node = self._NodeType
+        leftHeight = self._nodeHeight(left)
+        rightHeight = self._nodeHeight(right)
+
+        # Left heavy
+        if leftHeight > rightHeight + 1:
+            if self._nodeHeight(left._right) > self._nodeHeight(left._left):
+                pivot = left._right
+                return Node(pivot._data,
+                               Node(left._data, left._left, pivot._left),
+                               Node(data, pivot._right, right))
+            return Node(left._data, left._left, Node(data, left._right, right))
+
+        # Right heavy
+        if rightHeight > leftHeight + 1:
+            if self._nodeHeight(right._left) > self._nodeHeight(right._right):
+                pivot = right._left
+                return Node(pivot._data,
+                               Node(data, left, pivot._left),
+                               Node(right._data, pivot._right, right._right))
+            return Node(right._data, Node(data, left, right._left), right._right)
+
+        return Node(data, left, right)
+
+    # Returns an iterator to traverse the tree in pre order
+    # TC: O(n), the stack never holds more than O(log n) nodes
+    def _preOrder(self) -> Iterator:
+        stack = [self._root] if self._root else []
+
+        while stack:
+            node = stack.pop()
+            if node._right: stack.append(node._right)
+            if node._left: stack.append(node._left)
+            yield node._data
+
+    # Returns an iterator to traverse the tree in order
+    # TC: O(n), the stack never holds more than O(log n) nodes
+    def _inOrder(self) -> Iterator:
+        return self.irange()
+
+    # Returns an iterator to traverse the tree post order
+    # TC: O(n), the stack never holds more than O(log n) nodes
+    def _postOrder(self) -> Iterator:
+        stack, node, last = [], self._root, None
+
+        while stack or node:
+            # Dig left
+            if node:
+                stack.append(node)
+                node = node._left
+                continue
+
+            # Visit the right subtree first, then the node itself
+            top = stack[-1]
+            if top._right and top._right is not last:
+                node = top._right
+            else:
+                last = stack.pop()
+                yield last._data
@@ -0,0 +1,225 @@
+from __future__ import annotations
+from typing import Any, Optional, Callable, Iterator
+import sys
+import time
+
+from algs_ds.datastructures.hashtable.hashtable_separatechaining import HashtableSeparateChaining
+
+# An LRU cache with optional TTL expiry
+#
+# A HashtableSeparateChaining maps keys to nodes of an intrusive doubly
+# linked list ordered by recency, so get, put and eviction each need
+# a single hashtable lookup and O(1) list relinking.
+#
+# Author: Alireza Ghey
+
+# Private Node class for internal use.
+# Holds the cached value along with its recency links, size and expiry
+class _Node:
+    __slots__ = ("_key", "_data", "_size", "_expires", "_prev", "_next")
+
+    def __init__(self, key: Any, data: Any, size: int, expires: Optional[float]):
+        self._key = key
+        self._data = data
+        self._size = size
+        self._expires = expires
+        self._prev: _Node = None
+        self._next: _Node = None
+
+    def __str__(self):
+        return str(self._key) + " => " + str(self._data)
+
+
+class LRUCache:
+    # max_entries and max_bytes bound the cache, the least recently used
+    # entries are evicted first. sizeof computes the bytes accounted for
+    # a value (sys.getsizeof by default). default_ttl is the lifetime in
+    # seconds of entries that are put without an explicit ttl, None meaning
+    # no expiry. clock is injectable for testing.
+    def __init__(self, max_entries: Optional[int]=None, max_bytes: Optional[int]=None,
+                 default_ttl: Optional[float]=None, sizeof: Optional[Callable[[Any], int]]=None,
+                 clock: Optional[Callable[[], float]]=None):
+        if max_entries != None and max_entries <= 0: raise ValueError("Illegal max entries")
+        if max_bytes != None and max_bytes <= 0: raise ValueError("Illegal max bytes")
+        if default_ttl != None and default_ttl <= 0: raise ValueError("Illegal ttl")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._sizeof = sizeof or sys.getsizeof
+        self._clock = clock or time.monotonic
+
+        self._table = HashtableSeparateChaining()
+        # Most recently used node
+        self._head: _Node = None
+        # Least recently used node, the next one to be evicted
+        self._tail: _Node = None
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # Returns the number of entries, including expired ones not yet collected
+    def __len__(self) -> int:
+        return len(self._table)
+
+    # Whether cache is empty
+    def isEmpty(self) -> bool:
+        return len(self) == 0
+
+    # Returns the bytes accounted for all cached values
+    def nbytes(self) -> int:
+        return self._bytes
+
+    # Returns the cached value of k and marks it as most recently used.
+    # Returns default on a miss or if the entry has expired
+    # TC: O(1)
+    def get(self, k: Any, default: Any=None) -> Any:
+        node = self._table.get(k)
+        if node == None or self._expired(node):
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        if node is not self._head:
+            self._unlink(node)
+            self._push_front(node)
+        return node._data
+
+    # Returns the cached value of k without touching recency or counters
+    # TC: O(1)
+    def peek(self, k: Any, default: Any=None) -> Any:
+        node = self._table.get(k)
+        if node == None or self._expired(node): return default
+        return node._data
+
+    # Whether k is cached and not expired. Does not touch recency
+    # TC: O(1)
+    def contains(self, k: Any) -> bool:
+        node = self._table.get(k)
+        return node != None and not self._expired(node)
+
+    # Caches v under k as the most recently used entry, then evicts least
+    # recently used entries until the limits hold again.
+    # ttl overrides default_ttl for this entry.
+    # Returns the previous value, or None
+    # TC: O(1) amortized
+    def put(self, k: Any, v: Any, ttl: Optional[float]=None) -> Any:
+        if ttl != None and ttl <= 0: raise ValueError("Illegal ttl")
+        ttl = ttl if ttl != None else self.default_ttl
+        expires = self._clock() + ttl if ttl != None else None
+
+        node = _Node(k, v, self._sizeof(v) if self.max_bytes != None else 0, expires)
+        # insert returns the replaced node, so a single lookup suffices
+        old = self._table.insert(k, node)
+        self._push_front(node)
+        self._bytes += node._size
+
+        old_val = None
+        if old != None:
+            self._unlink(old)
+            self._bytes -= old._size
+            if not self._expired_at(old, self._clock()): old_val = old._data
+
+        self._evict()
+        return old_val
+
+    # Removes k from the cache and returns its value, or None.
+    # An expired entry is dropped as well but counts as absent
+    # TC: O(1)
+    def remove(self, k: Any) -> Any:
+        node = self._table.remove(k)
+        if node == None: return None
+        self._unlink(node)
+        self._bytes -= node._size
+        if self._expired_at(node, self._clock()):
+            self.expirations += 1
+            return None
+        return node._data
+
+    # Removes all entries, counters are kept
+    # TC: O(1)
+    def clear(self) -> None:
+        self._table = HashtableSeparateChaining()
+        self._head = self._tail = None
+        self._bytes = 0
+
+    # Drops every expired entry instead of waiting for it to be touched
+    # TC: O(n)
+    def purge_expired(self) -> int:
+        now, purged = self._clock(), 0
+        node = self._head
+        while node != None:
+            nextNode = node._next
+            if self._expired_at(node, now):
+                self._discard(node)
+                self.expirations += 1
+                purged += 1
+            node = nextNode
+        return purged
+
+    # Returns an Iterator over (key, value) pairs from most to least recently used,
+    # skipping expired entries. Does not touch recency
+    def items(self) -> Iterator:
+        now = self._clock()
+        node = self._head
+        while node != None:
+            if not self._expired_at(node, now):
+                yield (node._key, node._data)
+            node = node._next
+
+    # Returns an Iterator over keys from most to least recently used
+    def keys(self) -> Iterator:
+        for k, _ in self.items():
+            yield k
+
+    # Returns an Iterator over values from most to least recently used
+    def values(self) -> Iterator:
+        for _, v in self.items():
+            yield v
+
+    # Lazy expiration: an expired node is dropped as soon as it is touched
+    def _expired(self, node: _Node) -> bool:
+        if node._expires == None or not self._expired_at(node, self._clock()):
+            return False
+        self._discard(node)
+        self.expirations += 1
+        return True
+
+    @staticmethod
+    def _expired_at(node: _Node, now: float) -> bool:
+        return node._expires != None and node._expires <= now
+
+    # Evicts least recently used entries while any limit is exceeded
+    def _evict(self) -> None:
+        max_entries, max_bytes = self.max_entries, self.max_bytes
+        while self._tail != None and ((max_entries != None and len(self) > max_entries)
+                                      or (max_bytes != None and self._bytes > max_bytes)):
+            self._discard(self._tail)
+            self.evictions += 1
+
+    # Removes a node from both the hashtable and the recency list
+    def _discard(self, node: _Node) -> None:
+        self._table.remove(node._key)
+        self._unlink(node)
+        self._bytes -= node._size
+
+    # Places a detached node at the head of the recency list
+    # TC: O(1)
+    def _push_front(self, node: _Node) -> None:
+        node._prev = None
+        node._next = self._head
+        if self._head != None: self._head._prev = node
+        else: self._tail = node
+        self._head = node
+
+    # Detaches a node from the recency list
+    # TC: O(1)
+    def _unlink(self, node: _Node) -> None:
+        if node._prev != None: node._prev._next = node._next
+        else: self._head = node._next
+        if node._next != None: node._next._prev = node._prev
+        else: self._tail = node._prev
+        node._prev = node._next = None
@@ -0,0 +1,215 @@
+# A Hashtable implementation using open addressing with linear probing
+#
+# Hashes, keys and values live in three parallel flat lists instead of
+# per entry objects and per bucket linked lists, so a lookup touches a
+# handful of contiguous slots. Deletions use backward shifting, which
+# keeps probe sequences short without leaving tombstones behind.
+#
+# Author: Alireza Ghey
+
+from __future__ import annotations
+from typing import Any, Optional, Iterator
+
+
+class HashtableOpenAddressing:
+    DEFAULT_CAPACITY = 8
+    DEFAULT_LOAD_FACTOR = 0.6
+
+    def __init__(self, capacity: Optional[int]=None, max_load_factor: Optional[float]=None):
+        if capacity and capacity < 0: raise ValueError("Illegal capacity")
+        if max_load_factor != None and (max_load_factor <= 0 or max_load_factor >= 1):
+            raise ValueError("Max load factor must be between 0 and 1, exclusive")
+
+        self.max_load_factor = max_load_factor or HashtableOpenAddressing.DEFAULT_LOAD_FACTOR
+        self.capacity = max(capacity or HashtableOpenAddressing.DEFAULT_CAPACITY, 2)
+        self.threshold = int(self.capacity * self.max_load_factor)
+        # A slot is empty iff its hash is None
+        self._hashes = [None] * self.capacity
+        self._keys = [None] * self.capacity
+        self._values = [None] * self.capacity
+        self.size = 0
+
+    # Returns number of elements currently inside the hashtable
+    def __len__(self) -> int:
+        return self.size
+
+    # Returns whether hashtable is empty
+    def isEmpty(self) -> bool:
+        return len(self) == 0
+
+
+    # Converts a hash value to an index in table.
+    # Strips potential negative sign and places the hashvalue
+    # in the domain [0, capacity)
+    def _normalize_index(self, key_hash) -> int:
+        return key_hash % self.capacity
+
+
+    # Clears all the contents of the hashtable
+    def clear(self):
+        self._hashes = [None] * self.capacity
+        self._keys = [None] * self.capacity
+        self._values = [None] * self.capacity
+        self.size = 0
+
+
+    # Returns whether hashtable contains specific key
+    def contains_key(self, k: Any) -> bool:
+        return self.has_key(k)
+
+
+    # Returns whether hashtable contains specific key
+    def has_key(self, k: Any) -> bool:
+        if k is None: raise ValueError("Null key")
+        return self._probe(k, hash(k)) >= 0
+
+
+    # insert, put, and add all place a key value pair in hashtable
+    def put(self, k: Any, v: Any) -> Any:
+        return self.insert(k, v)
+
+
+    def add(self, k: Any, v: Any) -> Any:
+        return self.insert(k, v)
+
+
+    # Returns old value if key existed, else None
+    def insert(self, k: Any, v: Any) -> Any:
+        if k is None: raise ValueError("Null key")
+
+        key_hash = hash(k)
+        index = self._probe(k, key_hash)
+        if index >= 0:
+            old_val = self._values[index]
+            self._values[index] = v
+            return old_val
+
+        # The probe returns the first empty slot of the sequence, inverted
+        index = ~index
+        self._hashes[index] = key_hash
+        self._keys[index] = k
+        self._values[index] = v
+        self.size += 1
+        if self.size > self.threshold:
+            self._resize_table()
+        return None # Indicates that the entry was non-existent
+
+
+    # Gets a key's value from the map and returns the value.
+    # NOTE: returns None if the value is None AND also returns
+    # None if the key does not exists.
+    def get(self, k: Any) -> Any:
+        if k is None: return None
+
+        index = self._probe(k, hash(k))
+        if index >= 0: return self._values[index]
+
+
+    # Removes a key from the map and returns the value
+    # NOTE: returns None if the value is None AND also
+    # returns None if the key does not exist.
+    def remove(self, k: Any) -> Any:
+        if k is None: raise ValueError("Null key")
+
+        index = self._probe(k, hash(k))
+        if index < 0: return None
+
+        old_val = self._values[index]
+        self._delete_slot(index)
+        self.size -= 1
+        return old_val
+
+
+    # Walks the probe sequence of a key.
+    # Returns the slot index if the key is present, otherwise the
+    # bitwise inverse (~i, always negative) of the empty slot ending the sequence.
+    # Stored hashes are compared before keys so __eq__ only runs on real candidates
+    # TC: O(1) expected
+    def _probe(self, k: Any, key_hash: int) -> int:
+        hashes, keys, capacity = self._hashes, self._keys, self.capacity
+        index = key_hash % capacity
+        while True:
+            slot_hash = hashes[index]
+            if slot_hash is None:
+                return ~index
+            if slot_hash == key_hash:
+                slot_key = keys[index]
+                if slot_key is k or slot_key == k:
+                    return index
+            index += 1
+            if index == capacity: index = 0
+
+
+    # Empties a slot and shifts later members of its cluster back
+    # so that no lookup is cut short by the new hole
+    # TC: O(1) expected
+    def _delete_slot(self, hole: int):
+        hashes, keys, values, capacity = self._hashes, self._keys, self._values, self.capacity
+        index = hole
+        while True:
+            index += 1
+            if index == capacity: index = 0
+            slot_hash = hashes[index]
+            if slot_hash is None: break
+
+            # An entry may only move back if the hole lies between
+            # its home slot and its current slot (cyclically)
+            home = slot_hash % capacity
+            if (index - home) % capacity >= (index - hole) % capacity:
+                hashes[hole] = slot_hash
+                keys[hole] = keys[index]
+                values[hole] = values[index]
+                hole = index
+
+        hashes[hole] = keys[hole] = values[hole] = None
+
+
+    # Resizes the flat arrays and reinserts every entry
+    # using the cached hashes
+    def _resize_table(self):
+        old_hashes, old_keys, old_values = self._hashes, self._keys, self._values
+
+        self.capacity *= 2
+        self.threshold = int(self.capacity * self.max_load_factor)
+        capacity = self.capacity
+        hashes = self._hashes = [None] * capacity
+        keys = self._keys = [None] * capacity
+        values = self._values = [None] * capacity
+
+        for i, key_hash in enumerate(old_hashes):
+            if key_hash is None: continue
+            index = key_hash % capacity
+            while hashes[index] is not None:
+                index += 1
+                if index == capacity: index = 0
+            hashes[index] = key_hash
+            keys[index] = old_keys[i]
+            values[index] = old_values[i]
+
+
+    # Returns an Iterator over the keys found in the hashtable
+    def keys(self) -> Iterator:
+        for key_hash, k in zip(self._hashes, self._keys):
+            if key_hash is not None: yield k
+
+
+    # Returns an Iterator over the values found in the hashtable
+    def values(self) -> Iterator:
+        for key_hash, v in zip(self._hashes, self._values):
+            if key_hash is not None: yield v
+
+
+    # Returns an Iterator over the key/value pairs in the hashtable
+    # Key and values are packages ad (key, value) tuples
+    def items(self) -> Iterator:
+        for key_hash, k, v in zip(self._hashes, self._keys, self._values):
+            if key_hash is not None: yield (k, v)
+
+
+    # Returns a string representation of the hashtable
+    def __str__(self) -> str:
+        res = ["{"]
+        for k, v in self.items():
+            res.extend(["\n", "\t", str(k) + " => " + str(v)])
+        res.extend(["\n", "}"])
+        return "".join(res)
@@ -1,19 +1,29 @@
 # A Hashtable implementation
 #
+# Each bucket is either None or a plain Python list of entries,
+# and entries use __slots__, keeping the per key overhead small.
+# Buckets that grow past TREEIFY_THRESHOLD entries are turned into
+# ordered _TreeBuckets, bounding lookups in heavily colliding buckets.
 #
 # Author: Alireza Ghey
 
 from __future__ import annotations
-from typing import Any, Optional, List, Iterator
+from typing import Any, Optional, List, Iterator, Iterable
 from collections.abc import Hashable
+from bisect import bisect_left, bisect_right
 
 class Entry:
-    def __init__(self, k: Any, v: Any):
-        if not isinstance(k, Hashable):
-            raise TypeError(f"Unhashable type {type(k)}")
+    __slots__ = ("key", "value", "hash")
+
+    # key_hash can be passed in by callers that already hashed the key
+    def __init__(self, k: Any, v: Any, key_hash: Optional[int]=None):
+        if key_hash == None:
+            if not isinstance(k, Hashable):
+                raise TypeError(f"Unhashable type {type(k)}")
+            key_hash = hash(k)
         self.key = k
         self.value = v
-        self.hash = hash(k)
+        self.hash = key_hash
         
 
     def __eq__(self, other: Entry) -> bool:
@@ -22,23 +32,157 @@ class Entry:
 
     def __str__(self):
         return str(self.key) + " => " + str(self.value)
-    
+
+
+# Key types whose < is a total order, so runs of such keys can be binary searched
+_TOTALLY_ORDERED = (int, str, bytes, float)
+
+# Private ordered bucket for internal use.
+# Entries are kept sorted by hash in a flat list, which is binary
+# searched like a perfectly balanced BST: entries with other hashes are
+# skipped in O(log n). Runs of equal hashes are only ordered, and binary
+# searched, by key while all keys are of the same built-in type with a
+# total order (int, str, bytes or float without NaN). Any other key type
+# may define < as a partial order (frozensets, tuples holding NaN...), so
+# as soon as one shows up runs keep insertion order and are scanned.
+class _TreeBucket:
+    __slots__ = ("_hashes", "_entries", "_keyType")
+
+    def __init__(self, entries: List[Entry]):
+        keyType = type(entries[0].key) if entries else None
+        if keyType not in _TOTALLY_ORDERED or not all(self._orderable(e.key, keyType) for e in entries):
+            keyType = None
+        # The type of all keys while runs are ordered by key, else None
+        self._keyType = keyType
+
+        if keyType is None:
+            entries = sorted(entries, key=lambda e: e.hash)
+        else:
+            entries = sorted(entries, key=lambda e: (e.hash, e.key))
+        self._entries = entries
+        self._hashes = [e.hash for e in entries]
+
+    # Whether k can take part in the key order of a bucket of keyType keys
+    @staticmethod
+    def _orderable(k: Any, keyType: type) -> bool:
+        return type(k) is keyType and (keyType is not float or k == k)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._entries)
+
+    # Returns the index of the entry with key k, else -1
+    # TC: O(log n), O(log n + run) for other keys sharing a hash
+    def _index(self, k: Any, key_hash: int) -> int:
+        entries = self._entries
+        lo = bisect_left(self._hashes, key_hash)
+        hi = bisect_right(self._hashes, key_hash, lo)
+
+        if hi - lo > 1 and self._keyType is not None and self._orderable(k, self._keyType):
+            while lo < hi:
+                mid = (lo + hi) // 2
+                mid_key = entries[mid].key
+                if mid_key is k or mid_key == k: return mid
+                if mid_key < k: lo = mid + 1
+                else: hi = mid
+            return -1
+
+        for i in range(lo, hi):
+            entry_key = entries[i].key
+            if entry_key is k or entry_key == k: return i
+        return -1
+
+    # Finds and returns the entry with key k, else None
+    def find(self, k: Any, key_hash: int) -> Optional[Entry]:
+        i = self._index(k, key_hash)
+        return None if i < 0 else self._entries[i]
+
+    # Inserts an entry whose key is known not to be in the bucket yet
+    # TC: O(log n) comparisons, plus shifting the flat lists
+    def append(self, entry: Entry):
+        entries, k = self._entries, entry.key
+        lo = bisect_left(self._hashes, entry.hash)
+        hi = bisect_right(self._hashes, entry.hash, lo)
+
+        if self._keyType is not None:
+            if self._orderable(k, self._keyType):
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    if k < entries[mid].key: hi = mid
+                    else: lo = mid + 1
+            else:
+                # Sorted runs are still fine to scan, just stop relying on the order
+                self._keyType = None
+        self._entries.insert(hi, entry)
+        self._hashes.insert(hi, entry.hash)
+
+    # Removes and returns the entry with key k, else None
+    def remove(self, k: Any, key_hash: int) -> Optional[Entry]:
+        i = self._index(k, key_hash)
+        if i < 0: return None
+        del self._hashes[i]
+        return self._entries.pop(i)
+
 
 class HashtableSeparateChaining:
     DEFAULT_CAPACITY = 3
     DEFAULT_LOAD_FACTOR = 0.75
-
-    def __init__(self, capacity: Optional[int]=None, max_load_factor: Optional[float]=None):
+    # Bucket sizes at which a list bucket turns into a _TreeBucket and back
+    TREEIFY_THRESHOLD = 8
+    UNTREEIFY_THRESHOLD = 6
+    # Non-empty old buckets migrated per operation while an incremental resize runs
+    DEFAULT_REHASH_STEP = 4
+    # Empty old buckets a single migration step may skip over per bucket of work
+    EMPTY_VISITS_PER_STEP = 10
+
+    # min_load_factor enables shrinking: once a remove drops the load below it,
+    # the table halves. It has to stay below half of max_load_factor so that
+    # a freshly shrunk table does not immediately grow again.
+    def __init__(self, capacity: Optional[int]=None, max_load_factor: Optional[float]=None,
+                 incremental_resize: bool=False, rehash_step: Optional[int]=None,
+                 min_load_factor: Optional[float]=None):
         if capacity and capacity < 0: raise ValueError("Illegal capacity")
         if max_load_factor != None and (max_load_factor <= 0 or max_load_factor >= 1):
             raise ValueError("Max load factor must be between 0 and 1, exclusive")
+        if rehash_step != None and rehash_step <= 0: raise ValueError("Illegal rehash step")
 
         self.max_load_factor = max_load_factor or HashtableSeparateChaining.DEFAULT_LOAD_FACTOR
-        self.capacity = capacity or HashtableSeparateChaining.DEFAULT_CAPACITY
-        self.threshold = int(self.capacity * self.max_load_factor)
+        if min_load_factor != None and (min_load_factor < 0 or min_load_factor >= self.max_load_factor / 2):
+            raise ValueError("Min load factor must be between 0 and half the max load factor")
+
+        self.min_load_factor = min_load_factor or 0
+        self._set_capacity(capacity or HashtableSeparateChaining.DEFAULT_CAPACITY)
         self.table = [None] * self.capacity
         self.size = 0
 
+        # Incremental resizing: when enabled, a resize only allocates the new table.
+        # The old table stays alive and every subsequent operation migrates a
+        # bounded number of its buckets, so no single call pays for a full rehash.
+        self.incremental_resize = incremental_resize
+        self.rehash_step = rehash_step or HashtableSeparateChaining.DEFAULT_REHASH_STEP
+        self._old_table = None
+        # Number of old buckets the migration cursor has passed in the current resize
+        self.migrated_buckets = 0
+        # Number of old buckets that the current resize has to migrate in total
+        self.buckets_to_migrate = 0
+
+    # Builds a hashtable from a mapping or an iterable of (key, value) pairs.
+    # The table is sized once for expected_size entries (or len(iterable)
+    # if available) and filled in a single pass without intermediate resizes
+    # TC: O(n)
+    @classmethod
+    def from_items(cls, items: Any, expected_size: Optional[int]=None,
+                   max_load_factor: Optional[float]=None) -> HashtableSeparateChaining:
+        if hasattr(items, "items"): items = items.items()
+        if expected_size == None and hasattr(items, "__len__"): expected_size = len(items)
+
+        table = cls(max_load_factor=max_load_factor)
+        if expected_size: table.reserve(expected_size)
+        table.update(items)
+        return table
+
     # Returns number of elements currently inside the hashtable
     def __len__(self) -> int:
         return self.size
@@ -47,6 +191,11 @@ class HashtableSeparateChaining:
     def isEmpty(self) -> bool:
         return len(self) == 0
 
+    # Returns whether an incremental resize is in progress,
+    # i.e. entries are still spread over an old and a new table
+    def isResizing(self) -> bool:
+        return self._old_table != None
+
     
     # Converts a hash value to an index in table.
     # Strips potential negative sign and places the hashvalue
@@ -55,11 +204,93 @@ class HashtableSeparateChaining:
         return key_hash % self.capacity
 
 
-    # Clears all the contents of the hashtable
+    # Sets the capacity along with the grow and shrink thresholds derived from it
+    def _set_capacity(self, capacity: int):
+        self.capacity = capacity
+        self.threshold = int(capacity * self.max_load_factor)
+        self.min_threshold = int(capacity * self.min_load_factor)
+
+
+    # Clears all the contents of the hashtable.
+    # The capacity is kept, call compact afterwards to release it
     def clear(self):
-        for i in range(len(self)):
-            self.table[i] = None
+        self.table = [None] * self.capacity
         self.size = 0
+        self._old_table = None
+        self.migrated_buckets = self.buckets_to_migrate = 0
+
+
+    # Writes the entries to a binary snapshot file, see hashtable_snapshot
+    # for the layout. Keys and values must be None, bool, int, float, str or bytes
+    # TC: O(n)
+    def save(self, path: str):
+        from algs_ds.datastructures.hashtable.hashtable_snapshot import save
+        save(self, path)
+
+
+    # Loads a snapshot written by save.
+    # With mmap the file is only mapped and a read-only MappedHashtable is
+    # returned, which decodes keys and values on access. Otherwise all
+    # entries are read into a new hashtable in a single bulk load
+    # TC: O(1) with mmap, O(n) otherwise
+    @classmethod
+    def load(cls, path: str, mmap: bool=True) -> Any:
+        from algs_ds.datastructures.hashtable.hashtable_snapshot import MappedHashtable
+        mapped = MappedHashtable(path)
+        if mmap: return mapped
+        with mapped:
+            return cls.from_items(mapped.items(), expected_size=len(mapped))
+
+
+    # Returns the smallest capacity whose threshold fits n entries
+    def _capacity_for(self, n: int) -> int:
+        capacity = max(int(n / self.max_load_factor), 1)
+        while int(capacity * self.max_load_factor) < n:
+            capacity += 1
+        return capacity
+
+
+    # Grows the table so that it can hold n entries without resizing.
+    # Any pending incremental resize is finished and the rehash happens
+    # right away, as reserve is meant to be called ahead of bulk loads
+    # TC: O(n)
+    def reserve(self, n: int):
+        if n < 0: raise ValueError("Illegal size")
+        if self._old_table != None: self._finish_resize()
+        if n > self.threshold:
+            self._rehash(self._capacity_for(n))
+
+
+    # Inserts all pairs of a mapping or an iterable of (key, value) pairs.
+    # Sized iterables reserve room up front, keys are hashed once and
+    # entries are only allocated for keys that are not present yet
+    # TC: O(n)
+    def update(self, items: Any):
+        if hasattr(items, "items"): items = items.items()
+        if hasattr(items, "__len__"): self.reserve(self.size + len(items))
+        elif self._old_table != None: self._finish_resize()
+
+        table, capacity = self.table, self.capacity
+        for k, v in items:
+            if k is None: raise ValueError("Null key")
+            key_hash = hash(k)
+            bucket_index = key_hash % capacity
+            bucket = table[bucket_index]
+            if bucket == None:
+                table[bucket_index] = [Entry(k, v, key_hash)]
+            else:
+                entry = self._bucket_find(bucket, k, key_hash)
+                if entry != None:
+                    entry.value = v
+                    continue
+                bucket.append(Entry(k, v, key_hash))
+                if len(bucket) > HashtableSeparateChaining.TREEIFY_THRESHOLD and bucket.__class__ is list:
+                    table[bucket_index] = _TreeBucket(bucket)
+
+            self.size += 1
+            if self.size > self.threshold:
+                self._rehash(self.capacity * 2)
+                table, capacity = self.table, self.capacity
 
 
     # Returns whether hashtable contains specific key
@@ -69,8 +300,10 @@ class HashtableSeparateChaining:
     
     # Returns whether hashtable contains specific key
     def has_key(self, k: Any) -> bool:
-        bucket_index = self._normalize_index(hash(k))
-        return self._bucket_seek_entry(bucket_index, k) != None
+        key_hash = hash(k)
+        if self._old_table != None: self._migrate(key_hash)
+        bucket_index = self._normalize_index(key_hash)
+        return self._bucket_seek_entry(bucket_index, k, key_hash) != None
 
 
     # insert, put, and add all place a key value pair in hashtable
@@ -83,21 +316,38 @@ class HashtableSeparateChaining:
 
 
     def insert(self, k: Any, v: Any) -> Any:
-        if k == None: raise ValueError("Null key")
+        if k is None: raise ValueError("Null key")
+
+        key_hash = hash(k)
+        if self._old_table != None: self._migrate(key_hash)
+        bucket_index = self._normalize_index(key_hash)
+        return self._bucket_insert_entry(bucket_index, k, v, key_hash)
+
+
+    # Returns the value of k, inserting v first if k is absent.
+    # Needs a single lookup instead of a get followed by an insert
+    def get_or_insert(self, k: Any, v: Any) -> Any:
+        if k is None: raise ValueError("Null key")
 
-        new_entry = Entry(k, v)
-        bucket_index = self._normalize_index(new_entry.hash)
-        return self._bucket_insert_entry(bucket_index, new_entry)
+        key_hash = hash(k)
+        if self._old_table != None: self._migrate(key_hash)
+        bucket_index = self._normalize_index(key_hash)
+        entry = self._bucket_seek_entry(bucket_index, k, key_hash)
+        if entry != None: return entry.value
+        self._bucket_insert_entry(bucket_index, k, v, key_hash)
+        return v
 
 
     # Gets a key's value from the map and returns the value.
     # NOTE: returns None if the value is None AND also returns
     # None if the key does not exists.
     def get(self, k: Any) -> Any:
-        if k == None: return None
+        if k is None: return None
 
-        bucket_index = self._normalize_index(hash(k))
-        entry = self._bucket_seek_entry(bucket_index, k)
+        key_hash = hash(k)
+        if self._old_table != None: self._migrate(key_hash)
+        bucket_index = self._normalize_index(key_hash)
+        entry = self._bucket_seek_entry(bucket_index, k, key_hash)
         if not entry is None: return entry.value
 
 
@@ -105,355 +355,297 @@ class HashtableSeparateChaining:
     # NOTE: returns None if the value is None AND also
     # returns None if the key does not exist.
     def remove(self, k: Any) -> Any:
-        if k == None: raise ValueError("Null key")
-
-        bucket_index = self._normalize_index(k)
-        return self._bucket_remove_entry(bucket_index, k)
+        if k is None: raise ValueError("Null key")
+
+        key_hash = hash(k)
+        if self._old_table != None: self._migrate(key_hash)
+        bucket_index = self._normalize_index(key_hash)
+        return self._bucket_remove_entry(bucket_index, k, key_hash)
+
+
+    # Batched lookup, returns the values of keys in order (None for missing keys).
+    # Amortizes the per call overhead of get over the whole batch
+    # TC: O(len(keys))
+    def get_many(self, keys: Iterable) -> List[Any]:
+        if self._old_table != None: return [self.get(k) for k in keys]
+
+        table, capacity, find = self.table, self.capacity, self._bucket_find
+        res = []
+        for k in keys:
+            entry = None
+            if k is not None:
+                key_hash = hash(k)
+                bucket = table[key_hash % capacity]
+                if bucket != None: entry = find(bucket, k, key_hash)
+            res.append(None if entry is None else entry.value)
+        return res
+
+
+    # Batched membership test, returns one bool per key in order
+    # TC: O(len(keys))
+    def contains_many(self, keys: Iterable) -> List[bool]:
+        if self._old_table != None: return [self.has_key(k) for k in keys]
+
+        table, capacity, find = self.table, self.capacity, self._bucket_find
+        res = []
+        for k in keys:
+            if k is None: raise ValueError("Null key")
+            key_hash = hash(k)
+            bucket = table[key_hash % capacity]
+            res.append(bucket != None and find(bucket, k, key_hash) != None)
+        return res
+
+
+    # Batched insert of a mapping or an iterable of (key, value) pairs.
+    # Returns the old value (or None) for every pair, like insert does
+    # TC: O(len(pairs))
+    def put_many(self, pairs: Any) -> List[Any]:
+        if hasattr(pairs, "items"): pairs = pairs.items()
+
+        res = []
+        for k, v in pairs:
+            # The table may start or finish resizing in the middle of a batch
+            if self._old_table != None:
+                res.append(self.insert(k, v))
+                continue
+            if k is None: raise ValueError("Null key")
+
+            key_hash = hash(k)
+            bucket_index = key_hash % self.capacity
+            res.append(self._bucket_insert_entry(bucket_index, k, v, key_hash))
+        return res
 
     
     # Removes an entry from a given bucket if it exists
     # and returns its value
-    def _bucket_remove_entry(self, bucketIndex: int, k: Any) -> Any:
-        if k == None: raise ValueError("Null key")
+    def _bucket_remove_entry(self, bucketIndex: int, k: Any, key_hash: int) -> Any:
+        if k is None: raise ValueError("Null key")
+
+        bucket = self.table[bucketIndex]
+        if bucket == None: return None
+
+        if bucket.__class__ is _TreeBucket:
+            entry = bucket.remove(k, key_hash)
+            if entry == None: return None
+            if len(bucket) < HashtableSeparateChaining.UNTREEIFY_THRESHOLD:
+                self.table[bucketIndex] = list(bucket)
+        else:
+            for i, entry in enumerate(bucket):
+                if entry.hash == key_hash and (entry.key is k or entry.key == k):
+                    break
+            else:
+                return None
 
-        l = self.table[bucketIndex]
-        if l == None: return None
-        entry = Entry(k, 0)
-        data = l.remove(entry)
-        if data != None: return data.value
-        else: return None
+            # Order within a list bucket does not matter, so the last
+            # entry fills the gap and the removal stays O(1)
+            last = bucket.pop()
+            if i < len(bucket): bucket[i] = last
+            if not bucket: self.table[bucketIndex] = None
+
+        self.size -= 1
+        if self.size < self.min_threshold:
+            self._shrink_table()
+        return entry.value
 
 
     # Inserts an entry in a given bucket only if the entery does not already
     # exist in the given bucket, otherwise updates the entry value
-    # Returns old value if entry existed, else None
-    def _bucket_insert_entry(self, bucket_index: int, entry: Entry) -> Any:
+    # Returns old value if entry existed, else None.
+    # A new Entry is only allocated when the key is not present yet
+    def _bucket_insert_entry(self, bucket_index: int, k: Any, v: Any, key_hash: int) -> Any:
         bucket = self.table[bucket_index]
         if bucket == None:
-            bucket = self.table[bucket_index] = SinglyLinkedList()
-        
-        existent_entry = bucket.find(entry.key)
-        if existent_entry == None:
-            bucket.add(entry)
-            self.size += 1
-            if self.size > self.threshold:
-                self._resize_table()
-            return None # Indicates that the entry was non-existent
+            self.table[bucket_index] = [Entry(k, v, key_hash)]
         else:
-            old_val = existent_entry.value
-            existent_entry.value = entry.value
-            return old_val
+            existent_entry = self._bucket_find(bucket, k, key_hash)
+            if existent_entry != None:
+                old_val = existent_entry.value
+                existent_entry.value = v
+                return old_val
+            bucket.append(Entry(k, v, key_hash))
+            if len(bucket) > HashtableSeparateChaining.TREEIFY_THRESHOLD and bucket.__class__ is list:
+                self.table[bucket_index] = _TreeBucket(bucket)
+
+        self.size += 1
+        if self.size > self.threshold:
+            self._resize_table()
+        return None # Indicates that the entry was non-existent
         
 
     # Finds and returns a particular entry in a given bucket if it exists,
     # returns None otherwise    
-    def _bucket_seek_entry(self, bucketIndex: int, k: Any) -> Entry:
-        if k == None: raise ValueError("Null key")
-
-        l = self.table[bucketIndex]
-        if l == None: return None
-        entry = l.find(k)
-        if entry != None:
-            return entry
+    def _bucket_seek_entry(self, bucketIndex: int, k: Any, key_hash: int) -> Entry:
+        if k is None: raise ValueError("Null key")
+
+        bucket = self.table[bucketIndex]
+        if bucket == None: return None
+        return self._bucket_find(bucket, k, key_hash)
+
+
+    # Finds and returns the entry with key k in a bucket list, else None.
+    # The cached hashes are compared first, so a possibly expensive __eq__
+    # only runs on entries that really are candidates
+    # TC: O(bucket size), O(log(bucket size)) for tree buckets
+    @staticmethod
+    def _bucket_find(bucket: List[Entry], k: Any, key_hash: int) -> Optional[Entry]:
+        if bucket.__class__ is _TreeBucket: return bucket.find(k, key_hash)
+        for entry in bucket:
+            if entry.hash == key_hash and (entry.key is k or entry.key == k):
+                return entry
         return None
 
 
     
-    # Resizes the internal table holding buckets of entries
-    def _resize_table(self):
-        self.capacity *= 2
-        self.threshold = int(self.capacity * self.max_load_factor)
-
-        newTable = [None] * self.capacity
-
-        for i in range(len(self.table)):
-            if self.table[i] == None: continue
-            for entry in self.table[i].entries():
-                bucket_index = self._normalize_index(entry.hash)
-                bucket = newTable[bucket_index] if newTable[bucket_index] != None else SinglyLinkedList()
-                newTable[bucket_index] = bucket
-                bucket.add(entry)
-            
-            self.table[i].clear()
-            self.table[i] = None
-        
-        self.table = newTable
+    # Resizes the internal table holding buckets of entries.
+    # Without incremental resizing every entry is rehashed right away,
+    # otherwise the old table is kept and drained by _migrate
+    # new_capacity defaults to doubling the table
+    def _resize_table(self, new_capacity: Optional[int]=None):
+        new_capacity = new_capacity or self.capacity * 2
+        if not self.incremental_resize:
+            self._rehash(new_capacity)
+            return
+
+        # A resize may only start once the previous one has been drained
+        if self._old_table != None: self._finish_resize()
+
+        self._old_table = self.table
+        self._set_capacity(new_capacity)
+        self.table = [None] * self.capacity
+        self.migrated_buckets = 0
+        self.buckets_to_migrate = len(self._old_table)
 
-    # Returns an Iterator over the keys found in the hashtable
-    def keys(self) -> Iterator:
+
+    # Halves the table, without going below the default capacity
+    def _shrink_table(self):
+        new_capacity = max(self.capacity // 2, HashtableSeparateChaining.DEFAULT_CAPACITY)
+        if new_capacity < self.capacity:
+            self._resize_table(new_capacity)
+
+
+    # Rebuilds the table with the smallest capacity that fits the current
+    # entries, releasing the buckets left behind by earlier bursts
+    # TC: O(n)
+    def compact(self):
+        new_capacity = max(self._capacity_for(self.size), HashtableSeparateChaining.DEFAULT_CAPACITY)
+        if self._old_table != None or new_capacity != self.capacity:
+            self._rehash(new_capacity)
+
+
+    # Rehashes every entry into a new table of the given capacity at once
+    # TC: O(n)
+    def _rehash(self, new_capacity: int):
+        if self._old_table != None: self._finish_resize()
+
+        old_table = self.table
+        self._set_capacity(new_capacity)
+        self.table = [None] * self.capacity
+        for bucket in old_table:
+            if bucket != None: self._move_bucket(bucket)
+
+
+    # Moves all entries of an old bucket into the current table
+    def _move_bucket(self, bucket: List[Entry]):
+        table, capacity = self.table, self.capacity
+        for entry in bucket:
+            bucket_index = entry.hash % capacity
+            new_bucket = table[bucket_index]
+            if new_bucket == None:
+                table[bucket_index] = [entry]
+            else:
+                new_bucket.append(entry)
+                if len(new_bucket) > HashtableSeparateChaining.TREEIFY_THRESHOLD and new_bucket.__class__ is list:
+                    table[bucket_index] = _TreeBucket(new_bucket)
+
+
+    # Performs one bounded step of an incremental resize on behalf of an
+    # operation on key_hash. The old bucket of that key is migrated first,
+    # so the operation only has to look at the new table afterwards. Then up
+    # to rehash_step non-empty buckets (or a bounded amount of empty ones)
+    # are migrated from the cursor onwards.
+    # TC: O(rehash_step) amortized
+    def _migrate(self, key_hash: int):
+        old_table = self._old_table
+        old_index = key_hash % len(old_table)
+        if old_table[old_index] != None:
+            self._move_bucket(old_table[old_index])
+            old_table[old_index] = None
+
+        cursor = self.migrated_buckets
+        work = self.rehash_step
+        empty_visits = work * HashtableSeparateChaining.EMPTY_VISITS_PER_STEP
+        while cursor < len(old_table) and work > 0:
+            bucket = old_table[cursor]
+            cursor += 1
+            if bucket == None:
+                empty_visits -= 1
+                if empty_visits == 0: break
+                continue
+            self._move_bucket(bucket)
+            old_table[cursor - 1] = None
+            work -= 1
+
+        self.migrated_buckets = cursor
+        if cursor == len(old_table):
+            self._old_table = None
+
+
+    # Migrates everything that is left of an incremental resize
+    def _finish_resize(self):
+        for bucket in self._old_table:
+            if bucket != None: self._move_bucket(bucket)
+        self.migrated_buckets = self.buckets_to_migrate
+        self._old_table = None
+
+
+    # Returns the number of entries in the fullest bucket,
+    # a cheap signal for adversarial or low entropy keys
+    # TC: O(capacity)
+    def max_chain_length(self) -> int:
+        tables = [self.table] if self._old_table == None else [self._old_table, self.table]
+        return max((len(bucket) for table in tables for bucket in table if bucket != None), default=0)
+
+
+    # Returns the number of buckets that are currently treeified
+    # TC: O(capacity)
+    def tree_bucket_count(self) -> int:
+        tables = [self.table] if self._old_table == None else [self._old_table, self.table]
+        return sum(1 for table in tables for bucket in table if bucket.__class__ is _TreeBucket)
+
+
+    # Returns an Iterator over all entries. A pending incremental resize
+    # is finished first, otherwise lookups in the loop body would migrate
+    # already yielded buckets into the new table and yield them again.
+    # Iterating is O(n) anyway, so this adds nothing asymptotically
+    def _entries(self) -> Iterator:
+        if self._old_table != None: self._finish_resize()
         for el in self.table:
             if el == None: continue
-            for entry in el.entries():
-                yield entry.key
+            yield from el
+
+    # Returns an Iterator over the keys found in the hashtable
+    def keys(self) -> Iterator:
+        for entry in self._entries():
+            yield entry.key
 
 
     # Returns an Iterator over the values found in the hashtable
     def values(self) -> Iterator:
-        for el in self.table:
-            if el == None: continue
-            for entry in el.entries():
-                yield entry.value
+        for entry in self._entries():
+            yield entry.value
 
     
     # Returns an Iterator over the key/value pairs in the hashtable
     # Key and values are packages ad (key, value) tuples
     def items(self) -> Iterator:
-        for el in self.table:
-            if el == None: continue
-            for entry in el.entries():
-                yield (entry.key, entry.value)
+        for entry in self._entries():
+            yield (entry.key, entry.value)
 
 
     # Returns a string representation of the hashtable
     def __str__(self) -> str:
         res = ["{"]
-        for el in self.table:
-            if el == None: continue
-            for entry in el.entries():
-                res.extend(["\n", "\t", str(entry)])
+        for entry in self._entries():
+            res.extend(["\n", "\t", str(entry)])
         res.extend(["\n", "}"])
         return "".join(res)
-
-
-
-
-
-# A singly linked list implementation
-# for use in a hashtable with separate chaining
-#
-# Author: Alireza Ghey
-
-# private Node class for internal use
-class _Node:
-    def __init__(self, data: Any, nextNode: _Node=None):
-        self._data: Any = data
-        self._next: _Node = nextNode
-    
-    def __str__(self):
-        return str(self._data)
-
-class SinglyLinkedList:
-    
-
-    def __init__(self):
-        self._size: int = 0
-        self._head: _Node = None
-        self._tail: _Node = None
-
-    def __len__(self):
-        return self._size
-
-    
-    # Deletes all nodes in the linked list
-    # TC: O(n)
-    def clear(self) -> None:
-        curr = self._head
-        while curr != None:
-            nextNode = curr._next
-            curr._next = None
-            curr._data = None
-            curr = nextNode
-        
-        self._head = self._tail = None
-        self._size = 0
-
-    # Whether linked list is empty or not
-    def isEmpty(self) -> bool:
-        return len(self) == 0
-    
-
-    # Add a node to the head of the linked list
-    # Wrapper for addFirst
-    # TC: O(1)
-    def add(self, entry) -> None:
-        self.addFirst(entry)
-    
-    # Add a node to the head of the linked list
-    # TC: O(1)
-    def addFirst(self, data: Any) -> None:
-        if self.isEmpty():
-            self._head = self._tail = _Node(data)
-        else:
-            newHead = _Node(data)
-            newHead._next = self._head
-            self._head = newHead
-        self._size += 1
-
-    # Adds a node to the tail of the linked list
-    # TC: O(1)
-    def addLast(self, data: Any) -> None:
-        if self.isEmpty():
-            self._head = self._tail = _Node(data)
-        else:
-            self._tail.next = _Node(data)
-            self._tail = self._tail._next
-        self._size += 1
-
-    # Add a node at the specified index
-    # TC: O(n)
-    def addAt(self, index: int, data: Any) -> None:
-        if index < 0 or index > len(self):
-            raise ValueError("Specified index is out of range")
-        
-        if index == 0:
-            self.addFirst(data)
-        elif index == len(self):
-            self.addLast(data)
-        else:
-            curr = self._head
-            for _ in range(index-1):
-                curr = curr._next
-            newNode = _Node(data)
-            newNode._next = curr._next
-            curr._next = newNode
-            self._size += 1
-    
-    # Return value of head if exists
-    # TC: O(1)
-    def peekFirst(self) -> Any:
-        if len(self) == 0:
-            raise RuntimeError("Linked list is empty")
-        return self._head._data
-
-    # Return value of tail if exists
-    # TC: O(1)
-    def peekLast(self) -> Any:
-        if len(self) == 0:
-            raise RuntimeError("Linked list is empty")
-        return self._tail._data
-
-    # Remove head node and return its data
-    # TC: O(1)
-    def removeFirst(self) -> Any:
-        if self.isEmpty():
-            raise RuntimeError("Linked list is empty")
-        
-        data = self._head._data
-        newHead = self._head._next
-        self._head._next = None
-        self._head = newHead
-        
-        self._size -= 1
-
-        if self.isEmpty():
-            self._tail = None
-        
-        return data
-
-    # Remove tail node and return its data
-    # TC: O(n)
-    def removeLast(self) -> Any:
-        if self.isEmpty():
-            raise RuntimeError("Linked list is empty")
-        
-        data = self._tail._data
-        if len(self) == 1:
-            self._head = self._tail = None            
-        else:
-            curr = self._head
-            while curr._next and curr._next._next:
-                curr = curr.next
-            curr.next = None
-            self._tail = curr
-        
-        self._size -= 1
-        return data
-            
-    # Removes a node as specified index
-    # TC: O(n)
-    def removeAt(self, index: int) -> Any:
-        if index < 0 or index >= len(self):
-            raise ValueError("Index out of bounds")
-
-        if index == 0:
-            return self.removeFirst()
-        if index == len(self)-1:
-            return self.removeLast()
-        
-        curr = self._head
-        for _ in range(index-1):
-            curr = curr._next
-        
-        data = curr._next._data
-        curr._next = curr._next._next
-        self._size -= 1
-        return data
-        
-    # Removes the first occurence the node with the specified data
-    # Returns the removed node's data or None if not found
-    # TC: O(n)
-    def remove(self, data: Any) -> Any:
-        if len(self) == 0:
-            raise RuntimeError("Linked list is empty")
-
-        if self._head._data == data:
-            return self.removeFirst()
-
-        curr = self._head
-        while curr._next:
-            if curr._next._data == data:
-                if curr._next == self._tail:
-                    return self.removeLast()
-                removingNode = curr._next
-                curr._next = removingNode._next
-                removingNode._next = None
-                self._size -= 1
-                return removingNode._data
-        return None
-
-    # Returns index of the first occurence of a node with data
-    # TC: O(n)
-    def indexOf(self, data: Any) -> int:
-        curr = self._head
-        index = 0
-        while curr != None:
-            if curr._data == data:
-                return index
-            index += 1
-        return -1
-
-    # finds and returns an entry if keys are equal, else None
-    # TC: O(n)
-    def find(self, k: Any):
-        curr = self._head
-
-        while curr:
-            if curr._data.key == k:
-                return curr._data
-            curr = curr._next
-        return None
-
-    def entries(self) -> Iterator:
-        curr = self._head
-        while curr:
-            yield curr._data
-            curr = curr._next
-
-    def contains(self, data: Any) -> bool:
-        return self.indexOf(data) != -1
-
-    # TODO: Implement iterator
-    
-
-    
-
-
-
-
-
-
-
-
-
-
-
-    
-
-
-
-
-
-
-
-
-    
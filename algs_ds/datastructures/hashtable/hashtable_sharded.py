@@ -0,0 +1,130 @@
+# A thread-safe Hashtable implementation using lock striping
+#
+# Keys are spread over independent HashtableSeparateChaining shards,
+# each guarded by its own lock. Threads touching different shards never
+# wait for each other, and every shard resizes on its own, so a resize
+# only stalls the writers of that one shard.
+#
+# Author: Alireza Ghey
+
+from __future__ import annotations
+from typing import Any, Optional, Iterator
+import threading
+
+from algs_ds.datastructures.hashtable.hashtable_separatechaining import HashtableSeparateChaining
+
+
+class ShardedHashtable:
+    DEFAULT_SHARDS = 16
+    # Multiplier for Fibonacci hashing, 2^64 divided by the golden ratio
+    _MIX = 0x9E3779B97F4A7C15
+    _MASK = (1 << 64) - 1
+
+    # capacity is the total initial capacity, spread evenly over the shards.
+    # max_load_factor and incremental_resize are passed on to every shard
+    def __init__(self, num_shards: Optional[int]=None, capacity: Optional[int]=None,
+                 max_load_factor: Optional[float]=None, incremental_resize: bool=False):
+        if num_shards != None and num_shards <= 0: raise ValueError("Illegal number of shards")
+        if capacity and capacity < 0: raise ValueError("Illegal capacity")
+
+        self.num_shards = num_shards or ShardedHashtable.DEFAULT_SHARDS
+        shard_capacity = -(-capacity // self.num_shards) if capacity else None
+        self._shards = [HashtableSeparateChaining(shard_capacity, max_load_factor, incremental_resize)
+                        for _ in range(self.num_shards)]
+        self._locks = [threading.Lock() for _ in range(self.num_shards)]
+
+    # Picks the shard of a key. The hash is scrambled first: the shards pick
+    # their buckets from hash % capacity, and deriving the shard from the
+    # same low bits would leave most buckets of every shard unused
+    def _shard_index(self, k: Any) -> int:
+        mixed = (hash(k) * ShardedHashtable._MIX) & ShardedHashtable._MASK
+        return (mixed >> 32) % self.num_shards
+
+    # Returns a consistent count of all entries.
+    # All shard locks are taken (always in the same order) for the summation
+    # TC: O(number of shards)
+    def __len__(self) -> int:
+        for lock in self._locks: lock.acquire()
+        try:
+            return sum(len(shard) for shard in self._shards)
+        finally:
+            for lock in self._locks: lock.release()
+
+    # Returns whether hashtable is empty
+    def isEmpty(self) -> bool:
+        return len(self) == 0
+
+    # Clears all the contents of the hashtable
+    def clear(self):
+        for i, shard in enumerate(self._shards):
+            with self._locks[i]:
+                shard.clear()
+
+    # Returns whether hashtable contains specific key
+    def contains_key(self, k: Any) -> bool:
+        return self.has_key(k)
+
+    # Returns whether hashtable contains specific key
+    def has_key(self, k: Any) -> bool:
+        i = self._shard_index(k)
+        with self._locks[i]:
+            return self._shards[i].has_key(k)
+
+    # insert, put, and add all place a key value pair in hashtable
+    def put(self, k: Any, v: Any) -> Any:
+        return self.insert(k, v)
+
+    def add(self, k: Any, v: Any) -> Any:
+        return self.insert(k, v)
+
+    # Returns old value if key existed, else None
+    def insert(self, k: Any, v: Any) -> Any:
+        if k is None: raise ValueError("Null key")
+        i = self._shard_index(k)
+        with self._locks[i]:
+            return self._shards[i].insert(k, v)
+
+    # Gets a key's value from the map and returns the value.
+    # NOTE: returns None if the value is None AND also returns
+    # None if the key does not exists.
+    def get(self, k: Any) -> Any:
+        if k is None: return None
+        i = self._shard_index(k)
+        with self._locks[i]:
+            return self._shards[i].get(k)
+
+    # Atomically returns the value of k, inserting v first if k is absent
+    def get_or_insert(self, k: Any, v: Any) -> Any:
+        if k is None: raise ValueError("Null key")
+        i = self._shard_index(k)
+        with self._locks[i]:
+            return self._shards[i].get_or_insert(k, v)
+
+    # Removes a key from the map and returns the value
+    # NOTE: returns None if the value is None AND also
+    # returns None if the key does not exist.
+    def remove(self, k: Any) -> Any:
+        if k is None: raise ValueError("Null key")
+        i = self._shard_index(k)
+        with self._locks[i]:
+            return self._shards[i].remove(k)
+
+    # Returns an Iterator over the key/value pairs in the hashtable.
+    # Each shard is copied under its lock and yielded after releasing it,
+    # so writers are only held up for one shard copy at a time. The result is
+    # consistent per shard, not across shards
+    def items(self) -> Iterator:
+        for i, shard in enumerate(self._shards):
+            with self._locks[i]:
+                snapshot = list(shard.items())
+            yield from snapshot
+
+    # Returns an Iterator over the keys found in the hashtable
+    def keys(self) -> Iterator:
+        for k, _ in self.items():
+            yield k
+
+    # Returns an Iterator over the values found in the hashtable
+    def values(self) -> Iterator:
+        for _, v in self.items():
+            yield v
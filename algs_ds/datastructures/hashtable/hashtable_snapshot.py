@@ -0,0 +1,189 @@
+# A binary snapshot format for hashtables, served straight from mmap
+#
+# Layout (all integers little endian):
+#   header        magic "AHTS", version u16, reserved u16, count u64, buckets u64
+#   bucket index  (buckets + 1) u64 file offsets, bucket i spans [index[i], index[i+1])
+#   records       crc u32, key tag u8, key length u32, value tag u8, value length u32,
+#                 key bytes, value bytes
+#
+# Keys and values may be None (values only), bool, int, float, str or bytes.
+# Python's own hash of str and bytes changes between processes, so records are
+# placed by the CRC32 of a canonical key encoding under which equal keys
+# (1, 1.0 and True for instance) encode identically.
+#
+# Author: Alireza Ghey
+
+from __future__ import annotations
+from typing import Any, Iterator, Tuple
+import mmap
+import os
+import struct
+import zlib
+
+_MAGIC = b"AHTS"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHQQ")
+_OFFSET = struct.Struct("<Q")
+_OFFSET_PAIR = struct.Struct("<QQ")
+_RECORD = struct.Struct("<IBIBI")
+
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _BYTES = range(7)
+_DOUBLE = struct.Struct("<d")
+
+
+# Encodes a supported object as a (tag, payload) pair
+def _encode(obj: Any) -> Tuple[int, bytes]:
+    if obj is None: return _NONE, b""
+    if obj is True: return _TRUE, b""
+    if obj is False: return _FALSE, b""
+    if isinstance(obj, int): return _INT, obj.to_bytes((obj.bit_length() + 8) // 8, "little", signed=True)
+    if isinstance(obj, float): return _FLOAT, _DOUBLE.pack(obj)
+    if isinstance(obj, str): return _STR, obj.encode("utf-8")
+    if isinstance(obj, (bytes, bytearray)): return _BYTES, bytes(obj)
+    raise TypeError(f"Unsupported type for snapshot {type(obj)}")
+
+
+def _decode(tag: int, payload: bytes) -> Any:
+    if tag == _INT: return int.from_bytes(payload, "little", signed=True)
+    if tag == _STR: return str(payload, "utf-8")
+    if tag == _BYTES: return bytes(payload)
+    if tag == _FLOAT: return _DOUBLE.unpack(payload)[0]
+    if tag == _NONE: return None
+    return tag == _TRUE
+
+
+# Returns the stable hash of a key, equal keys of different types hash equally
+def _stable_hash(k: Any) -> int:
+    if isinstance(k, float) and k.is_integer(): k = int(k)
+    if k is None: raise TypeError("Null key")
+    tag, payload = _encode(k)
+    if tag in (_FALSE, _TRUE):
+        tag, payload = _encode(int(k))
+    return zlib.crc32(payload, tag)
+
+
+# Writes the entries of a hashtable (anything with items() and len()) to path
+# TC: O(n)
+def save(table: Any, path: str) -> None:
+    count = len(table)
+    num_buckets = max(count, 1)
+    buckets = [[] for _ in range(num_buckets)]
+    for k, v in table.items():
+        crc = _stable_hash(k)
+        key_tag, key_bytes = _encode(k)
+        val_tag, val_bytes = _encode(v)
+        buckets[crc % num_buckets].append(
+            _RECORD.pack(crc, key_tag, len(key_bytes), val_tag, len(val_bytes)) + key_bytes + val_bytes)
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, 0, count, num_buckets))
+        offset = _HEADER.size + _OFFSET.size * (num_buckets + 1)
+        index = [offset]
+        for bucket in buckets:
+            offset += sum(len(record) for record in bucket)
+            index.append(offset)
+        f.write(struct.pack(f"<{num_buckets + 1}Q", *index))
+        for bucket in buckets:
+            f.writelines(bucket)
+
+
+# A read-only hashtable over a memory mapped snapshot file.
+# Opening it only maps the file: keys and values are decoded when touched
+class MappedHashtable:
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            # Empty files cannot be mapped
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                raise ValueError("Not a hashtable snapshot")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        mm = self._mm
+        magic, version, _, self.size, self._num_buckets = _HEADER.unpack_from(mm, 0)
+        self._records_start = _HEADER.size + _OFFSET.size * (self._num_buckets + 1)
+        # The index must fit, start at the records and end with the file
+        if (magic != _MAGIC or version != _VERSION or self._num_buckets == 0
+                or len(mm) < self._records_start
+                or _OFFSET.unpack_from(mm, _HEADER.size)[0] != self._records_start
+                or _OFFSET.unpack_from(mm, self._records_start - _OFFSET.size)[0] != len(mm)):
+            mm.close()
+            raise ValueError("Not a hashtable snapshot")
+
+    def __len__(self) -> int:
+        return self.size
+
+    def isEmpty(self) -> bool:
+        return len(self) == 0
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> MappedHashtable:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def contains_key(self, k: Any) -> bool:
+        return self.has_key(k)
+
+    def has_key(self, k: Any) -> bool:
+        if k is None: raise ValueError("Null key")
+        return self._seek(k) >= 0
+
+    # Gets a key's value from the snapshot.
+    # NOTE: returns None if the value is None AND also returns
+    # None if the key does not exists.
+    def get(self, k: Any) -> Any:
+        offset = self._seek(k)
+        if offset < 0: return None
+
+        mm = self._mm
+        _, _, key_len, val_tag, val_len = _RECORD.unpack_from(mm, offset)
+        start = offset + _RECORD.size + key_len
+        return _decode(val_tag, mm[start:start + val_len])
+
+    # Returns the offset of the record of key k, else -1.
+    # Only records whose stored CRC matches are decoded and compared.
+    # Unhashable keys raise TypeError like they do in a live hashtable,
+    # hashable ones of an unsupported type cannot be in the snapshot
+    # TC: O(1) expected
+    def _seek(self, k: Any) -> int:
+        try:
+            crc = _stable_hash(k)
+        except TypeError:
+            hash(k)
+            return -1
+
+        mm = self._mm
+        offset, end = _OFFSET_PAIR.unpack_from(mm, _HEADER.size + _OFFSET.size * (crc % self._num_buckets))
+        if not self._records_start <= offset <= end <= len(mm):
+            raise ValueError("Corrupt hashtable snapshot")
+        while offset < end:
+            if offset + _RECORD.size > end:
+                raise ValueError("Corrupt hashtable snapshot")
+            record_crc, key_tag, key_len, _, val_len = _RECORD.unpack_from(mm, offset)
+            if record_crc == crc:
+                start = offset + _RECORD.size
+                if _decode(key_tag, mm[start:start + key_len]) == k:
+                    return offset
+            offset += _RECORD.size + key_len + val_len
+        return -1
+
+    # Returns an Iterator over the key/value pairs, in file order
+    def items(self) -> Iterator:
+        mm = self._mm
+        offset, end = self._records_start, len(mm)
+        while offset < end:
+            _, key_tag, key_len, val_tag, val_len = _RECORD.unpack_from(mm, offset)
+            start = offset + _RECORD.size
+            yield (_decode(key_tag, mm[start:start + key_len]),
+                   _decode(val_tag, mm[start + key_len:start + key_len + val_len]))
+            offset = start + key_len + val_len
+
+    def keys(self) -> Iterator:
+        for k, _ in self.items():
+            yield k
+
+    def values(self) -> Iterator:
+        for _, v in self.items():
+            yield v
@@ -1,19 +1,51 @@
 # A binary heap implementation
 #
+# A plain heap (no key, no reverse) compares its elements directly. Once a
+# key, reverse or an explicit priority from push is in play, elements are
+# ordered by a priority kept in a parallel array instead: key(element) or
+# whatever was passed to push, paired with an insertion counter so that
+# equal priorities come out first in, first out. reverse turns the min heap
+# into a max heap without wrapper objects.
+# The arity (children per node) defaults to 2. Wider d-ary heaps are
+# shallower, making add cheaper while poll compares more children per level.
 #
 # Author: Alireza Ghey
 
-from typing import List, Any
+from __future__ import annotations
+from typing import List, Any, Callable, Optional, Iterable
+import math
+import operator
 
 class BinaryHeap:
     # construct a priority queue using heapify in O(n) time, if there are any elements
     # Explanation: http://www.cs.umd.edu/~meesh/351/mount/lectures/lect14-heapsort-analysis-part.pdf
-    def __init__(self, elems: List[Any]=None) -> None:
+    def __init__(self, elems: List[Any]=None, key: Optional[Callable[[Any], Any]]=None, reverse: bool=False,
+                 arity: int=2) -> None:
+        if arity < 2: raise ValueError("Arity must be at least 2")
+        # Children of node k are arity * k + 1 to arity * k + arity
+        self._arity = arity
+        self._key = key
+        self._reverse = reverse
+        # Whether the node at i should be above the node at j is less(prio[i], prio[j])
+        self._less = operator.gt if reverse else operator.lt
+        # Insertion counter breaking ties between equal priorities
+        self._seq = 0
+        # Whether priorities are (priority, counter) tuples in a separate
+        # array. Plain heaps share one list, so _prio is _heap
+        self._tagged = key != None or reverse
+
         self._heap = elems if elems else []
         self._heapSize = self._heapCapacity =  len(elems) if elems else 0
+        if self._tagged:
+            self._prio = [self._entry(key(elem) if key else elem) for elem in self._heap]
+        else:
+            self._prio = self._heap
+        self._heapify()
 
-        # Heapify if there are any elements, O(n)
-        for i in range(max(0, (self._heapSize // 2) -1), -1, -1):
+    # Heapify if there are any elements, O(n)
+    # starting from the parent of the last node
+    def _heapify(self) -> None:
+        for i in range(max(0, (self._heapSize - 2) // self._arity), -1, -1):
             self.sink(i)
     
     # Whether priority queue is empty
@@ -24,7 +56,9 @@ class BinaryHeap:
     # Clears everything inside the heap
     # TC: O(n)
     def clear(self) -> None:
-        pass
+        self._heap = []
+        self._prio = [] if self._tagged else self._heap
+        self._heapSize = self._heapCapacity = 0
 
     # Returns the size of the heap
     def __len__(self) -> int:
@@ -50,60 +84,225 @@ class BinaryHeap:
     # Whether element is in heap
     # TC: O(n)
     def contains(self, data: Any) -> bool:
-        return data in self._heap
+        for i in range(self._heapSize):
+            if self._heap[i] == data: return True
+        return False
     
-    # Adds element to priority queue
+    # Adds element to priority queue, its priority is key(elem) if
+    # a key function was given, else the element itself
     # element cannot be None
     # TC: O(log n)
     def add(self, elem: Any) -> None:
         if elem == None:
             raise ValueError("Element cannot be None")
+        self._insert(self._key(elem) if self._key else elem, elem)
 
+    # Adds item to priority queue with an explicit priority,
+    # bypassing the key function. priority cannot be None
+    # TC: O(log n)
+    def push(self, priority: Any, item: Any) -> None:
+        if priority == None:
+            raise ValueError("Priority cannot be None")
+        self._insert(priority, item)
+
+    # Places an item with its priority at the bottom and bubbles it up
+    # TC: O(log n)
+    def _insert(self, priority: Any, item: Any) -> None:
+        if priority is not item and not self._tagged: self._tag()
+        entry = self._entry(priority)
         if self._heapSize < self._heapCapacity:
-            self._heap[self._heapSize] = elem
+            self._heap[self._heapSize] = item
+            self._prio[self._heapSize] = entry
         else:
-            self._heap.append(elem)
+            self._heap.append(item)
+            if self._tagged: self._prio.append(entry)
             self._heapCapacity += 1
         
         self.bubbleUp(self._heapSize)
         self._heapSize += 1
+
+    # Adds every element of elems. Appends them all and heapifies again
+    # when that is cheaper than bubbling each one up
+    # TC: O(min(n + m, m log(n + m))) for m new elements
+    def push_many(self, elems: Iterable[Any]) -> None:
+        key, pairs = self._key, []
+        for elem in elems:
+            if elem == None:
+                raise ValueError("Element cannot be None")
+            pairs.append((key(elem) if key else elem, elem))
+        self._extend(pairs)
+
+    # Adds all elements of another heap with their priorities, other is not modified.
+    # Elements of other come after equal priorities already in this heap
+    # TC: O(min(n + m, m log(n + m))) for m elements in other
+    def merge(self, other: BinaryHeap) -> None:
+        # Re-add in the order they were added to other, so that the fresh
+        # counters keep its first in, first out order among equal priorities.
+        # Max heaps store negated counters
+        prio, heap = other._prio, other._heap
+        if not other._tagged:
+            self._extend([(heap[i], heap[i]) for i in range(other._heapSize)])
+            return
+        order = sorted(range(other._heapSize), key=lambda i: prio[i][1], reverse=other._reverse)
+        self._extend([(prio[i][0], heap[i]) for i in order])
+
+    # Private method adding (priority, item) pairs in bulk
+    def _extend(self, pairs: List[tuple]) -> None:
+        if not pairs: return
+        if not self._tagged and any(priority is not item for priority, item in pairs):
+            self._tag()
+        size = self._heapSize + len(pairs)
+        if len(pairs) * math.log2(size) < size:
+            for priority, item in pairs:
+                self._insert(priority, item)
+            return
+
+        # Drop the unused capacity, append everything and heapify once
+        del self._heap[self._heapSize:]
+        if self._tagged:
+            del self._prio[self._heapSize:]
+            self._prio.extend(self._entry(priority) for priority, _ in pairs)
+        self._heap.extend(item for _, item in pairs)
+        self._heapSize = self._heapCapacity = size
+        self._heapify()
+
+    # Adds elem and then removes and returns the root, which may be elem
+    # itself. Faster than add followed by poll as it sifts at most once
+    # TC: O(log n)
+    def pushpop(self, elem: Any) -> Any:
+        if elem == None:
+            raise ValueError("Element cannot be None")
+        return self._pushpop(self._key(elem) if self._key else elem, elem)
+
+    def _pushpop(self, priority: Any, item: Any) -> Any:
+        if priority is not item and not self._tagged: self._tag()
+        entry = self._entry(priority)
+        # item would be the new root, so it leaves right away
+        if self.isEmpty() or not self._less(self._prio[0], entry):
+            return item
+
+        root = self._heap[0]
+        self._heap[0], self._prio[0] = item, entry
+        self.sink(0)
+        return root
+
+    # Removes and returns the root and then adds elem, in a single sift.
+    # Unlike pushpop the returned element is never elem itself.
+    # If the heap is empty, elem is added and None returned
+    # TC: O(log n)
+    def replace(self, elem: Any) -> Any:
+        if elem == None:
+            raise ValueError("Element cannot be None")
+        if self.isEmpty():
+            self.add(elem)
+            return None
+
+        root = self._heap[0]
+        self._heap[0] = elem
+        self._prio[0] = self._entry(self._key(elem) if self._key else elem)
+        self.sink(0)
+        return root
+
+    # Pairs a priority with the insertion counter. Max heaps negate the
+    # counter, so that earlier entries still win ties.
+    # Plain heaps use the element as is
+    def _entry(self, priority: Any) -> Any:
+        if not self._tagged: return priority
+        self._seq += 1
+        return (priority, -self._seq if self._reverse else self._seq)
+
+    # Switches a plain heap to tagged priorities, the first time an item
+    # comes with a priority other than itself. Counters are handed out in
+    # array order, parents before children, which keeps the heap invariant
+    # TC: O(n)
+    def _tag(self) -> None:
+        self._tagged = True
+        size = self._heapSize
+        self._prio = [self._entry(self._heap[i]) for i in range(size)]
+        self._prio.extend([None] * (self._heapCapacity - size))
         
     # perform a bottom up node bubble
     # TC: O(log n)
     def bubbleUp(self, k: int):
-        
+        if not self._tagged: return self._bubbleUpPlain(k)
+
+        heap, prio, less, arity = self._heap, self._prio, self._less, self._arity
+
         # Grap the index of the closest parent WRT k
-        parent = (k - 1) // 2
+        parent = (k - 1) // arity
 
         # keep bubbling up while we haven't reached the root
         # and our node's val is less than its parent
-        while k > 0 and self._heap[k] < self._heap[parent]:
+        while k > 0 and less(prio[k], prio[parent]):
             # swapt parent and child
-            self._heap[k], self._heap[parent] = self._heap[parent], self._heap[k]
+            heap[k], heap[parent] = heap[parent], heap[k]
+            prio[k], prio[parent] = prio[parent], prio[k]
             k = parent
 
             # grab the next parent index WRT k
-            parent = (k-1) // 2
+            parent = (k-1) // arity
 
     # Top down node sink
     # TC: O(log n)
     def sink(self, k: int):
+        if not self._tagged: return self._sinkPlain(k)
+
+        heap, prio, less, arity, size = self._heap, self._prio, self._less, self._arity, self._heapSize
         while True:
-            left = 2 * k + 1 # left child
-            right = 2 * k + 2 # right child
-            smallest = left # Assume left is the smallest node of the two children
-
-            # find which is smaller, left or right
-            # if right is smaller, set smallest to be right child
-            if right < self._heapSize and self._heap[right] < self._heap[left]:
-                smallest = right
-        
+            first = arity * k + 1 # first child
+
             # Stop if we're outside of the bounds of the tree
-            # or k is already smaller than smallest
-            if left >= self._heapSize or self._heap[k] <= self._heap[smallest]:
+            if first >= size: break
+
+            # find the smallest of the children, binary heaps
+            # skip the loop as they only have to look at the right child
+            smallest = first
+            if arity == 2:
+                if first + 1 < size and less(prio[first + 1], prio[first]):
+                    smallest = first + 1
+            else:
+                for child in range(first + 1, min(first + arity, size)):
+                    if less(prio[child], prio[smallest]):
+                        smallest = child
+        
+            # Stop if k is already smaller than smallest
+            if not less(prio[smallest], prio[k]):
                 break
 
-            self._heap[k], self._heap[smallest] = self._heap[smallest], self._heap[k]
+            heap[k], heap[smallest] = heap[smallest], heap[k]
+            prio[k], prio[smallest] = prio[smallest], prio[k]
+            k = smallest
+
+    # bubbleUp and sink for plain heaps, comparing and swapping the
+    # elements themselves
+    # TC: O(log n)
+    def _bubbleUpPlain(self, k: int):
+        heap, arity = self._heap, self._arity
+        parent = (k - 1) // arity
+        while k > 0 and heap[k] < heap[parent]:
+            heap[k], heap[parent] = heap[parent], heap[k]
+            k = parent
+            parent = (k - 1) // arity
+
+    def _sinkPlain(self, k: int):
+        heap, arity, size = self._heap, self._arity, self._heapSize
+        while True:
+            first = arity * k + 1
+            if first >= size: break
+
+            smallest = first
+            if arity == 2:
+                if first + 1 < size and heap[first + 1] < heap[first]:
+                    smallest = first + 1
+            else:
+                for child in range(first + 1, min(first + arity, size)):
+                    if heap[child] < heap[smallest]:
+                        smallest = child
+
+            if not heap[smallest] < heap[k]:
+                break
+
+            heap[k], heap[smallest] = heap[smallest], heap[k]
             k = smallest
 
     # Removes a particular element in the heap
@@ -113,8 +312,8 @@ class BinaryHeap:
             return False
         
         # linear removal through search, O(n)
-        for i, el in enumerate(self._heap):
-            if el == elem:
+        for i in range(self._heapSize):
+            if self._heap[i] == elem:
                 self.removeAt(i)
                 return True
         
@@ -126,23 +325,24 @@ class BinaryHeap:
     def removeAt(self, i: int):
         if self.isEmpty(): return None
 
+        heap, prio = self._heap, self._prio
         self._heapSize -= 1
-        removed_data = self._heap[i]
-        # swap the node to be removed with the last node
-        self._heap[self._heapSize], self._heap[i] = self._heap[i], self._heap[self._heapSize]
+        removed_data = heap[i]
+        # move the last node into the place of the one being removed
+        heap[i], prio[i] = heap[self._heapSize], prio[self._heapSize]
         # clear the last node
-        self._heap[self._heapSize] = None
+        heap[self._heapSize] = prio[self._heapSize] = None
 
         # If removed data was already the last node from the beginning
         # no need to further sink anything
         if i == self._heapSize: return removed_data
 
         # We try both sinking and bubbling up if sinking did not work
-        elem = self._heap[i]
+        entry = prio[i]
         self.sink(i)
 
         # If sinking did not work, we bubble up
-        if self._heap[i] == elem:
+        if prio[i] is entry:
             self.bubbleUp(i)
         
         return removed_data
@@ -155,17 +355,49 @@ class BinaryHeap:
         # If we are outside of the heap's bounds return true
         if k >= self._heapSize: return True
 
-        left = 2 * k + 1
-        right = 2 * k + 2
+        first = self._arity * k + 1
+        children = range(first, min(first + self._arity, self._heapSize))
 
-        if left < self._heapSize and self._heap[k] > self._heap[left]: return False
-        if right < self._heapSize and self._heap[k] > self._heap[right]: return False
+        for child in children:
+            if self._less(self._prio[child], self._prio[k]): return False
 
-        return self._isMinHeap(left) and self._isMinHeap(right)
+        return all(self._isMinHeap(child) for child in children)
 
-    
-    
-    
 
+# Returns the k smallest elements of iterable in ascending order, equal
+# elements in the order they came. Streams through iterable keeping only
+# the k best in a bounded max heap, so memory is O(k)
+# TC: O(n log k)
+def nsmallest(k: int, iterable: Iterable[Any], key: Optional[Callable[[Any], Any]]=None) -> List[Any]:
+    return _bounded(k, iterable, key, largest=False)
+
+
+# Returns the k largest elements of iterable in descending order, equal
+# elements in the order they came
+# TC: O(n log k)
+def nlargest(k: int, iterable: Iterable[Any], key: Optional[Callable[[Any], Any]]=None) -> List[Any]:
+    return _bounded(k, iterable, key, largest=True)
+
+
+def _bounded(k: int, iterable: Iterable[Any], key: Optional[Callable[[Any], Any]], largest: bool) -> List[Any]:
+    if k <= 0: return []
+
+    # The root is the worst of the k best so far. Priorities carry the
+    # position (negated for nlargest) so that later equal elements are worse
+    sign = -1 if largest else 1
+    heap = BinaryHeap(reverse=not largest)
+    it = enumerate(iterable)
+    first = []
+    for i, elem in it:
+        first.append(((key(elem) if key else elem, sign * i), elem))
+        if len(first) == k: break
+    heap._extend(first)
+
+    for i, elem in it:
+        heap._pushpop((key(elem) if key else elem, sign * i), elem)
 
-        
\ No newline at end of file
+    res = []
+    while not heap.isEmpty():
+        res.append(heap.poll())
+    res.reverse()
+    return res
@@ -0,0 +1,181 @@
+# An indexed binary heap implementation (indexed priority queue)
+#
+# Every key sits in the heap at most once with a priority. A map from key to
+# heap position, kept up to date on every swap, turns contains into O(1)
+# and remove, decrease_key, increase_key and update into O(log n).
+#
+# Author: Alireza Ghey
+
+from typing import Any, Dict, List, Optional, Tuple
+
+class IndexedBinaryHeap:
+    def __init__(self) -> None:
+        # Keys and their priorities in heap order, parallel lists
+        self._keys: List[Any] = []
+        self._prios: List[Any] = []
+        # Maps every key to its index in _keys and _prios
+        self._pos: Dict[Any, int] = {}
+
+    # Whether priority queue is empty
+    # TC: O(1)
+    def isEmpty(self) -> bool:
+        return len(self._keys) == 0
+
+    # Clears everything inside the heap
+    # TC: O(1)
+    def clear(self) -> None:
+        self._keys, self._prios, self._pos = [], [], {}
+
+    # Returns the size of the heap
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __str__(self) -> str:
+        return str(list(zip(self._keys, self._prios)))
+
+    # Whether key is in heap
+    # TC: O(1)
+    def contains(self, key: Any) -> bool:
+        return key in self._pos
+
+    # Returns the priority of key, None if key is not in the heap
+    # TC: O(1)
+    def priority(self, key: Any) -> Any:
+        i = self._pos.get(key)
+        return None if i == None else self._prios[i]
+
+    # Returns the (key, priority) pair with the lowest priority
+    # If the priority queue is empty, returns None
+    # TC: O(1)
+    def peek(self) -> Optional[Tuple[Any, Any]]:
+        if self.isEmpty(): return None
+        return self._keys[0], self._prios[0]
+
+    # Removes the (key, priority) pair with the lowest priority and returns it
+    # If the heap is empty, returns None
+    # TC: O(log n)
+    def poll(self) -> Optional[Tuple[Any, Any]]:
+        if self.isEmpty(): return None
+        top = self._keys[0], self._prios[0]
+        self._removeAt(0)
+        return top
+
+    # Adds key with a priority, neither can be None
+    # Raises ValueError if key is already in the heap
+    # TC: O(log n)
+    def add(self, key: Any, priority: Any) -> None:
+        if key == None or priority == None:
+            raise ValueError("Key and priority cannot be None")
+        if key in self._pos:
+            raise ValueError("Key already in heap")
+
+        self._pos[key] = len(self._keys)
+        self._keys.append(key)
+        self._prios.append(priority)
+        self._bubbleUp(len(self._keys) - 1)
+
+    # Removes key from the heap
+    # Returns true if successful, false if key is not in the heap
+    # TC: O(log n)
+    def remove(self, key: Any) -> bool:
+        i = self._pos.get(key)
+        if i == None: return False
+        self._removeAt(i)
+        return True
+
+    # Lowers the priority of key
+    # Raises ValueError if key is not in the heap or priority is higher
+    # TC: O(log n)
+    def decrease_key(self, key: Any, priority: Any) -> None:
+        i = self._index(key)
+        if self._prios[i] < priority:
+            raise ValueError("New priority is higher than the current one")
+        self._prios[i] = priority
+        self._bubbleUp(i)
+
+    # Raises the priority of key
+    # Raises ValueError if key is not in the heap or priority is lower
+    # TC: O(log n)
+    def increase_key(self, key: Any, priority: Any) -> None:
+        i = self._index(key)
+        if priority < self._prios[i]:
+            raise ValueError("New priority is lower than the current one")
+        self._prios[i] = priority
+        self._sink(i)
+
+    # Sets the priority of key in either direction, adding key if it is new
+    # TC: O(log n)
+    def update(self, key: Any, priority: Any) -> None:
+        i = self._pos.get(key)
+        if i == None:
+            self.add(key, priority)
+            return
+        if priority == None:
+            raise ValueError("Priority cannot be None")
+
+        self._prios[i] = priority
+        self._sink(i)
+        self._bubbleUp(i)
+
+    # Returns the heap index of key, raises ValueError if it is not in the heap
+    def _index(self, key: Any) -> int:
+        i = self._pos.get(key)
+        if i == None: raise ValueError("Key not in heap")
+        return i
+
+    # Swaps two nodes and updates their positions
+    # TC: O(1)
+    def _swap(self, i: int, j: int) -> None:
+        keys, prios = self._keys, self._prios
+        keys[i], keys[j] = keys[j], keys[i]
+        prios[i], prios[j] = prios[j], prios[i]
+        self._pos[keys[i]] = i
+        self._pos[keys[j]] = j
+
+    # Perform a bottom up node bubble
+    # TC: O(log n)
+    def _bubbleUp(self, k: int) -> None:
+        prios = self._prios
+        parent = (k - 1) // 2
+        while k > 0 and prios[k] < prios[parent]:
+            self._swap(k, parent)
+            k = parent
+            parent = (k - 1) // 2
+
+    # Top down node sink
+    # TC: O(log n)
+    def _sink(self, k: int) -> None:
+        prios, size = self._prios, len(self._prios)
+        while True:
+            left = 2 * k + 1
+            right = left + 1
+            smallest = left
+
+            if right < size and prios[right] < prios[left]:
+                smallest = right
+            if left >= size or not prios[smallest] < prios[k]:
+                break
+
+            self._swap(k, smallest)
+            k = smallest
+
+    # Removes the node at a particular index
+    # TC: O(log n)
+    def _removeAt(self, i: int) -> None:
+        last = len(self._keys) - 1
+        self._swap(i, last)
+        del self._pos[self._keys.pop()]
+        self._prios.pop()
+
+        # The former last node may have to move either way
+        if i < last:
+            self._sink(i)
+            self._bubbleUp(i)
+
+    # Checks if this heap is a min heap and positions are in sync
+    # This method is just for testing purposes
+    def _isMinHeap(self) -> bool:
+        prios = self._prios
+        for i in range(1, len(prios)):
+            if prios[i] < prios[(i - 1) // 2]: return False
+        return len(self._pos) == len(self._keys) and all(self._pos[k] == i for i, k in enumerate(self._keys))
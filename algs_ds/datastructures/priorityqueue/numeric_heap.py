@@ -0,0 +1,249 @@
+# A min heap of numbers over a typed array buffer
+#
+# Priorities are stored unboxed in an array.array of a numeric typecode,
+# optionally with a parallel array of integer payloads (an index into the
+# caller's own records). A sorted array is a valid heap, so bulk work is
+# handed to a C level sort instead of sinking node by node in Python:
+# building the heap, large push_many batches and large pop_many calls.
+# NumPy is used for sorting and for the arrays pop_many returns when it is
+# installed, otherwise the built-in sort and array.array are used.
+# NaN priorities cannot be ordered and are not supported.
+#
+# Author: Alireza Ghey
+
+from __future__ import annotations
+from array import array
+from typing import Any, Iterable, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class NumericHeap:
+    TYPECODES = "bBhHiIlLqQfd"
+    PAYLOAD_TYPECODE = "q"
+    # Batches of at least 1 / SORT_RATIO of the heap are sorted in C,
+    # smaller ones are sifted one by one
+    SORT_RATIO = 16
+
+    # Builds the heap from values (and payloads) with a single sort
+    # TC: O(n log n), in C
+    def __init__(self, values: Optional[Iterable]=None, payloads: Optional[Iterable]=None,
+                 typecode: str="d", with_payloads: bool=False) -> None:
+        if typecode not in NumericHeap.TYPECODES:
+            raise ValueError(f"Unsupported typecode {typecode}")
+
+        self._typecode = typecode
+        self._prio = array(typecode)
+        self._payloads = array(NumericHeap.PAYLOAD_TYPECODE) if with_payloads or payloads is not None else None
+        if values is not None:
+            self.push_many(values, payloads)
+        elif payloads is not None:
+            raise ValueError("Payloads without values")
+
+    # Returns the size of the heap
+    def __len__(self) -> int:
+        return len(self._prio)
+
+    # Whether priority queue is empty
+    # TC: O(1)
+    def isEmpty(self) -> bool:
+        return len(self._prio) == 0
+
+    # Clears everything inside the heap
+    # TC: O(1)
+    def clear(self) -> None:
+        self._prio = array(self._typecode)
+        if self._payloads is not None: self._payloads = array(NumericHeap.PAYLOAD_TYPECODE)
+
+    # Returns the smallest value, or (value, payload) if the heap has payloads
+    # If the priority queue is empty, returns None
+    # TC: O(1)
+    def peek(self) -> Any:
+        if self.isEmpty(): return None
+        if self._payloads is None: return self._prio[0]
+        return self._prio[0], self._payloads[0]
+
+    # Removes the smallest value and returns it, or (value, payload)
+    # if the heap has payloads. If the heap is empty, returns None
+    # TC: O(log n)
+    def poll(self) -> Any:
+        if self.isEmpty(): return None
+        top = self.peek()
+
+        # Move the last node to the root and sink it
+        prio, payloads = self._prio, self._payloads
+        last = prio.pop()
+        lastPayload = payloads.pop() if payloads is not None else None
+        if prio:
+            prio[0] = last
+            if payloads is not None: payloads[0] = lastPayload
+            self._sink(0)
+        return top
+
+    # Adds a value, payload is required iff the heap has payloads
+    # TC: O(log n)
+    def push(self, value: Any, payload: Optional[int]=None) -> None:
+        if (payload is None) != (self._payloads is None):
+            raise ValueError("Payload must be given iff the heap has payloads")
+
+        # Convert both first, so a bad value or payload changes nothing
+        value = array(self._typecode, [value])
+        if payload is not None:
+            self._payloads.extend(array(NumericHeap.PAYLOAD_TYPECODE, [payload]))
+        self._prio.extend(value)
+        self._bubbleUp(len(self._prio) - 1)
+
+    # Adds many values (a NumPy array, array.array or any iterable of numbers).
+    # Small batches are bubbled up one by one, large ones trigger a C level sort
+    # TC: O(m log n) or O((n + m) log(n + m)) in C, for m values
+    def push_many(self, values: Iterable, payloads: Optional[Iterable]=None) -> None:
+        if (payloads is None) != (self._payloads is None):
+            raise ValueError("Payloads must be given iff the heap has payloads")
+
+        # Convert both into temporary arrays first, so that bad input
+        # leaves the heap untouched
+        values = self._toArray(self._typecode, values)
+        if payloads is not None:
+            payloads = self._toArray(NumericHeap.PAYLOAD_TYPECODE, payloads)
+            if len(payloads) != len(values):
+                raise ValueError("Values and payloads differ in length")
+
+        start = len(self._prio)
+        try:
+            self._prio.extend(values)
+            if payloads is not None: self._payloads.extend(payloads)
+        except BaseException:
+            del self._prio[start:]
+            if payloads is not None: del self._payloads[start:]
+            raise
+
+        added = len(self._prio) - start
+        if added * NumericHeap.SORT_RATIO >= len(self._prio):
+            self._sortAll()
+        else:
+            for i in range(start, len(self._prio)):
+                self._bubbleUp(i)
+
+    # Removes the k smallest values and returns them in ascending order as a
+    # NumPy array (array.array without NumPy), together with their payloads
+    # as a second array if the heap has payloads.
+    # Large k sort the buffer in C, whose sorted remainder is still a heap
+    # TC: O(k log n) or O(n log n) in C
+    def pop_many(self, k: int) -> Union[Any, Tuple[Any, Any]]:
+        if k < 0: raise ValueError("k cannot be negative")
+        k = min(k, len(self._prio))
+        hasPayloads = self._payloads is not None
+
+        if k * NumericHeap.SORT_RATIO >= len(self._prio):
+            self._sortAll()
+            values, self._prio = self._prio[:k], self._prio[k:]
+            if hasPayloads:
+                payloads, self._payloads = self._payloads[:k], self._payloads[k:]
+        else:
+            values = array(self._typecode)
+            payloads = array(NumericHeap.PAYLOAD_TYPECODE)
+            for _ in range(k):
+                top = self.poll()
+                if hasPayloads:
+                    values.append(top[0])
+                    payloads.append(top[1])
+                else:
+                    values.append(top)
+
+        if np is not None:
+            values = np.asarray(values)
+            if hasPayloads: payloads = np.asarray(payloads)
+        return (values, payloads) if hasPayloads else values
+
+    # Converts numbers into a new typed array, copying NumPy buffers in bulk.
+    # Raises TypeError or OverflowError on values the typecode cannot hold
+    @staticmethod
+    def _toArray(typecode: str, values: Iterable) -> array:
+        if np is not None and isinstance(values, np.ndarray):
+            return array(typecode, NumericHeap._castArray(values, typecode).tobytes())
+        if isinstance(values, array) and values.typecode == typecode:
+            return values
+        return array(typecode, values)
+
+    # Casts a NumPy array to typecode under the rules array.array applies
+    # to Python numbers, instead of NumPy's silent truncating and wrapping:
+    # integer typecodes reject floats and integers out of range, float
+    # typecodes take any real number
+    @staticmethod
+    def _castArray(values: Any, typecode: str) -> Any:
+        target = np.dtype(typecode)
+        if not np.can_cast(values.dtype, target, casting="safe"):
+            if values.dtype.kind in "biu" and target.kind in "iu":
+                info = np.iinfo(target)
+                if values.size and (values.min() < info.min or values.max() > info.max):
+                    raise OverflowError(f"Values out of range for typecode {typecode}")
+            elif not (values.dtype.kind in "biuf" and target.kind == "f"):
+                raise TypeError(f"Cannot store {values.dtype} values in typecode {typecode}")
+        return np.ascontiguousarray(values, dtype=target)
+
+    # Sorts the whole buffer (and payloads along), which heapifies it
+    # TC: O(n log n), in C
+    def _sortAll(self) -> None:
+        prio, payloads = self._prio, self._payloads
+        if np is not None:
+            values = np.asarray(prio)
+            if payloads is None:
+                self._prio = array(self._typecode, np.sort(values).tobytes())
+            else:
+                order = np.argsort(values, kind="stable")
+                self._prio = array(self._typecode, values[order].tobytes())
+                self._payloads = array(NumericHeap.PAYLOAD_TYPECODE, np.asarray(payloads)[order].tobytes())
+        elif payloads is None:
+            self._prio = array(self._typecode, sorted(prio))
+        else:
+            order = sorted(range(len(prio)), key=prio.__getitem__)
+            self._prio = array(self._typecode, [prio[i] for i in order])
+            self._payloads = array(NumericHeap.PAYLOAD_TYPECODE, [payloads[i] for i in order])
+
+    # Perform a bottom up node bubble, moving a hole up
+    # instead of swapping at every level
+    # TC: O(log n)
+    def _bubbleUp(self, k: int) -> None:
+        prio, payloads = self._prio, self._payloads
+        value = prio[k]
+        payload = payloads[k] if payloads is not None else None
+
+        while k > 0:
+            parent = (k - 1) >> 1
+            if not value < prio[parent]: break
+            prio[k] = prio[parent]
+            if payloads is not None: payloads[k] = payloads[parent]
+            k = parent
+
+        prio[k] = value
+        if payloads is not None: payloads[k] = payload
+
+    # Top down node sink, moving a hole down
+    # TC: O(log n)
+    def _sink(self, k: int) -> None:
+        prio, payloads = self._prio, self._payloads
+        size = len(prio)
+        value = prio[k]
+        payload = payloads[k] if payloads is not None else None
+
+        while True:
+            child = 2 * k + 1
+            if child >= size: break
+            if child + 1 < size and prio[child + 1] < prio[child]:
+                child += 1
+            if not prio[child] < value: break
+
+            prio[k] = prio[child]
+            if payloads is not None: payloads[k] = payloads[child]
+            k = child
+
+        prio[k] = value
+        if payloads is not None: payloads[k] = payload
+
+    # Checks if this heap is a min heap
+    # This method is just for testing purposes
+    def _isMinHeap(self) -> bool:
+        prio = self._prio
+        return all(not prio[i] < prio[(i - 1) >> 1] for i in range(1, len(prio)))
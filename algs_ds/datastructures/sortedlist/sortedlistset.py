@@ -0,0 +1,300 @@
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Any, Optional, Iterator, Iterable
+from algs_ds.datastructures.binarysearchtree.binarysearchtree import TraversalType
+# A cache friendly ordered set, in the style of a B+-tree
+#
+# Elements live in sorted Python lists ("leaves") of a few hundred elements,
+# kept in order in a list of leaves. A parallel list with the maximum of
+# every leaf acts as the index level. A lookup is two bisects in C instead
+# of one Python level hop per tree level, and an in-order scan walks the
+# leaves back to back. Offering the same API as BinarySearchTree, it can
+# replace it wherever only in order traversal is needed.
+#
+# Author: Alireza Ghey
+
+class SortedListSet:
+    # Leaves are split once they exceed twice the load
+    # and merged into a neighbour once they fall below half of it
+    DEFAULT_LOAD = 500
+
+    def __init__(self, load: Optional[int]=None):
+        if load != None and load < 2: raise ValueError("Illegal load")
+        self._load = load or SortedListSet.DEFAULT_LOAD
+
+        # Sorted leaves, every element of a leaf is smaller than
+        # every element of the next leaf
+        self._lists = []
+        # Largest element of each leaf
+        self._maxes = []
+        self._size = 0
+        # Number of elements before each leaf (plus the total at the end),
+        # answers positional queries. Dropped on every change, rebuilt on demand
+        self._offsets = None
+
+    # Builds a set from strictly increasing elements, filling leaves
+    # to the load. The elements are never compared, so the input
+    # must already be sorted and free of duplicates
+    # TC: O(n)
+    @classmethod
+    def from_sorted(cls, iterable: Iterable, load: Optional[int]=None) -> SortedListSet:
+        s = cls(load)
+        elements = list(iterable)
+        s._lists = [elements[i:i + s._load] for i in range(0, len(elements), s._load)]
+        s._maxes = [leaf[-1] for leaf in s._lists]
+        s._size = len(elements)
+        return s
+
+    # Builds a set from elements in any order, duplicates are dropped
+    # TC: O(n log n)
+    @classmethod
+    def from_iterable(cls, iterable: Iterable, load: Optional[int]=None) -> SortedListSet:
+        ordered = []
+        for el in sorted(iterable):
+            if not ordered or ordered[-1] < el:
+                ordered.append(el)
+        return cls.from_sorted(ordered, load)
+
+    # Check if the set is empty
+    def isEmpty(self) -> bool:
+        return len(self) == 0
+
+    # Get the number of elements in this set
+    def __len__(self) -> int:
+        return self._size
+
+    # Adds an element to the set
+    # Returns true if successful, false if the element already exists
+    # TC: O(log n) comparisons plus shifting within one leaf
+    def add(self, data: Any) -> bool:
+        maxes = self._maxes
+        if not maxes:
+            self._lists.append([data])
+            maxes.append(data)
+            self._size = 1
+            self._offsets = None
+            return True
+
+        pos = bisect_left(maxes, data)
+        if pos == len(maxes):
+            # Larger than everything, append to the last leaf
+            pos -= 1
+            leaf = self._lists[pos]
+            leaf.append(data)
+            maxes[pos] = data
+        else:
+            leaf = self._lists[pos]
+            i = bisect_left(leaf, data)
+            # leaf[i] >= data, so they are equal unless data is smaller
+            if not data < leaf[i]: return False
+            leaf.insert(i, data)
+
+        self._size += 1
+        self._offsets = None
+        if len(leaf) > 2 * self._load:
+            self._split(pos)
+        return True
+
+    # Removes an element from the set if it exists
+    # Returns true if successful
+    # TC: O(log n) comparisons plus shifting within one leaf
+    def remove(self, data: Any) -> bool:
+        maxes = self._maxes
+        pos = bisect_left(maxes, data)
+        if pos == len(maxes): return False
+
+        leaf = self._lists[pos]
+        i = bisect_left(leaf, data)
+        if data < leaf[i]: return False
+
+        del leaf[i]
+        self._size -= 1
+        self._offsets = None
+        if not leaf:
+            del self._lists[pos]
+            del maxes[pos]
+            return True
+
+        if i == len(leaf): maxes[pos] = leaf[-1]
+        if len(leaf) < self._load // 2 and len(self._lists) > 1:
+            self._merge(pos)
+        return True
+
+    # Returns true if the element is present in the set
+    # TC: O(log n)
+    def contains(self, data: Any) -> bool:
+        maxes = self._maxes
+        pos = bisect_left(maxes, data)
+        if pos == len(maxes): return False
+
+        leaf = self._lists[pos]
+        return not data < leaf[bisect_left(leaf, data)]
+
+    # Number of levels: the index level above the leaves plus the leaf level.
+    # Kept for API compatibility with BinarySearchTree
+    # TC: O(1)
+    def height(self) -> int:
+        if not self._lists: return 0
+        return 1 if len(self._lists) == 1 else 2
+
+    # Returns the smallest element, None if the set is empty
+    # TC: O(1)
+    def min(self) -> Any:
+        return self._lists[0][0] if self._lists else None
+
+    # Returns the largest element, None if the set is empty
+    # TC: O(1)
+    def max(self) -> Any:
+        return self._maxes[-1] if self._maxes else None
+
+    # Returns the largest element <= data, None if there is none
+    # TC: O(log n)
+    def floor(self, data: Any) -> Any:
+        pos = bisect_left(self._maxes, data)
+        if pos < len(self._maxes):
+            leaf = self._lists[pos]
+            i = bisect_right(leaf, data)
+            if i: return leaf[i - 1]
+        # Everything in leaf pos is larger, fall back to the previous leaf
+        return self._maxes[pos - 1] if pos else None
+
+    # Returns the smallest element >= data, None if there is none
+    # TC: O(log n)
+    def ceiling(self, data: Any) -> Any:
+        pos = bisect_left(self._maxes, data)
+        if pos == len(self._maxes): return None
+        leaf = self._lists[pos]
+        return leaf[bisect_left(leaf, data)]
+
+    # Returns the largest element < data, None if there is none
+    # data does not have to be in the set
+    # TC: O(log n)
+    def predecessor(self, data: Any) -> Any:
+        pos = bisect_left(self._maxes, data)
+        if pos < len(self._maxes):
+            leaf = self._lists[pos]
+            i = bisect_left(leaf, data)
+            if i: return leaf[i - 1]
+        return self._maxes[pos - 1] if pos else None
+
+    # Returns the smallest element > data, None if there is none
+    # data does not have to be in the set
+    # TC: O(log n)
+    def successor(self, data: Any) -> Any:
+        pos = bisect_right(self._maxes, data)
+        if pos == len(self._maxes): return None
+        leaf = self._lists[pos]
+        return leaf[bisect_right(leaf, data)]
+
+    # Returns the number of elements strictly less than data
+    # TC: O(log n), plus O(n / load) after a change
+    def count_less(self, data: Any) -> int:
+        return self._countBelow(data, False)
+
+    # Returns the number of elements e with lo <= e <= hi
+    # TC: O(log n), plus O(n / load) after a change
+    def count_range(self, lo: Any, hi: Any) -> int:
+        if hi < lo: return 0
+        return self._countBelow(hi, True) - self._countBelow(lo, False)
+
+    # Returns the zero based position of data in sorted order
+    # Raises ValueError if data is not in the set
+    # TC: O(log n), plus O(n / load) after a change
+    def rank(self, data: Any) -> int:
+        if not self.contains(data):
+            raise ValueError(f"{data} is not in the set")
+        return self._countBelow(data, False)
+
+    # Returns the k-th smallest element, zero based
+    # Raises IndexError if k is out of range
+    # TC: O(log n), plus O(n / load) after a change
+    def select(self, k: int) -> Any:
+        if k < 0 or k >= len(self):
+            raise IndexError("Index out of range")
+
+        offsets = self._leafOffsets()
+        pos = bisect_right(offsets, k) - 1
+        return self._lists[pos][k - offsets[pos]]
+
+    # Private method counting the elements below data,
+    # including data itself if inclusive is set
+    def _countBelow(self, data: Any, inclusive: bool) -> int:
+        pos = bisect_left(self._maxes, data)
+        if pos == len(self._maxes): return self._size
+
+        leaf = self._lists[pos]
+        i = bisect_right(leaf, data) if inclusive else bisect_left(leaf, data)
+        return self._leafOffsets()[pos] + i
+
+    # Private method returning the number of elements before each leaf
+    # TC: O(n / load) after a change, O(1) otherwise
+    def _leafOffsets(self) -> list:
+        if self._offsets is None:
+            self._offsets = list(accumulate((len(leaf) for leaf in self._lists), initial=0))
+        return self._offsets
+
+    # Returns an iterator for a given TraversalType.
+    # Only in order traversal exists for a set without binary nodes
+    def traverse(self, travType: TraversalType) -> Iterator:
+        if travType == TraversalType.InOrder:
+            return self.irange()
+        raise ValueError(f"Traversal type {TraversalType.toString(travType)} is not supported")
+
+    # Returns a lazy iterator over the elements e with lo <= e <= hi in order,
+    # or in descending order if reverse is set. A bound of None is open
+    # TC: O(log n + k) for k yielded elements
+    def irange(self, lo: Any=None, hi: Any=None, reverse: bool=False) -> Iterator:
+        lists, maxes = self._lists, self._maxes
+        if not lists: return iter(())
+
+        # Leaf and index of the first element >= lo
+        startPos = 0 if lo is None else bisect_left(maxes, lo)
+        if startPos == len(maxes): return iter(())
+        start = 0 if lo is None else bisect_left(lists[startPos], lo)
+
+        # Leaf and index just past the last element <= hi
+        endPos = len(maxes) - 1 if hi is None else min(bisect_right(maxes, hi), len(maxes) - 1)
+        end = len(lists[endPos]) if hi is None else bisect_right(lists[endPos], hi)
+
+        if reverse: return self._irangeReverse(startPos, start, endPos, end)
+        return self._irangeForward(startPos, start, endPos, end)
+
+    def _irangeForward(self, startPos: int, start: int, endPos: int, end: int) -> Iterator:
+        lists = self._lists
+        for pos in range(startPos, endPos + 1):
+            leaf = lists[pos]
+            lo = start if pos == startPos else 0
+            hi = end if pos == endPos else len(leaf)
+            for i in range(lo, hi):
+                yield leaf[i]
+
+    def _irangeReverse(self, startPos: int, start: int, endPos: int, end: int) -> Iterator:
+        lists = self._lists
+        for pos in range(endPos, startPos - 1, -1):
+            leaf = lists[pos]
+            lo = start if pos == startPos else 0
+            hi = end if pos == endPos else len(leaf)
+            for i in range(hi - 1, lo - 1, -1):
+                yield leaf[i]
+
+    # Private method splitting an overfull leaf in two halves
+    def _split(self, pos: int) -> None:
+        leaf = self._lists[pos]
+        half = leaf[self._load:]
+        del leaf[self._load:]
+        self._maxes[pos] = leaf[-1]
+        self._lists.insert(pos + 1, half)
+        self._maxes.insert(pos + 1, half[-1])
+
+    # Private method merging an underfull leaf into a neighbour,
+    # splitting the result again if it became overfull
+    def _merge(self, pos: int) -> None:
+        if pos == 0: pos = 1
+        prev = self._lists[pos - 1]
+        prev.extend(self._lists[pos])
+        self._maxes[pos - 1] = self._maxes[pos]
+        del self._lists[pos]
+        del self._maxes[pos]
+        if len(prev) > 2 * self._load:
+            self._split(pos - 1)
@@ -0,0 +1,165 @@
+# Tests for AVLTree
+#
+#
+# Author: Alireza Ghey
+from algs_ds.datastructures.binarysearchtree.avltree import AVLTree
+from algs_ds.datastructures.binarysearchtree.binarysearchtree import TraversalType
+import math
+import random
+
+class Test_AVLTree:
+    LOOPS = 100
+
+    # Checks ordering, heights and balance factors of every node
+    def _validate(self, node) -> int:
+        if node == None: return 0
+        left = self._validate(node._left)
+        right = self._validate(node._right)
+
+        if node._left: assert node._left._data < node._data and node._left._parent is node
+        if node._right: assert node._right._data > node._data and node._right._parent is node
+        assert abs(left - right) <= 1
+        assert node._height == max(left, right) + 1
+        return node._height
+
+    def _maxHeight(self, n: int) -> int:
+        # Upper bound of AVL tree heights
+        return int(1.44 * math.log2(n + 2)) if n else 0
+
+    def test_add(self):
+        tree = AVLTree()
+        assert tree.add("A") == True
+        assert tree.add("A") == False
+        assert tree.add("B") == True
+        assert len(tree) == 2
+
+    def test_sorted_input_stays_balanced(self):
+        for data in (range(5000), range(5000, 0, -1)):
+            tree = AVLTree()
+            for el in data:
+                tree.add(el)
+
+            assert len(tree) == 5000
+            assert tree.height() <= self._maxHeight(5000)
+            self._validate(tree._root)
+            assert list(tree.traverse(TraversalType.InOrder)) == sorted(data)
+
+    def test_random_add_remove(self):
+        for i in range(Test_AVLTree.LOOPS):
+            arr = list(range(i))
+            random.shuffle(arr)
+            tree = AVLTree()
+            for el in arr:
+                assert tree.add(el) == True
+
+            random.shuffle(arr)
+            for j, el in enumerate(arr):
+                assert tree.contains(el) == True
+                assert tree.remove(el) == True
+                assert tree.remove(el) == False
+                assert tree.contains(el) == False
+                assert len(tree) == i - j - 1
+                assert tree.height() == self._validate(tree._root)
+                assert tree.height() <= self._maxHeight(len(tree))
+
+            assert tree.isEmpty() == True
+            assert tree.height() == 0
+
+    def test_orderStatistics(self):
+        tree = AVLTree()
+        arr = list(range(0, 2000, 2))
+        random.shuffle(arr)
+        for el in arr:
+            tree.add(el)
+        for el in arr[:500]:
+            tree.remove(el)
+
+        ordered = sorted(arr[500:])
+        assert tree._root._size == len(ordered)
+        for i, el in enumerate(ordered):
+            assert tree.select(i) == el
+            assert tree.rank(el) == i
+            assert tree.count_less(el + 1) == i + 1
+        assert tree.count_range(100, 1000) == sum(1 for e in ordered if 100 <= e <= 1000)
+
+    def test_fromSorted(self):
+        for i in range(Test_AVLTree.LOOPS):
+            tree = AVLTree.from_sorted(range(i))
+            assert len(tree) == i
+            assert tree.height() == self._validate(tree._root)
+
+            # The bulk built tree keeps balancing afterwards
+            for el in range(i, 2 * i):
+                tree.add(el)
+            assert tree.height() == self._validate(tree._root)
+            assert list(tree.traverse(TraversalType.InOrder)) == list(range(2 * i))
+
+        tree = AVLTree.from_iterable([3, 1, 2, 3, 1])
+        assert list(tree.traverse(TraversalType.InOrder)) == [1, 2, 3]
+
+    def test_split(self):
+        for i in range(Test_AVLTree.LOOPS):
+            tree = AVLTree.from_iterable(random.sample(range(3 * i), i))
+            data = sorted(tree.traverse(TraversalType.InOrder))
+            key = random.randint(-1, 3 * i)
+
+            left, right = tree.split(key)
+            assert tree.isEmpty() == True
+            assert list(left.traverse(TraversalType.InOrder)) == [el for el in data if el < key]
+            assert list(right.traverse(TraversalType.InOrder)) == [el for el in data if el >= key]
+            for part in (left, right):
+                assert part.height() == self._validate(part._root)
+                assert len(part) == len(list(part.traverse(TraversalType.InOrder)))
+                if part._root: assert part._root._parent == None
+
+    def test_join(self):
+        for i in range(Test_AVLTree.LOOPS):
+            # Very different heights on both sides
+            cut = random.randint(0, 2 * i)
+            left = AVLTree.from_sorted(range(cut))
+            right = AVLTree.from_sorted(range(cut, 2 * i + 1))
+
+            tree = AVLTree.join(left, right)
+            assert left.isEmpty() == True and right.isEmpty() == True
+            assert len(tree) == 2 * i + 1
+            assert tree.height() == self._validate(tree._root)
+            assert list(tree.traverse(TraversalType.InOrder)) == list(range(2 * i + 1))
+
+            # The joined tree keeps working as usual
+            assert tree.remove(i) == True
+            assert tree.add(i) == True
+            assert tree.height() == self._validate(tree._root)
+
+        try:
+            AVLTree.join(AVLTree.from_sorted([1, 5]), AVLTree.from_sorted([3]))
+            assert False
+        except ValueError:
+            pass
+
+    def test_splitThenJoin(self):
+        tree = AVLTree.from_sorted(range(1000))
+        parts = []
+        for key in (800, 600, 400, 200):
+            tree, right = tree.split(key)
+            parts.append(right)
+        parts.append(tree)
+
+        assert [len(part) for part in parts] == [200] * 5
+        merged = AVLTree()
+        for part in reversed(parts):
+            merged = AVLTree.join(merged, part)
+        assert merged.height() == self._validate(merged._root)
+        assert list(merged.traverse(TraversalType.InOrder)) == list(range(1000))
+
+    def test_union(self):
+        for i in range(Test_AVLTree.LOOPS):
+            first = random.sample(range(2 * i), i)
+            second = random.sample(range(2 * i), i)
+            a, b = AVLTree.from_iterable(first), AVLTree.from_iterable(second)
+
+            tree = a.union(b)
+            assert isinstance(tree, AVLTree)
+            assert list(tree.traverse(TraversalType.InOrder)) == sorted(set(first) | set(second))
+            assert tree.height() == self._validate(tree._root)
+            # Neither input is modified
+            assert list(a.traverse(TraversalType.InOrder)) == sorted(first)
@@ -0,0 +1,140 @@
+# Tests for BST dumps
+#
+#
+# Author: Alireza Ghey
+from algs_ds.datastructures.binarysearchtree.binarysearchtree import BinarySearchTree, TraversalType
+from algs_ds.datastructures.binarysearchtree.avltree import AVLTree
+from algs_ds.datastructures.binarysearchtree import binarysearchtree_dump
+import io
+import pytest
+import struct
+
+class NotATestStream(io.RawIOBase):
+    # A non seekable stream handing out at most 7 bytes per read, like a pipe
+    def __init__(self, data: bytes=b""):
+        self._data = data
+        self.written = bytearray()
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return True
+
+    def readinto(self, buf) -> int:
+        n = min(len(buf), 7, len(self._data))
+        buf[:n] = self._data[:n]
+        self._data = self._data[n:]
+        return n
+
+    def write(self, data) -> int:
+        self.written += data
+        return len(data)
+
+class Test_BinarySearchTreeDump:
+
+    def test_roundtrip(self):
+        for size in (0, 1, 2, 1000, 5000):
+            tree = BinarySearchTree()
+            for el in range(size):
+                tree.add(el)
+
+            f = io.BytesIO()
+            tree.dump(f)
+            f.seek(0)
+            loaded = BinarySearchTree.load(f)
+
+            assert len(loaded) == size
+            assert list(loaded.traverse(TraversalType.InOrder)) == list(range(size))
+            # Reloaded trees are balanced, even if the dumped one was a list
+            assert loaded.height() == size.bit_length()
+            if size: assert loaded.rank(size - 1) == size - 1
+
+    def test_mixedElements(self):
+        tree = AVLTree.from_iterable(["b", "a", "ünïcode", "zz"])
+        f = io.BytesIO()
+        tree.dump(f)
+        f.seek(0)
+
+        loaded = AVLTree.load(f)
+        assert isinstance(loaded, AVLTree)
+        assert list(loaded.traverse(TraversalType.InOrder)) == ["a", "b", "zz", "ünïcode"]
+        assert loaded.add("c") == True
+
+    def test_dumpSortedSeekable(self, tmp_path):
+        path = tmp_path / "tree.dump"
+        with open(path, "wb") as f:
+            # A generator, never materialized
+            assert BinarySearchTree.dump_sorted((i * 2 for i in range(3000)), f) == 3000
+
+        with open(path, "rb") as f:
+            count, elements = binarysearchtree_dump.load_sorted(f)
+            assert count == 3000
+            assert list(elements) == [i * 2 for i in range(3000)]
+
+    def test_dumpSortedStream(self):
+        out = NotATestStream()
+        assert BinarySearchTree.dump_sorted(iter(range(2500)), out) == 2500
+
+        # The count could not be patched, loading falls back to collecting
+        loaded = BinarySearchTree.load(NotATestStream(bytes(out.written)))
+        assert len(loaded) == 2500
+        assert list(loaded.traverse(TraversalType.InOrder)) == list(range(2500))
+
+    def test_errors(self):
+        with pytest.raises(ValueError):
+            BinarySearchTree.dump_sorted([1, 3, 2], io.BytesIO())
+        with pytest.raises(ValueError):
+            BinarySearchTree.dump_sorted([1, 1], io.BytesIO())
+        with pytest.raises(ValueError):
+            BinarySearchTree.load(io.BytesIO(b"NOPE" + bytes(12)))
+
+        f = io.BytesIO()
+        BinarySearchTree.from_sorted(range(100)).dump(f)
+        with pytest.raises(ValueError):
+            BinarySearchTree.load(io.BytesIO(f.getvalue()[:-20]))
+
+    def test_primitiveTypes(self):
+        for data in ([-2 ** 100, -1, 0, 1, 255, 2 ** 64], [-1.5, 0.0, 2.25, 1e300],
+                     [b"", b"\x00", b"abc"], ["", "a", "ünïcode"], [False, True]):
+            f = io.BytesIO()
+            BinarySearchTree.dump_sorted(data, f)
+            # Struct packed, nothing is pickled
+            assert b"\x80\x05" not in f.getvalue()
+            f.seek(0)
+            loaded = list(BinarySearchTree.load(f).traverse(TraversalType.InOrder))
+            assert loaded == data
+            assert [type(el) for el in loaded] == [type(el) for el in data]
+
+    def test_pickleIsOptIn(self):
+        tree = BinarySearchTree.from_sorted([(1, "a"), (2, "b")])
+        with pytest.raises(TypeError):
+            tree.dump(io.BytesIO())
+
+        f = io.BytesIO()
+        tree.dump(f, allow_pickle=True)
+        with pytest.raises(ValueError):
+            BinarySearchTree.load(io.BytesIO(f.getvalue()))
+        loaded = BinarySearchTree.load(io.BytesIO(f.getvalue()), allow_pickle=True)
+        assert list(loaded.traverse(TraversalType.InOrder)) == [(1, "a"), (2, "b")]
+
+    def _withCount(self, data: bytes, count: int) -> bytes:
+        magic, version, reserved, _ = struct.unpack_from("<4sHHQ", data)
+        return struct.pack("<4sHHQ", magic, version, reserved, count) + data[16:]
+
+    def test_countMismatch(self):
+        f = io.BytesIO()
+        BinarySearchTree.from_sorted(range(100)).dump(f)
+
+        for count in (101, 1000, 99, 0):
+            with pytest.raises(ValueError):
+                BinarySearchTree.load(io.BytesIO(self._withCount(f.getvalue(), count)))
+        assert len(BinarySearchTree.load(io.BytesIO(self._withCount(f.getvalue(), 100)))) == 100
+
+    def test_failedDumpLeavesNoValidHeader(self):
+        for data, count in (([1, 2, 3], 5), ([1, 3, 2], None), ([1, (2,)], None)):
+            f = io.BytesIO()
+            with pytest.raises((ValueError, TypeError)):
+                binarysearchtree_dump.dump_sorted(data, f, count)
+            with pytest.raises(ValueError):
+                BinarySearchTree.load(io.BytesIO(f.getvalue()))
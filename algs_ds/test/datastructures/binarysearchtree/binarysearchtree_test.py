@@ -8,6 +8,7 @@ from algs_ds.datastructures.binarysearchtree.binarysearchtree import BinarySearc
 from typing import List
 import pytest
 import random
+import tracemalloc
 from collections import deque
 
 class NotATestTreeNode:
@@ -253,6 +254,173 @@ class Test_BinarySearchTree:
             arr = self._getRandList(i)
             assert self._validateTreeTraversal(TraversalType.LevelOrder, arr) == True
 
+    def test_skewedTreeNoRecursionLimit(self):
+        # A sorted insertion order degenerates the tree into a list
+        # deeper than Python's recursion limit
+        size = 5000
+        tree = BinarySearchTree()
+        for el in range(size):
+            assert tree.add(el) == True
+        assert tree.add(size - 1) == False
+
+        assert tree.contains(size - 1) == True
+        assert tree.contains(size) == False
+        assert list(tree.traverse(TraversalType.InOrder)) == list(range(size))
+        assert list(tree.traverse(TraversalType.PreOrder)) == list(range(size))
+        assert list(tree.traverse(TraversalType.PostOrder)) == list(range(size - 1, -1, -1))
+        assert tree.height() == size
+
+        for el in range(size - 1, -1, -1):
+            assert tree.remove(el) == True
+        assert tree.remove(0) == False
+        assert tree.isEmpty() == True
+
+    def test_orderStatistics(self):
+        tree = BinarySearchTree()
+        reference = set()
+
+        for _ in range(Test_BinarySearchTree.LOOPS * 10):
+            el = random.randint(0, 200)
+            if random.random() < 0.6:
+                assert tree.add(el) == (el not in reference)
+                reference.add(el)
+            else:
+                assert tree.remove(el) == (el in reference)
+                reference.discard(el)
+
+            ordered = sorted(reference)
+            assert tree._root == None or tree._root._size == len(ordered)
+            probe = random.randint(-10, 210)
+            lo, hi = sorted((random.randint(-10, 210), random.randint(-10, 210)))
+            assert tree.count_less(probe) == sum(1 for e in ordered if e < probe)
+            assert tree.count_range(lo, hi) == sum(1 for e in ordered if lo <= e <= hi)
+            assert tree.count_range(hi, lo) == (1 if lo == hi and lo in reference else 0)
+            for i, el in enumerate(ordered):
+                assert tree.select(i) == el
+                assert tree.rank(el) == i
+
+        with pytest.raises(IndexError):
+            tree.select(len(tree))
+        with pytest.raises(IndexError):
+            tree.select(-1)
+        with pytest.raises(ValueError):
+            tree.rank(1000)
+
+    def test_minMaxFloorCeiling(self):
+        tree = BinarySearchTree()
+        assert tree.min() == None
+        assert tree.max() == None
+        assert tree.floor(1) == None
+        assert list(tree.irange(0, 10)) == []
+
+        arr = list(range(0, 100, 5))
+        random.shuffle(arr)
+        for el in arr:
+            tree.add(el)
 
+        assert tree.min() == 0
+        assert tree.max() == 95
+        for probe in range(-3, 103):
+            below = [e for e in arr if e <= probe]
+            above = [e for e in arr if e >= probe]
+            assert tree.floor(probe) == (max(below) if below else None)
+            assert tree.ceiling(probe) == (min(above) if above else None)
 
-        
\ No newline at end of file
+            strictlyBelow = [e for e in arr if e < probe]
+            strictlyAbove = [e for e in arr if e > probe]
+            assert tree.predecessor(probe) == (max(strictlyBelow) if strictlyBelow else None)
+            assert tree.successor(probe) == (min(strictlyAbove) if strictlyAbove else None)
+
+    def test_irange(self):
+        for i in range(Test_BinarySearchTree.LOOPS):
+            arr = self._getRandList(i)
+            tree = BinarySearchTree()
+            for el in arr:
+                tree.add(el)
+
+            lo, hi = sorted((random.randint(-5, i + 5), random.randint(-5, i + 5)))
+            expected = [e for e in sorted(arr) if lo <= e <= hi]
+            assert list(tree.irange(lo, hi)) == expected
+            assert list(tree.irange(lo, hi, reverse=True)) == expected[::-1]
+            assert list(tree.irange(lo)) == [e for e in sorted(arr) if e >= lo]
+            assert list(tree.irange(hi=hi, reverse=True)) == [e for e in sorted(arr, reverse=True) if e <= hi]
+            assert list(tree.irange()) == sorted(arr)
+            assert list(tree.irange(hi, lo)) == ([lo] if lo == hi and lo in arr else [])
+
+    def test_fromSorted(self):
+        for i in range(Test_BinarySearchTree.LOOPS):
+            # Generators without len() are accepted as well
+            tree = BinarySearchTree.from_sorted(el for el in range(i))
+            assert len(tree) == i
+            assert list(tree.traverse(TraversalType.InOrder)) == list(range(i))
+            # Perfectly balanced
+            assert tree.height() == i.bit_length()
+            for el in range(i):
+                assert tree.rank(el) == el
+
+            tree.add(i)
+            tree.remove(0)
+            assert list(tree.traverse(TraversalType.InOrder)) == list(range(1, i + 1))
+
+    def test_fromIterable(self):
+        arr = self._getRandList(500) * 2
+        tree = BinarySearchTree.from_iterable(arr)
+        assert len(tree) == 500
+        assert list(tree.traverse(TraversalType.InOrder)) == list(range(500))
+        assert tree.height() == (500).bit_length()
+
+    # Checks parent pointers, heights and sizes against the actual shape,
+    # returns the in, pre and post order of the subtree
+    def _validateNode(self, node, parent, inOrder, preOrder, postOrder) -> int:
+        if node == None: return 0
+        assert node._parent is parent
+        preOrder.append(node._data)
+        left = self._validateNode(node._left, node, inOrder, preOrder, postOrder)
+        inOrder.append(node._data)
+        right = self._validateNode(node._right, node, inOrder, preOrder, postOrder)
+        postOrder.append(node._data)
+
+        assert node._height == max(left, right) + 1
+        assert node._size == 1 + (node._left._size if node._left else 0) + (node._right._size if node._right else 0)
+        return node._height
+
+    def test_metadataAndTraversalsAfterUpdates(self):
+        trees = [BinarySearchTree(), BinarySearchTree.from_sorted(range(0, 200, 3))]
+        for tree in trees:
+            for _ in range(Test_BinarySearchTree.LOOPS * 10):
+                el = random.randint(0, 200)
+                if random.random() < 0.6: tree.add(el)
+                else: tree.remove(el)
+
+                inOrder, preOrder, postOrder = [], [], []
+                assert tree.height() == self._validateNode(tree._root, None, inOrder, preOrder, postOrder)
+                assert list(tree.traverse(TraversalType.InOrder)) == inOrder
+                assert list(tree.traverse(TraversalType.PreOrder)) == preOrder
+                assert list(tree.traverse(TraversalType.PostOrder)) == postOrder
+
+    def test_traversalMemoryIsConstant(self):
+        # Zig-zag insertion order gives a tree as deep as it is large,
+        # the worst case for a stack of pending nodes
+        size = 2000
+        tree = BinarySearchTree()
+        for i in range(size // 2):
+            tree.add(i)
+            tree.add(size - i)
+        for travType in (TraversalType.PreOrder, TraversalType.InOrder, TraversalType.PostOrder):
+            tracemalloc.start()
+            for _ in tree.traverse(travType): pass
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            assert peak < 10000
+
+    def test_union(self):
+        a = BinarySearchTree.from_iterable(["B", "D", "F"])
+        b = BinarySearchTree()
+        for el in ["A", "D", "G", "F"]:
+            b.add(el)
+
+        tree = a.union(b)
+        assert list(tree.traverse(TraversalType.InOrder)) == ["A", "B", "D", "F", "G"]
+        assert tree.height() == 3
+        assert list(a.traverse(TraversalType.InOrder)) == ["B", "D", "F"]
+        assert len(b.union(BinarySearchTree())) == 4
@@ -0,0 +1,126 @@
+# Tests for PersistentAVLTree
+#
+#
+# Author: Alireza Ghey
+from algs_ds.datastructures.binarysearchtree.persistentavltree import PersistentAVLTree
+from algs_ds.datastructures.binarysearchtree.binarysearchtree import TraversalType, _Node
+import random
+
+class NotATestNode(_Node):
+    __slots__ = ()
+
+class NotATestTree(PersistentAVLTree):
+    _NodeType = NotATestNode
+
+class Test_PersistentAVLTree:
+    LOOPS = 100
+
+    # Checks ordering, heights, sizes and balance factors of every node
+    def _validate(self, node) -> int:
+        if node == None: return 0
+        left = self._validate(node._left)
+        right = self._validate(node._right)
+
+        if node._left: assert node._left._data < node._data
+        if node._right: assert node._right._data > node._data
+        assert abs(left - right) <= 1
+        assert node._height == max(left, right) + 1
+        assert node._size == 1 + (node._left._size if node._left else 0) + (node._right._size if node._right else 0)
+        return node._height
+
+    def _nodes(self, node) -> set:
+        stack, seen = [node] if node else [], set()
+        while stack:
+            node = stack.pop()
+            seen.add(id(node))
+            stack.extend(child for child in (node._left, node._right) if child)
+        return seen
+
+    def test_snapshots_are_stable(self):
+        tree = PersistentAVLTree()
+        reference = set()
+        versions = []
+
+        for i in range(Test_PersistentAVLTree.LOOPS * 10):
+            el = random.randint(0, 300)
+            if random.random() < 0.6:
+                assert tree.add(el) == (el not in reference)
+                reference.add(el)
+            else:
+                assert tree.remove(el) == (el in reference)
+                reference.discard(el)
+            if i % 50 == 0:
+                versions.append((tree.snapshot(), sorted(reference)))
+
+        assert tree.height() == self._validate(tree._root)
+        assert list(tree.traverse(TraversalType.InOrder)) == sorted(reference)
+        for snapshot, expected in versions:
+            assert len(snapshot) == len(expected)
+            assert snapshot.height() == self._validate(snapshot._root)
+            assert list(snapshot.traverse(TraversalType.InOrder)) == expected
+
+    def test_path_copying_shares_subtrees(self):
+        tree = PersistentAVLTree.from_sorted(range(1024))
+        before = tree.snapshot()
+
+        tree.add(2000)
+        # Only the nodes on one root to leaf path (plus rotations) are new
+        fresh = self._nodes(tree._root) - self._nodes(before._root)
+        assert len(fresh) <= 2 * tree.height()
+        assert len(before) == 1024
+        assert before.contains(2000) == False
+
+    def test_unchanged_operations_keep_root(self):
+        tree = PersistentAVLTree.from_sorted(range(10))
+        root = tree._root
+        assert tree.add(5) == False
+        assert tree.remove(42) == False
+        assert tree._root is root
+
+    def test_iterate_snapshot_while_writing(self):
+        tree = PersistentAVLTree.from_sorted(range(0, 1000, 2))
+        snapshot = tree.snapshot()
+
+        seen = []
+        for el in snapshot.traverse(TraversalType.InOrder):
+            seen.append(el)
+            # The writer keeps mutating while the reader iterates
+            tree.add(el + 1)
+            tree.remove(el)
+
+        assert seen == list(range(0, 1000, 2))
+        assert list(tree.traverse(TraversalType.InOrder)) == list(range(1, 1000, 2))
+
+    def test_splitJoinKeepSnapshots(self):
+        tree = PersistentAVLTree.from_iterable(random.sample(range(2000), 500))
+        data = list(tree.traverse(TraversalType.InOrder))
+        snapshot = tree.snapshot()
+
+        left, right = tree.split(1000)
+        assert list(left.traverse(TraversalType.InOrder)) == [el for el in data if el < 1000]
+        assert list(right.traverse(TraversalType.InOrder)) == [el for el in data if el >= 1000]
+
+        tree = PersistentAVLTree.join(left, right)
+        assert tree.height() == self._validate(tree._root)
+        assert list(tree.traverse(TraversalType.InOrder)) == data
+        # The nodes of the snapshot were shared, never modified
+        assert list(snapshot.traverse(TraversalType.InOrder)) == data
+        assert snapshot.height() == self._validate(snapshot._root)
+
+    def test_subclass_keeps_its_types(self):
+        tree = NotATestTree()
+        for el in random.sample(range(1000), 300):
+            tree.add(el)
+            # Every rotation and every copied path goes through _NodeType
+            if el % 3 == 0: tree.remove(el // 3)
+        left, right = tree.split(500)
+        tree = NotATestTree.join(left, right)
+
+        snapshot = tree.snapshot()
+        assert type(snapshot) is NotATestTree
+        assert tree.height() == self._validate(tree._root)
+        stack = [tree._root]
+        while stack:
+            node = stack.pop()
+            assert type(node) is NotATestNode
+            stack.extend(child for child in (node._left, node._right) if child)
@@ -0,0 +1,149 @@
+# Tests for LRUCache
+#
+#
+# Author: Alireza Ghey
+from algs_ds.datastructures.cache.lrucache import LRUCache
+import pytest
+import random
+
+class NotATestClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Test_LRUCache:
+    LOOPS = 2000
+
+    def test_illegal_creation(self):
+        with pytest.raises(ValueError):
+            LRUCache(max_entries=0)
+
+        with pytest.raises(ValueError):
+            LRUCache(max_bytes=-1)
+
+        with pytest.raises(ValueError):
+            LRUCache(default_ttl=0)
+
+    def test_get_put(self):
+        cache = LRUCache()
+        assert cache.put("a", 1) == None
+        assert cache.put("a", 2) == 1
+        assert cache.get("a") == 2
+        assert cache.get("b") == None
+        assert cache.get("b", -1) == -1
+        assert len(cache) == 1
+        assert cache.hits == 1
+        assert cache.misses == 2
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_entries=3)
+        for k in "abc":
+            cache.put(k, k)
+
+        # Touching 'a' makes 'b' the least recently used entry
+        cache.get("a")
+        cache.put("d", "d")
+
+        assert cache.contains("b") == False
+        assert list(cache.keys()) == ["d", "a", "c"]
+        assert cache.evictions == 1
+
+    def test_max_bytes(self):
+        cache = LRUCache(max_bytes=10, sizeof=len)
+        cache.put(1, "xxxx")
+        cache.put(2, "xxxx")
+        assert cache.nbytes() == 8
+
+        cache.put(3, "xxxx")
+        assert list(cache.keys()) == [3, 2]
+        assert cache.nbytes() == 8
+
+        # Replacing a value updates the accounted bytes
+        cache.put(3, "x")
+        assert cache.nbytes() == 5
+
+        # A value larger than the whole budget does not stay
+        cache.put(4, "x" * 11)
+        assert cache.isEmpty() == True
+        assert cache.nbytes() == 0
+
+    def test_ttl(self):
+        clock = NotATestClock()
+        cache = LRUCache(default_ttl=10, clock=clock)
+        cache.put("a", 1)
+        cache.put("b", 2, ttl=100)
+
+        clock.now = 9
+        assert cache.get("a") == 1
+
+        clock.now = 10
+        assert cache.get("a") == None
+        assert cache.get("b") == 2
+        assert cache.expirations == 1
+        assert len(cache) == 1
+
+        with pytest.raises(ValueError):
+            cache.put("c", 3, ttl=0)
+
+    def test_purge_expired(self):
+        clock = NotATestClock()
+        cache = LRUCache(clock=clock)
+        for i in range(10):
+            cache.put(i, i, ttl=i + 1)
+
+        clock.now = 5
+        assert list(cache.keys()) == [9, 8, 7, 6, 5]
+        assert cache.purge_expired() == 5
+        assert len(cache) == 5
+
+    def test_remove_and_clear(self):
+        cache = LRUCache()
+        cache.put(1, "a")
+        cache.put(2, "b")
+
+        assert cache.remove(1) == "a"
+        assert cache.remove(1) == None
+        assert list(cache.items()) == [(2, "b")]
+
+        cache.clear()
+        assert cache.isEmpty() == True
+        assert list(cache.items()) == []
+
+    def test_remove_expired(self):
+        clock = NotATestClock()
+        cache = LRUCache(clock=clock)
+        cache.put("a", 1, ttl=5)
+        cache.put("b", 2, ttl=50)
+
+        clock.now = 5
+        assert cache.remove("a") == None
+        assert cache.expirations == 1
+        assert cache.remove("b") == 2
+        assert cache.expirations == 1
+        assert cache.isEmpty() == True
+
+    def test_random_operations_against_reference(self):
+        max_entries = 20
+        cache = LRUCache(max_entries=max_entries)
+        # Reference: list of keys from most to least recently used
+        order, values = [], {}
+
+        for _ in range(Test_LRUCache.LOOPS):
+            k = random.randint(0, 40)
+            if random.random() < 0.5:
+                cache.put(k, k * 2)
+                if k in values: order.remove(k)
+                order.insert(0, k)
+                values[k] = k * 2
+                for evicted in order[max_entries:]:
+                    del values[evicted]
+                del order[max_entries:]
+            else:
+                assert cache.get(k) == values.get(k)
+                if k in values:
+                    order.remove(k)
+                    order.insert(0, k)
+            assert list(cache.keys()) == order
@@ -0,0 +1,133 @@
+# Tests for HashtableOpenAddressing
+#
+#
+# Author: Alireza Ghey
+from algs_ds.datastructures.hashtable.hashtable_openaddressing import HashtableOpenAddressing
+import pytest
+import random
+
+# Key type whose instances all land in the same probe cluster
+class NotATestCollidingKey:
+    def __init__(self, val: int):
+        self.val = val
+
+    def __hash__(self):
+        return 7
+
+    def __eq__(self, other):
+        return isinstance(other, NotATestCollidingKey) and self.val == other.val
+
+
+# Key type failing as soon as it is compared to None
+class NotATestNoneHatingKey:
+    def __hash__(self):
+        return 7
+
+    def __eq__(self, other):
+        assert other is not None
+        return self is other
+
+class Test_HashtableOpenAddressing:
+    LOOPS = 2000
+
+    def test_null_key(self):
+        hp = HashtableOpenAddressing()
+
+        with pytest.raises(ValueError):
+            hp.put(None, 12)
+
+        with pytest.raises(ValueError):
+            hp.remove(None)
+
+        # Same behaviour as HashtableSeparateChaining
+        with pytest.raises(ValueError):
+            hp.has_key(None)
+        assert hp.get(None) == None
+
+    def test_null_check_does_not_call_eq(self):
+        hp = HashtableOpenAddressing()
+        k = NotATestNoneHatingKey()
+        hp.put(k, 1)
+        assert hp.has_key(k) == True
+        assert hp.get(k) == 1
+        assert hp.remove(k) == 1
+
+    def test_illegal_creation(self):
+        with pytest.raises(ValueError):
+            HashtableOpenAddressing(-1)
+
+        with pytest.raises(ValueError):
+            HashtableOpenAddressing(10, -0.5)
+
+        with pytest.raises(ValueError):
+            HashtableOpenAddressing(10, 1)
+
+    def test_unhashable_key(self):
+        hp = HashtableOpenAddressing()
+
+        with pytest.raises(TypeError):
+            hp.put([1, 2], 3)
+
+    def test_insert_returns_old_value(self):
+        hp = HashtableOpenAddressing()
+
+        assert hp.insert("a", 1) == None
+        assert hp.insert("a", 2) == 1
+        assert hp.get("a") == 2
+        assert len(hp) == 1
+
+    def test_remove(self):
+        hp = HashtableOpenAddressing()
+        hp.add(1, "one")
+        hp.add(2, "two")
+
+        assert hp.remove(3) == None
+        assert hp.remove(1) == "one"
+        assert hp.has_key(1) == False
+        assert hp.get(2) == "two"
+        assert len(hp) == 1
+
+    def test_colliding_keys(self):
+        hp = HashtableOpenAddressing()
+        keys = [NotATestCollidingKey(i) for i in range(50)]
+        for i, k in enumerate(keys):
+            hp.put(k, i)
+
+        # Removing from the middle of a cluster must keep the rest reachable
+        for k in keys[::2]:
+            assert hp.remove(k) == k.val
+        for k in keys[1::2]:
+            assert hp.get(NotATestCollidingKey(k.val)) == k.val
+        for k in keys[::2]:
+            assert hp.has_key(k) == False
+        assert len(hp) == 25
+
+    def test_random_operations_against_dict(self):
+        hp = HashtableOpenAddressing()
+        expected = {}
+
+        for _ in range(Test_HashtableOpenAddressing.LOOPS):
+            k = random.randint(-200, 200)
+            if random.random() < 0.6:
+                v = random.random()
+                assert hp.put(k, v) == expected.get(k)
+                expected[k] = v
+            else:
+                assert hp.remove(k) == expected.pop(k, None)
+            assert len(hp) == len(expected)
+
+        for k in range(-200, 201):
+            assert hp.get(k) == expected.get(k)
+        assert sorted(hp.keys()) == sorted(expected.keys())
+        assert sorted(hp.items()) == sorted(expected.items())
+        assert sorted(hp.values()) == sorted(expected.values())
+
+    def test_clear(self):
+        hp = HashtableOpenAddressing()
+        for i in range(100):
+            hp.add(i, i)
+
+        hp.clear()
+        assert hp.isEmpty() == True
+        assert list(hp.keys()) == []
+        assert hp.get(5) == None
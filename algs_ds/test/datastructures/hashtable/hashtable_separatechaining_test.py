@@ -4,6 +4,47 @@
 # Author: Alireza Ghey
 from algs_ds.datastructures.hashtable.hashtable_separatechaining import HashtableSeparateChaining
 import pytest
+import random
+
+# Key type that counts how often its __eq__ runs
+class NotATestCountingKey:
+    eq_calls = 0
+
+    def __init__(self, val: int, h: int):
+        self.val = val
+        self.h = h
+
+    def __hash__(self):
+        return self.h
+
+    def __eq__(self, other):
+        NotATestCountingKey.eq_calls += 1
+        return isinstance(other, NotATestCountingKey) and self.val == other.val
+
+# Orderable key type with a constant hash
+class NotATestOrderedCollidingKey:
+    def __init__(self, val: int):
+        self.val = val
+
+    def __hash__(self):
+        return 42
+
+    def __eq__(self, other):
+        return isinstance(other, NotATestOrderedCollidingKey) and self.val == other.val
+
+    def __lt__(self, other):
+        if not isinstance(other, NotATestOrderedCollidingKey): return NotImplemented
+        return self.val < other.val
+
+# Hashable key type whose < is only a partial order (subset), with a constant hash
+class NotATestPartiallyOrderedKey(frozenset):
+    def __hash__(self):
+        return 42
+
+# Tuple with a constant hash, not totally ordered once it holds a NaN
+class NotATestCollidingTuple(tuple):
+    def __hash__(self):
+        return 42
 
 class Test_HashTableSeparateChaining:
 
@@ -84,3 +125,299 @@ class Test_HashTableSeparateChaining:
         assert hp.get(3) == -23
         assert len(hp) == 1
 
+
+    def test_remove(self):
+        hp = HashtableSeparateChaining()
+        for i in range(20):
+            hp.add(i, i * 10)
+
+        assert hp.remove(100) == None
+        for i in range(0, 20, 2):
+            assert hp.remove(i) == i * 10
+            assert hp.has_key(i) == False
+        assert len(hp) == 10
+        for i in range(1, 20, 2):
+            assert hp.get(i) == i * 10
+        # Removing from an emptied bucket
+        assert hp.remove(0) == None
+
+    def test_incremental_resize(self):
+        hp = HashtableSeparateChaining(incremental_resize=True, rehash_step=1)
+        expected = {}
+        saw_resizing = False
+
+        for i in range(2000):
+            hp.put(i, str(i))
+            expected[i] = str(i)
+            if hp.isResizing():
+                saw_resizing = True
+                assert hp.migrated_buckets <= hp.buckets_to_migrate
+                # Entries in either table stay visible while migrating
+                assert hp.get(i // 2) == str(i // 2)
+            if i % 3 == 0:
+                assert hp.remove(i // 3) == expected.pop(i // 3, None)
+            assert len(hp) == len(expected)
+
+        assert saw_resizing == True
+        assert sorted(hp.items()) == sorted(expected.items())
+        for k in range(2000):
+            assert hp.get(k) == expected.get(k)
+
+    def test_incremental_resize_finishes(self):
+        hp = HashtableSeparateChaining(incremental_resize=True, rehash_step=1)
+        n = 0
+        while not hp.isResizing() or n < 100:
+            hp.put(n, n)
+            n += 1
+
+        # Lookups alone drain the old table
+        while hp.isResizing():
+            hp.get(0)
+        assert hp.migrated_buckets == hp.buckets_to_migrate
+        assert sorted(hp.keys()) == list(range(n))
+
+    def test_iterating_while_resizing(self):
+        hp = HashtableSeparateChaining(incremental_resize=True, rehash_step=1)
+        n = 0
+        while not hp.isResizing() or n < 100:
+            hp.put(n, n)
+            n += 1
+
+        # Lookups and overwrites in the loop body must not yield entries twice
+        assert hp.isResizing() == True
+        seen = []
+        for k in hp.keys():
+            assert hp.get(k) == k
+            seen.append(k)
+        assert sorted(seen) == list(range(n))
+
+        while not hp.isResizing():
+            hp.put(n, n)
+            n += 1
+        seen = []
+        for k, v in hp.items():
+            hp.put(k, v + 1)
+            seen.append(k)
+        assert sorted(seen) == list(range(n))
+        assert all(hp.get(k) == k + 1 for k in range(n))
+
+    def test_illegal_rehash_step(self):
+        with pytest.raises(ValueError):
+            HashtableSeparateChaining(incremental_resize=True, rehash_step=0)
+
+    def test_from_items(self):
+        pairs = {i: i * i for i in range(1000)}
+
+        hp = HashtableSeparateChaining.from_items(pairs)
+        assert len(hp) == 1000
+        assert sorted(hp.items()) == sorted(pairs.items())
+        # Sized once, never doubled
+        assert hp.threshold >= 1000
+        assert hp.capacity < 2 * 1000
+
+        # Unsized iterables with duplicated keys, last value wins
+        hp = HashtableSeparateChaining.from_items(((i % 10, i) for i in range(100)), expected_size=10)
+        assert len(hp) == 10
+        for k in range(10):
+            assert hp.get(k) == 90 + k
+
+        with pytest.raises(ValueError):
+            HashtableSeparateChaining.from_items([(None, 1)])
+
+    def test_update(self):
+        hp = HashtableSeparateChaining()
+        hp.put(1, "a")
+        hp.update([(1, "b"), (2, "c")])
+        hp.update(iter([(3, "d")] * 3))
+        hp.update({4: "e"})
+
+        assert len(hp) == 4
+        assert sorted(hp.items()) == [(1, "b"), (2, "c"), (3, "d"), (4, "e")]
+
+    def test_reserve(self):
+        hp = HashtableSeparateChaining()
+        hp.reserve(500)
+        capacity = hp.capacity
+        assert hp.threshold >= 500
+
+        for i in range(500):
+            hp.put(i, i)
+        assert hp.capacity == capacity
+
+        # Never shrinks
+        hp.reserve(10)
+        assert hp.capacity == capacity
+        for i in range(500):
+            assert hp.get(i) == i
+
+        with pytest.raises(ValueError):
+            hp.reserve(-1)
+
+    def test_illegal_min_load_factor(self):
+        with pytest.raises(ValueError):
+            HashtableSeparateChaining(min_load_factor=-0.1)
+
+        with pytest.raises(ValueError):
+            HashtableSeparateChaining(max_load_factor=0.5, min_load_factor=0.25)
+
+    def test_shrink_on_remove(self):
+        for incremental in (False, True):
+            hp = HashtableSeparateChaining(min_load_factor=0.2, incremental_resize=incremental)
+            for i in range(10000):
+                hp.put(i, i)
+            peak = hp.capacity
+
+            for i in range(9990):
+                assert hp.remove(i) == i
+            assert hp.capacity < peak // 100
+            assert sorted(hp.items()) == [(i, i) for i in range(9990, 10000)]
+
+    def test_no_shrink_by_default(self):
+        hp = HashtableSeparateChaining()
+        for i in range(1000):
+            hp.put(i, i)
+        peak = hp.capacity
+        for i in range(1000):
+            hp.remove(i)
+        assert hp.capacity == peak
+
+    def test_compact(self):
+        hp = HashtableSeparateChaining()
+        for i in range(1000):
+            hp.put(i, i)
+        for i in range(990):
+            hp.remove(i)
+
+        hp.compact()
+        assert hp.capacity == hp._capacity_for(10)
+        assert sorted(hp.keys()) == list(range(990, 1000))
+
+    def test_clear(self):
+        hp = HashtableSeparateChaining()
+        for i in range(100):
+            hp.put(i, i)
+
+        hp.clear()
+        assert hp.isEmpty() == True
+        assert list(hp.items()) == []
+        assert all(bucket == None for bucket in hp.table)
+
+    def test_hash_compared_before_key(self):
+        # Distinct hashes which all land in bucket 0
+        hp = HashtableSeparateChaining(100)
+        for i in range(3):
+            hp.put(NotATestCountingKey(i, i * 100), i)
+
+        NotATestCountingKey.eq_calls = 0
+        assert hp.get(NotATestCountingKey(2, 200)) == 2
+        assert hp.remove(NotATestCountingKey(1, 100)) == 1
+        assert NotATestCountingKey.eq_calls == 2
+
+    def test_get_many(self):
+        hp = HashtableSeparateChaining()
+        for i in range(100):
+            hp.put(i, str(i))
+
+        assert hp.get_many([1, 50, 200, None]) == ["1", "50", None, None]
+        assert hp.contains_many([1, 50, 200]) == [True, True, False]
+        # Like has_key, a null key is an error
+        with pytest.raises(ValueError):
+            hp.contains_many([1, None])
+
+    def test_put_many(self):
+        for incremental in (False, True):
+            hp = HashtableSeparateChaining(incremental_resize=incremental)
+            hp.put(1, "a")
+
+            assert hp.put_many([(1, "b"), (2, "c"), (2, "d")]) == ["a", None, "c"]
+            assert hp.put_many({i: i for i in range(1000)})[:3] == [None, "b", "d"]
+            assert len(hp) == 1000
+            assert hp.get_many(range(1000)) == list(range(1000))
+            assert hp.contains_many(range(998, 1002)) == [True, True, False, False]
+
+            with pytest.raises(ValueError):
+                hp.put_many([(None, 1)])
+
+    def _check_colliding_keys(self, hp: HashtableSeparateChaining, keys):
+        for i, k in enumerate(keys):
+            hp.put(k, i)
+        assert hp.tree_bucket_count() == 1
+        assert hp.max_chain_length() == len(keys)
+
+        for i, k in enumerate(keys):
+            assert hp.get(k) == i
+            assert hp.put(k, -i) == i
+        for i, k in enumerate(keys[:-5]):
+            assert hp.remove(k) == -i
+            assert hp.has_key(k) == False
+
+        # Small buckets turn back into lists
+        assert hp.tree_bucket_count() == 0
+        assert hp.max_chain_length() == 5
+        for i, k in enumerate(keys[-5:], len(keys) - 5):
+            assert hp.get(k) == -i
+
+    def test_treeified_bucket_distinct_hashes(self):
+        # Hashes are multiples of the capacity, so all share bucket 0
+        hp = HashtableSeparateChaining(10000)
+        keys = [i * 10000 for i in range(100)]
+        random.shuffle(keys)
+        self._check_colliding_keys(hp, keys)
+
+    def test_treeified_bucket_equal_hashes(self):
+        hp = HashtableSeparateChaining(10000)
+        keys = [NotATestOrderedCollidingKey(i) for i in range(100)]
+        random.shuffle(keys)
+        self._check_colliding_keys(hp, keys)
+
+    def test_treeified_bucket_unorderable_keys(self):
+        hp = HashtableSeparateChaining(10000)
+        keys = [NotATestCountingKey(i, 42) for i in range(50)] + [NotATestOrderedCollidingKey(i) for i in range(50)]
+        random.shuffle(keys)
+        self._check_colliding_keys(hp, keys)
+
+    def test_treeified_bucket_partially_ordered_keys(self):
+        hp = HashtableSeparateChaining(10000)
+        keys = [NotATestPartiallyOrderedKey({i, i + 100}) for i in range(25)]
+        random.shuffle(keys)
+        for k in keys:
+            hp.put(k, 0)
+        self._check_colliding_keys(hp, keys)
+        assert len(hp) == 5
+
+        # NaN breaks the total order of floats and tuples
+        hp = HashtableSeparateChaining(10000)
+        nan = float("nan")
+        keys = [NotATestCollidingTuple((nan, i)) for i in range(25)] + [NotATestCollidingTuple((i, nan)) for i in range(25)]
+        random.shuffle(keys)
+        for k in keys:
+            hp.put(k, 0)
+        assert hp.tree_bucket_count() == 1
+        assert len(hp) == 50
+        for i, k in enumerate(keys):
+            assert hp.put(k, i) == 0
+            assert hp.get(k) == i
+        for k in keys:
+            assert hp.remove(k) != None
+        assert hp.isEmpty() == True
+
+    def test_treeified_bucket_survives_resize(self):
+        hp = HashtableSeparateChaining(incremental_resize=True)
+        keys = [NotATestOrderedCollidingKey(i) for i in range(200)]
+        for i, k in enumerate(keys):
+            hp.put(k, i)
+            hp.put(i, i)
+
+        for i, k in enumerate(keys):
+            assert hp.get(k) == i
+            assert hp.get(i) == i
+        assert hp.max_chain_length() >= 200
+
+    def test_get_or_insert(self):
+        hp = HashtableSeparateChaining()
+        assert hp.get_or_insert(1, "a") == "a"
+        assert hp.get_or_insert(1, "b") == "a"
+        assert len(hp) == 1
+
+        with pytest.raises(ValueError):
+            hp.get_or_insert(None, 1)
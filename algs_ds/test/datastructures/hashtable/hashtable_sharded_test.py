@@ -0,0 +1,75 @@
+# Tests for ShardedHashtable
+#
+#
+# Author: Alireza Ghey
+from algs_ds.datastructures.hashtable.hashtable_sharded import ShardedHashtable
+import pytest
+import threading
+
+class Test_ShardedHashtable:
+    THREADS = 8
+    KEYS_PER_THREAD = 2000
+
+    def test_illegal_creation(self):
+        with pytest.raises(ValueError):
+            ShardedHashtable(0)
+
+        with pytest.raises(ValueError):
+            ShardedHashtable(4, -1)
+
+    def test_basic_operations(self):
+        hp = ShardedHashtable(4)
+        assert hp.isEmpty() == True
+
+        assert hp.put(1, "a") == None
+        assert hp.put(1, "b") == "a"
+        assert hp.get(1) == "b"
+        assert hp.has_key(1) == True
+        assert hp.get(2) == None
+        assert hp.remove(1) == "b"
+        assert hp.remove(1) == None
+        assert len(hp) == 0
+
+        with pytest.raises(ValueError):
+            hp.put(None, 1)
+
+    def test_keys_spread_over_shards(self):
+        hp = ShardedHashtable(8)
+        for i in range(8000):
+            hp.put(i, i)
+
+        assert all(len(shard) > 500 for shard in hp._shards)
+        assert sorted(hp.items()) == [(i, i) for i in range(8000)]
+
+    def test_get_or_insert(self):
+        hp = ShardedHashtable(incremental_resize=True)
+        assert hp.get_or_insert("a", 1) == 1
+        assert hp.get_or_insert("a", 2) == 1
+        for i in range(1000):
+            assert hp.get_or_insert(i, i) == i
+        assert len(hp) == 1001
+
+    def test_concurrent_writers(self):
+        hp = ShardedHashtable()
+        winners = []
+
+        def work(t: int):
+            for i in range(Test_ShardedHashtable.KEYS_PER_THREAD):
+                hp.put((t, i), i)
+                # Every thread races for the same shared keys
+                if hp.get_or_insert(("shared", i), t) == t:
+                    winners.append(i)
+            for i in range(0, Test_ShardedHashtable.KEYS_PER_THREAD, 2):
+                assert hp.remove((t, i)) == i
+
+        threads = [threading.Thread(target=work, args=(t,)) for t in range(Test_ShardedHashtable.THREADS)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+
+        n = Test_ShardedHashtable.KEYS_PER_THREAD
+        assert len(hp) == Test_ShardedHashtable.THREADS * n // 2 + n
+        # Exactly one thread inserted each shared key
+        assert sorted(winners) == list(range(n))
+        for t in range(Test_ShardedHashtable.THREADS):
+            for i in range(1, n, 2):
+                assert hp.get((t, i)) == i
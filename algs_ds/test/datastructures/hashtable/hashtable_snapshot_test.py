@@ -0,0 +1,104 @@
+# Tests for hashtable snapshots
+#
+#
+# Author: Alireza Ghey
+from algs_ds.datastructures.hashtable.hashtable_separatechaining import HashtableSeparateChaining
+from algs_ds.datastructures.hashtable.hashtable_snapshot import MappedHashtable
+import pytest
+
+class Test_HashtableSnapshot:
+
+    def _table(self) -> HashtableSeparateChaining:
+        hp = HashtableSeparateChaining()
+        for i in range(-500, 500):
+            hp.put(i, str(i))
+        hp.put("key", b"\x00bytes")
+        hp.put(b"raw", 1.5)
+        hp.put(2.5, None)
+        hp.put(2 ** 100, True)
+        hp.put("ünïcode", False)
+        return hp
+
+    def test_mapped_roundtrip(self, tmp_path):
+        hp = self._table()
+        path = str(tmp_path / "table.snap")
+        hp.save(path)
+
+        with HashtableSeparateChaining.load(path) as mapped:
+            assert isinstance(mapped, MappedHashtable)
+            assert len(mapped) == len(hp)
+            for k, v in hp.items():
+                assert mapped.has_key(k) == True
+                assert mapped.get(k) == v
+            assert sorted(map(repr, mapped.items())) == sorted(map(repr, hp.items()))
+
+            # Misses, including keys of types a snapshot cannot hold
+            assert mapped.get(1000) == None
+            assert mapped.has_key("missing") == False
+            assert mapped.has_key((1, 2)) == False
+
+            # Null and unhashable keys behave like in the live hashtable
+            assert mapped.get(None) == hp.get(None) == None
+            for table in (mapped, hp):
+                with pytest.raises(ValueError):
+                    table.has_key(None)
+                with pytest.raises(TypeError):
+                    table.has_key([1])
+                with pytest.raises(TypeError):
+                    table.get({})
+
+            # Equal keys of different types find the same record
+            assert mapped.get(1.0) == "1"
+            assert mapped.get(True) == "1"
+
+    def test_load_into_memory(self, tmp_path):
+        hp = self._table()
+        path = str(tmp_path / "table.snap")
+        hp.save(path)
+
+        loaded = HashtableSeparateChaining.load(path, mmap=False)
+        assert isinstance(loaded, HashtableSeparateChaining)
+        assert sorted(map(repr, loaded.items())) == sorted(map(repr, hp.items()))
+
+    def test_empty_table(self, tmp_path):
+        path = str(tmp_path / "empty.snap")
+        HashtableSeparateChaining().save(path)
+
+        with HashtableSeparateChaining.load(path) as mapped:
+            assert mapped.isEmpty() == True
+            assert mapped.get(1) == None
+            assert list(mapped.items()) == []
+
+    def test_unsupported_type(self, tmp_path):
+        hp = HashtableSeparateChaining()
+        hp.put((1, 2), 3)
+
+        with pytest.raises(TypeError):
+            hp.save(str(tmp_path / "bad.snap"))
+
+    def test_not_a_snapshot(self, tmp_path):
+        path = tmp_path / "garbage"
+        path.write_bytes(b"x" * 64)
+
+        with pytest.raises(ValueError):
+            MappedHashtable(str(path))
+
+    def test_short_or_corrupt_files(self, tmp_path):
+        path = tmp_path / "table.snap"
+        self._table().save(str(path))
+        data = path.read_bytes()
+
+        # Empty, shorter than the header, cut inside the index or the records
+        for cut in (0, 10, 40, len(data) - 3):
+            path.write_bytes(data[:cut])
+            with pytest.raises(ValueError):
+                MappedHashtable(str(path))
+
+        # A bucket offset pointing past the end of the file
+        corrupt = bytearray(data)
+        corrupt[32:40] = (len(data) + 100).to_bytes(8, "little")
+        path.write_bytes(bytes(corrupt))
+        with MappedHashtable(str(path)) as mapped:
+            with pytest.raises(ValueError):
+                for i in range(-500, 500):
+                    mapped.get(i)
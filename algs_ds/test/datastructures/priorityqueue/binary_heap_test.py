@@ -0,0 +1,233 @@
+# Tests for BinaryHeap
+#
+#
+# Author: Alireza Ghey
+from algs_ds.datastructures.priorityqueue.binary_heap import BinaryHeap, nsmallest, nlargest
+import pytest
+import random
+import heapq
+
+class Test_BinaryHeap:
+    LOOPS = 200
+
+    def _drain(self, heap: BinaryHeap) -> list:
+        assert heap._isMinHeap(0) == True
+        res = []
+        while not heap.isEmpty():
+            res.append(heap.poll())
+        return res
+
+    def test_empty(self):
+        heap = BinaryHeap()
+        assert heap.isEmpty() == True
+        assert heap.peek() == None
+        assert heap.poll() == None
+        assert heap.contains(1) == False
+        assert heap.remove(1) == False
+
+        with pytest.raises(ValueError):
+            heap.add(None)
+        with pytest.raises(ValueError):
+            heap.push(None, "item")
+
+    def test_heapify(self):
+        for i in range(Test_BinaryHeap.LOOPS):
+            arr = [random.randint(0, 50) for _ in range(i)]
+            heap = BinaryHeap(list(arr))
+            assert len(heap) == i
+            assert heap._isMinHeap(0) == True
+            assert self._drain(heap) == sorted(arr)
+
+    def test_add_poll(self):
+        for i in range(Test_BinaryHeap.LOOPS):
+            arr = [random.randint(0, 50) for _ in range(i)]
+            heap = BinaryHeap()
+            for el in arr:
+                heap.add(el)
+            assert heap.peek() == (min(arr) if arr else None)
+            assert self._drain(heap) == sorted(arr)
+
+    def test_key_and_reverse(self):
+        words = ["pear", "fig", "banana", "kiwi", "apple", "plum", "date"]
+
+        heap = BinaryHeap(list(words), key=len)
+        # Equal keys come out in insertion order
+        assert self._drain(heap) == sorted(words, key=len)
+
+        heap = BinaryHeap(key=len, reverse=True)
+        for word in words:
+            heap.add(word)
+        assert self._drain(heap) == sorted(words, key=len, reverse=True)
+
+        heap = BinaryHeap(list(words), reverse=True)
+        assert self._drain(heap) == sorted(words, reverse=True)
+
+    def test_push_is_stable(self):
+        for reverse in (False, True):
+            heap = BinaryHeap(reverse=reverse)
+            items = [(random.randint(0, 5), i) for i in range(300)]
+            for prio, i in items:
+                # Items that do not support comparisons are fine
+                heap.push(prio, {"id": i})
+
+            expected = sorted(items, key=lambda item: item[0], reverse=reverse)
+            assert [item["id"] for item in self._drain(heap)] == [i for _, i in expected]
+
+    def test_plain_heap_switches_to_priorities(self):
+        # Without key, reverse or push the elements are compared directly
+        heap = BinaryHeap([random.randint(0, 50) for _ in range(200)])
+        assert heap._prio is heap._heap
+        plain = [heap._heap[i] for i in range(len(heap))]
+        heap.pushpop(10)
+        heap.merge(BinaryHeap([7, 3]))
+        assert heap._prio is heap._heap
+
+        # The first explicit priority switches to a priority array
+        for i in range(100):
+            heap.push(i % 50, str(i))
+        assert heap._prio is not heap._heap
+        assert heap._isMinHeap(0)
+        heap.add(25)
+
+        drained = self._drain(heap)
+        prio = lambda item: int(item) % 50 if isinstance(item, str) else item
+        assert [prio(item) for item in drained] == sorted(prio(item) for item in drained)
+        # Pushed items with equal priorities still come out in the order they came
+        pushed = [item for item in drained if isinstance(item, str)]
+        assert pushed == sorted(pushed, key=lambda item: (int(item) % 50, int(item)))
+        assert len(drained) == len(plain) + 3 + 100
+
+    def test_remove_contains(self):
+        for i in range(1, Test_BinaryHeap.LOOPS):
+            arr = list(range(i))
+            random.shuffle(arr)
+            heap = BinaryHeap(list(arr), reverse=bool(i % 2))
+
+            removed = random.sample(arr, i // 2)
+            for el in removed:
+                assert heap.contains(el) == True
+                assert heap.remove(el) == True
+                assert heap.contains(el) == False
+                assert heap._isMinHeap(0) == True
+
+            rest = sorted(set(arr) - set(removed), reverse=bool(i % 2))
+            assert self._drain(heap) == rest
+
+    def test_clear(self):
+        heap = BinaryHeap([3, 1, 2])
+        heap.clear()
+        assert heap.isEmpty() == True
+        heap.add(5)
+        heap.add(4)
+        assert self._drain(heap) == [4, 5]
+
+    def test_arity(self):
+        with pytest.raises(ValueError):
+            BinaryHeap(arity=1)
+
+        for arity in (2, 3, 4, 8):
+            for i in range(0, Test_BinaryHeap.LOOPS, 7):
+                arr = [random.randint(0, 50) for _ in range(i)]
+                heap = BinaryHeap(list(arr), arity=arity)
+                assert heap._isMinHeap(0) == True
+
+                extra = [random.randint(0, 50) for _ in range(i)]
+                for el in extra:
+                    heap.add(el)
+                for el in random.sample(arr, i // 3):
+                    assert heap.remove(el) == True
+                    arr.remove(el)
+                assert self._drain(heap) == sorted(arr + extra)
+
+            heap = BinaryHeap(key=len, reverse=True, arity=arity)
+            for word in ["fig", "pear", "kiwi", "banana", "date"]:
+                heap.add(word)
+            assert self._drain(heap) == ["banana", "pear", "kiwi", "date", "fig"]
+
+    def test_pushpop_replace(self):
+        for arity in (2, 4):
+            arr = [random.randint(0, 100) for _ in range(50)]
+            heap = BinaryHeap(list(arr), arity=arity)
+            reference = list(arr)
+            heapq.heapify(reference)
+
+            for _ in range(Test_BinaryHeap.LOOPS):
+                el = random.randint(0, 100)
+                assert heap.pushpop(el) == heapq.heappushpop(reference, el)
+                el = random.randint(0, 100)
+                assert heap.replace(el) == heapq.heapreplace(reference, el)
+                assert heap._isMinHeap(0) == True
+            assert self._drain(heap) == sorted(reference)
+
+        heap = BinaryHeap(reverse=True)
+        assert heap.pushpop(3) == 3
+        assert heap.isEmpty() == True
+        assert heap.replace(3) == None
+        assert heap.replace(5) == 3
+        assert heap.pushpop(4) == 5
+        assert heap.peek() == 4
+
+    def test_push_many(self):
+        for i in range(Test_BinaryHeap.LOOPS):
+            # Both small batches (bubbled up) and large ones (re-heapified)
+            arr = [random.randint(0, 50) for _ in range(i)]
+            extra = [random.randint(0, 50) for _ in range(random.choice([1, 3, 2 * i + 1]))]
+            heap = BinaryHeap(list(arr), arity=random.choice([2, 3]))
+            if arr: heap.poll()
+            heap.push_many(iter(extra))
+            assert len(heap) == len(arr) - (1 if arr else 0) + len(extra)
+            expected = sorted(arr)[1:] + extra
+            assert self._drain(heap) == sorted(expected)
+
+        heap = BinaryHeap(key=len)
+        heap.push_many(["bb", "a", "cc", "d"])
+        # Ties stay first in, first out
+        assert self._drain(heap) == ["a", "d", "bb", "cc"]
+        with pytest.raises(ValueError):
+            heap.push_many(["e", None])
+
+    def test_merge(self):
+        a = BinaryHeap([5, 1, 3])
+        b = BinaryHeap(key=lambda x: -x)
+        b.push(2, "two")
+        b.push(4, "four")
+        b.push(0, "zero")
+        a.merge(b)
+
+        # Items keep the priorities they had in b
+        assert len(b) == 3
+        assert self._drain(a) == ["zero", 1, "two", 3, "four", 5]
+
+    def test_merge_keeps_fifo_ties(self):
+        for reverse in (False, True):
+            for size in (3, 300):
+                # Both the bubbling and the heapifying path
+                other = BinaryHeap(reverse=reverse)
+                for i in range(size):
+                    other.push(i % 3, i)
+                heap = BinaryHeap(reverse=reverse)
+                heap.push(1, -1)
+                heap.merge(other)
+
+                # Items added to heap before the merge come first among ties
+                expected = sorted([-1] + list(range(size)), key=lambda i: 1 if i < 0 else i % 3, reverse=reverse)
+                assert self._drain(heap) == expected
+
+        first = lambda pair: pair[0]
+        heap, other = BinaryHeap(key=first), BinaryHeap(key=first)
+        other.add((1, 101))
+        other.add((1, 102))
+        other.add((0, 103))
+        heap.merge(other)
+        assert [heap.poll() for _ in range(3)] == [(0, 103), (1, 101), (1, 102)]
+
+    def test_nsmallest_nlargest(self):
+        for i in range(Test_BinaryHeap.LOOPS):
+            arr = [(random.randint(0, 20), j) for j in range(i)]
+            k = random.randint(-1, i + 2)
+            first = lambda pair: pair[0]
+
+            assert nsmallest(k, iter(arr), key=first) == sorted(arr, key=first)[:max(k, 0)]
+            assert nlargest(k, iter(arr), key=first) == sorted(arr, key=first, reverse=True)[:max(k, 0)]
+            assert nsmallest(k, [x for x, _ in arr]) == heapq.nsmallest(k, [x for x, _ in arr])
+            assert nlargest(k, [x for x, _ in arr]) == heapq.nlargest(k, [x for x, _ in arr])
@@ -0,0 +1,118 @@
+# Tests for IndexedBinaryHeap
+#
+#
+# Author: Alireza Ghey
+from algs_ds.datastructures.priorityqueue.indexed_binary_heap import IndexedBinaryHeap
+import pytest
+import random
+import heapq
+
+class Test_IndexedBinaryHeap:
+    LOOPS = 2000
+
+    def test_empty(self):
+        heap = IndexedBinaryHeap()
+        assert heap.isEmpty() == True
+        assert len(heap) == 0
+        assert heap.peek() == None
+        assert heap.poll() == None
+        assert heap.remove("A") == False
+        assert heap.contains("A") == False
+        assert heap.priority("A") == None
+
+    def test_illegal_arguments(self):
+        heap = IndexedBinaryHeap()
+        heap.add("A", 5)
+
+        with pytest.raises(ValueError):
+            heap.add("A", 1)
+        with pytest.raises(ValueError):
+            heap.add(None, 1)
+        with pytest.raises(ValueError):
+            heap.add("B", None)
+        with pytest.raises(ValueError):
+            heap.decrease_key("B", 1)
+        with pytest.raises(ValueError):
+            heap.decrease_key("A", 6)
+        with pytest.raises(ValueError):
+            heap.increase_key("A", 4)
+        with pytest.raises(ValueError):
+            heap.update("A", None)
+        assert heap.peek() == ("A", 5)
+
+    def test_poll_order(self):
+        heap = IndexedBinaryHeap()
+        prios = list(range(500))
+        random.shuffle(prios)
+        for key, prio in enumerate(prios):
+            heap.add(key, prio)
+        assert heap._isMinHeap() == True
+
+        polled = [heap.poll() for _ in range(len(prios))]
+        assert [prio for _, prio in polled] == list(range(500))
+        assert all(prios[key] == prio for key, prio in polled)
+        assert heap.isEmpty() == True
+
+    def test_random_operations(self):
+        heap = IndexedBinaryHeap()
+        reference = {}
+
+        for _ in range(Test_IndexedBinaryHeap.LOOPS):
+            key = random.randint(0, 100)
+            prio = random.randint(0, 1000)
+            op = random.random()
+
+            if op < 0.3:
+                if key in reference:
+                    with pytest.raises(ValueError): heap.add(key, prio)
+                else:
+                    heap.add(key, prio)
+                    reference[key] = prio
+            elif op < 0.45:
+                assert heap.remove(key) == (key in reference)
+                reference.pop(key, None)
+            elif op < 0.6 and key in reference:
+                prio = min(prio, reference[key])
+                heap.decrease_key(key, prio)
+                reference[key] = prio
+            elif op < 0.75 and key in reference:
+                prio = max(prio, reference[key])
+                heap.increase_key(key, prio)
+                reference[key] = prio
+            elif op < 0.9:
+                heap.update(key, prio)
+                reference[key] = prio
+            elif reference:
+                key, prio = heap.poll()
+                assert prio == min(reference.values())
+                assert reference.pop(key) == prio
+
+            assert len(heap) == len(reference)
+            assert heap.contains(key) == (key in reference)
+            assert heap.priority(key) == reference.get(key)
+            assert heap._isMinHeap() == True
+
+    def test_dijkstra(self):
+        n = 200
+        graph = {u: [(random.randrange(n), random.randint(1, 50)) for _ in range(5)] for u in range(n)}
+
+        # Reference with lazy deletion on heapq
+        expected, pq = {}, [(0, 0)]
+        while pq:
+            d, u = heapq.heappop(pq)
+            if u in expected: continue
+            expected[u] = d
+            for v, w in graph[u]:
+                if v not in expected: heapq.heappush(pq, (d + w, v))
+
+        dist, heap = {}, IndexedBinaryHeap()
+        heap.add(0, 0)
+        while not heap.isEmpty():
+            u, d = heap.poll()
+            dist[u] = d
+            for v, w in graph[u]:
+                if v in dist: continue
+                if not heap.contains(v): heap.add(v, d + w)
+                elif d + w < heap.priority(v): heap.decrease_key(v, d + w)
+
+        assert dist == expected
@@ -0,0 +1,153 @@
+# Tests for NumericHeap
+#
+#
+# Author: Alireza Ghey
+from algs_ds.datastructures.priorityqueue.numeric_heap import NumericHeap
+from array import array
+import pytest
+import random
+
+class Test_NumericHeap:
+    LOOPS = 300
+
+    def _drain(self, heap: NumericHeap) -> list:
+        assert heap._isMinHeap() == True
+        res = []
+        while not heap.isEmpty():
+            res.append(heap.poll())
+        return res
+
+    def test_illegal_arguments(self):
+        with pytest.raises(ValueError):
+            NumericHeap(typecode="u")
+        with pytest.raises(ValueError):
+            NumericHeap(payloads=[1])
+
+        heap = NumericHeap()
+        with pytest.raises(ValueError):
+            heap.push(1.0, 3)
+        with pytest.raises(ValueError):
+            heap.pop_many(-1)
+
+        heap = NumericHeap(with_payloads=True)
+        with pytest.raises(ValueError):
+            heap.push(1.0)
+        with pytest.raises(ValueError):
+            heap.push_many([1.0, 2.0], [1])
+        assert heap.isEmpty() == True
+
+    def test_empty(self):
+        heap = NumericHeap()
+        assert heap.peek() == None
+        assert heap.poll() == None
+        assert list(heap.pop_many(5)) == []
+
+    def test_push_poll(self):
+        for typecode in ("d", "q", "f"):
+            heap = NumericHeap(typecode=typecode)
+            data = [random.randint(-1000, 1000) for _ in range(Test_NumericHeap.LOOPS)]
+            for el in data:
+                heap.push(el)
+                assert heap.peek() == min(data[:len(heap)])
+            assert self._drain(heap) == sorted(data)
+
+    def test_bulk_heapify(self):
+        data = [random.random() for _ in range(10000)]
+        heap = NumericHeap(array("d", data))
+        assert len(heap) == 10000
+        assert self._drain(heap) == sorted(data)
+
+    def test_push_many(self):
+        for i in range(1, Test_NumericHeap.LOOPS, 7):
+            heap = NumericHeap([random.randint(0, 100) for _ in range(i)], typecode="i")
+            expected = list(heap._prio)
+            for size in (1, i // 20, 3 * i):
+                # Both sifted and sorted batches
+                batch = [random.randint(0, 100) for _ in range(size)]
+                heap.push_many(iter(batch))
+                expected.extend(batch)
+                assert heap._isMinHeap() == True
+            assert self._drain(heap) == sorted(expected)
+
+    def test_pop_many(self):
+        for i in range(Test_NumericHeap.LOOPS):
+            data = [random.random() for _ in range(i)]
+            heap = NumericHeap(data)
+            k = random.choice([1, i // 20, i // 2, i + 3])
+
+            # Both the sifting and the sorting path
+            assert list(heap.pop_many(k)) == sorted(data)[:k]
+            assert len(heap) == max(i - k, 0)
+            assert self._drain(heap) == sorted(data)[k:]
+
+    def test_payloads(self):
+        deadlines = [random.randint(0, 50) for _ in range(2000)]
+        heap = NumericHeap(deadlines[:1000], range(1000), typecode="q")
+        heap.push_many(deadlines[1000:1010], range(1000, 1010))
+        for i in range(1010, 2000):
+            heap.push(deadlines[i], i)
+        assert heap.peek()[0] == min(deadlines)
+
+        values, payloads = heap.pop_many(10)
+        assert list(values) == sorted(deadlines)[:10]
+        values, payloads = heap.pop_many(1500)
+        assert list(values) == sorted(deadlines)[10:1510]
+        # Payloads travel with their values
+        assert all(deadlines[p] == v for v, p in zip(values, payloads))
+
+        rest = self._drain(heap)
+        assert [v for v, _ in rest] == sorted(deadlines)[1510:]
+        assert all(deadlines[p] == v for v, p in rest)
+
+    def test_bad_input_changes_nothing(self):
+        heap = NumericHeap([3.0, 1.0, 2.0], [3, 1, 2])
+        with pytest.raises(TypeError):
+            heap.push(0.5, 2.5)
+        with pytest.raises(TypeError):
+            heap.push("x", 4)
+        with pytest.raises(TypeError):
+            heap.push_many([0.1, 0.2], [1, "x"])
+        with pytest.raises(TypeError):
+            heap.push_many([0.1, "x"], [4, 5])
+        assert len(heap._prio) == len(heap._payloads) == 3
+        assert self._drain(heap) == [(1.0, 1), (2.0, 2), (3.0, 3)]
+
+        heap = NumericHeap([5, 6, 7], typecode="b")
+        for bad in ([1, 2, "x"], [1, 2, 1000], iter([0, None])):
+            with pytest.raises((TypeError, OverflowError)):
+                heap.push_many(bad)
+        assert self._drain(heap) == [5, 6, 7]
+
+    def test_values_the_typecode_cannot_hold(self):
+        heap = NumericHeap([1, 2], typecode="q")
+        for bad in ([0.5], array("d", [1.5]), array("d", [1.0])):
+            with pytest.raises(TypeError):
+                heap.push_many(bad)
+        heap = NumericHeap([1, 2], typecode="b")
+        for bad in ([-129], array("q", [1, 1000]), array("B", [200])):
+            with pytest.raises(OverflowError):
+                heap.push_many(bad)
+        # Narrower arrays that fit are converted
+        heap.push_many(array("q", [-128, 127]))
+        assert self._drain(heap) == [-128, 1, 2, 127]
+
+    def test_numpy(self):
+        np = pytest.importorskip("numpy")
+        data = np.random.random(5000)
+        heap = NumericHeap(data, np.arange(5000))
+        heap.push_many(np.array([-1.0, 2.0]), np.array([5000, 5001]))
+
+        values, payloads = heap.pop_many(100)
+        assert isinstance(values, np.ndarray)
+        assert values[0] == -1.0 and payloads[0] == 5000
+        assert np.all(values[1:] == np.sort(data)[:99])
+
+        # Same contract as array.array, no silent truncating or wrapping
+        heap = NumericHeap(typecode="q")
+        with pytest.raises(TypeError):
+            heap.push_many(np.array([1.5, 2.0]))
+        heap = NumericHeap(typecode="b")
+        with pytest.raises(OverflowError):
+            heap.push_many(np.array([1, 1000]))
+        heap.push_many(np.array([-128, 127], dtype=np.int64))
+        assert self._drain(heap) == [-128, 127]
@@ -0,0 +1,120 @@
+# Tests for SortedListSet
+#
+#
+# Author: Alireza Ghey
+from algs_ds.datastructures.sortedlist.sortedlistset import SortedListSet
+from algs_ds.datastructures.binarysearchtree.binarysearchtree import BinarySearchTree, TraversalType
+import pytest
+import random
+
+class Test_SortedListSet:
+    LOOPS = 3000
+
+    # Checks the leaf invariants
+    def _validate(self, s: SortedListSet) -> None:
+        flat = [el for leaf in s._lists for el in leaf]
+        assert flat == sorted(set(flat))
+        assert len(flat) == len(s)
+        assert s._maxes == [leaf[-1] for leaf in s._lists]
+        assert all(0 < len(leaf) <= 2 * s._load for leaf in s._lists)
+
+    def test_illegal_creation(self):
+        with pytest.raises(ValueError):
+            SortedListSet(1)
+
+    def test_empty(self):
+        s = SortedListSet()
+        assert s.isEmpty() == True
+        assert s.height() == 0
+        assert s.contains(1) == False
+        assert s.remove(1) == False
+        assert s.min() == None
+        assert s.max() == None
+        assert s.floor(1) == None
+        assert s.ceiling(1) == None
+        assert list(s.irange()) == []
+
+    def test_random_operations_against_set(self):
+        # A tiny load exercises splits and merges
+        s = SortedListSet(4)
+        reference = set()
+
+        for _ in range(Test_SortedListSet.LOOPS):
+            el = random.randint(0, 300)
+            if random.random() < 0.6:
+                assert s.add(el) == (el not in reference)
+                reference.add(el)
+            else:
+                assert s.remove(el) == (el in reference)
+                reference.discard(el)
+            assert s.contains(el) == (el in reference)
+        self._validate(s)
+
+        ordered = sorted(reference)
+        assert list(s.traverse(TraversalType.InOrder)) == ordered
+        assert s.min() == ordered[0]
+        assert s.max() == ordered[-1]
+        for probe in range(-2, 303):
+            below = [e for e in ordered if e <= probe]
+            above = [e for e in ordered if e >= probe]
+            assert s.floor(probe) == (below[-1] if below else None)
+            assert s.ceiling(probe) == (above[0] if above else None)
+
+        for _ in range(200):
+            lo, hi = sorted((random.randint(-5, 305), random.randint(-5, 305)))
+            expected = [e for e in ordered if lo <= e <= hi]
+            assert list(s.irange(lo, hi)) == expected
+            assert list(s.irange(lo, hi, reverse=True)) == expected[::-1]
+            assert list(s.irange(lo)) == [e for e in ordered if e >= lo]
+            assert list(s.irange(hi=hi)) == [e for e in ordered if e <= hi]
+
+    def test_unsupported_traversal(self):
+        s = SortedListSet()
+        with pytest.raises(ValueError):
+            s.traverse(TraversalType.PreOrder)
+
+    def test_height(self):
+        s = SortedListSet(4)
+        s.add(1)
+        assert s.height() == 1
+        for el in range(100):
+            s.add(el)
+        assert s.height() == 2
+
+    def test_same_api_as_binarysearchtree(self):
+        data = random.sample(range(0, 2000, 2), 600)
+        tree = BinarySearchTree.from_iterable(data)
+        for s in (SortedListSet.from_iterable(data, 4), SortedListSet.from_sorted(sorted(data), 8)):
+            self._validate(s)
+            for _ in range(Test_SortedListSet.LOOPS // 10):
+                # Keep both in step, so offsets are rebuilt after changes
+                el = random.randint(-5, 2005)
+                if random.random() < 0.2:
+                    assert s.add(el) == tree.add(el)
+                elif random.random() < 0.2:
+                    assert s.remove(el) == tree.remove(el)
+
+                lo, hi = el, random.randint(-5, 2005)
+                assert s.predecessor(el) == tree.predecessor(el)
+                assert s.successor(el) == tree.successor(el)
+                assert s.count_less(el) == tree.count_less(el)
+                assert s.count_range(lo, hi) == tree.count_range(lo, hi)
+                if tree.contains(el):
+                    assert s.rank(el) == tree.rank(el)
+                else:
+                    with pytest.raises(ValueError):
+                        s.rank(el)
+                k = random.randint(-1, len(tree))
+                if 0 <= k < len(tree):
+                    assert s.select(k) == tree.select(k)
+                else:
+                    with pytest.raises(IndexError):
+                        s.select(k)
+            self._validate(s)
+            assert list(s.traverse(TraversalType.InOrder)) == list(tree.traverse(TraversalType.InOrder))
+            tree = BinarySearchTree.from_iterable(data)
+
+        empty = SortedListSet.from_sorted([])
+        assert empty.isEmpty() == True
+        assert empty.predecessor(1) == None and empty.successor(1) == None
+        assert empty.count_less(1) == 0